@@ -1,20 +1,26 @@
 import customtkinter as ctk
 import psutil
-import matplotlib.pyplot as plt
+import matplotlib
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Rectangle
 from threading import Thread
 import time
 from datetime import datetime
 from tkinter import ttk
-from PIL import Image, ImageTk
 import numpy as np
-from matplotlib.animation import FuncAnimation
-import matplotlib.dates as mdates
 import os
-import platform
-import ctypes
-import networkx as nx
 import collections
+from graph_layout import IncrementalLayout, TreeLayout
+from perf_stats import PerfRecorder
+from process_tree import ProcessForest, check_parent_links
+from memory_accounting import MemoryAccounting
+from process_snapshot import take_snapshot
+from anomaly import HangDetector, LeakDetector
+from trends import SlidingRegression
+from forecasting import MarkovPredictor
+from changepoint import Cusum
+from collectors import PressureCollector
 
 class ThemeManager:
     def __init__(self):
@@ -97,7 +103,8 @@ class MetricBox(ctk.CTkFrame):
             "CPU": "⚡", "Memory": "💾", "Disk": "💿",
             "Virtual Memory": "📊", "Core Count": "🔢",
             "Thread Count": "🧵", "CPU Usage": "📈",
-            "CPU Frequency": "⚙️"
+            "CPU Frequency": "⚙️", "CPU Pressure": "⏳",
+            "Memory Pressure": "⏳", "I/O Pressure": "⏳"
         }
         
         icon = icons.get(title, "📊")
@@ -178,8 +185,9 @@ class GraphFrame(ctk.CTkFrame):
             btn.pack(side="left", padx=2)
             self.time_buttons[r] = btn
         
-        plt.style.use('dark_background')
-        self.fig, self.ax = plt.subplots(figsize=(8, 4), dpi=100)
+        matplotlib.style.use('dark_background')
+        self.fig = Figure(figsize=(8, 4), dpi=100)
+        self.ax = self.fig.add_subplot(111)
         self.canvas = FigureCanvasTkAgg(self.fig, self)
         self.canvas.get_tk_widget().pack(fill="both", expand=True, padx=15, pady=15)
         
@@ -192,6 +200,21 @@ class GraphFrame(ctk.CTkFrame):
         for spine in self.ax.spines.values():
             spine.set_color(colors["border"])
             spine.set_linewidth(0.5)
+        
+        self.trend_color = colors["warning"]
+
+    def plot_trend(self, trend, length):
+        """Overlay the fitted line of a SlidingRegression on the last samples of a series"""
+        if len(trend) < 2:
+            return
+        self.ax.plot([length - len(trend), length - 1],
+                     [trend.forecast(1 - len(trend)), trend.forecast(0)],
+                     color=self.trend_color, linestyle='--', linewidth=1.5)
+
+    def plot_changes(self, detector, length):
+        """Mark the level shifts a Cusum found within the last samples of a series"""
+        for x, event in detector.chart_positions(length):
+            self.ax.axvline(x=x, color=self.trend_color, linestyle=':', linewidth=1.2, alpha=0.8)
 
 class PieChartFrame(ctk.CTkFrame):
     def __init__(self, master, title, **kwargs):
@@ -203,7 +226,8 @@ class PieChartFrame(ctk.CTkFrame):
         )
         self.title_label.pack(pady=10)
         
-        self.fig, self.ax = plt.subplots(figsize=(4, 4))
+        self.fig = Figure(figsize=(4, 4))
+        self.ax = self.fig.add_subplot(111)
         self.canvas = FigureCanvasTkAgg(self.fig, self)
         self.canvas.get_tk_widget().pack(fill="both", expand=True)
         self.ax.axis('equal')  
@@ -214,6 +238,236 @@ class PieChartFrame(ctk.CTkFrame):
         self.ax.set_title("Usage Distribution")
         self.canvas.draw()
 
+class ProcessGraphRenderer:
+    def __init__(self, canvas, colors, max_nodes=400):
+        self.canvas = canvas
+        self.colors = colors
+        self.max_nodes = max_nodes
+        
+        # View transform
+        self.zoom = 1.0
+        self.pan_x = 0.0
+        self.pan_y = 0.0
+        self.drag_start = None
+        
+        # Canvas item ids reused between frames
+        self.node_items = {}
+        self.edge_items = {}
+        
+        # Last frame, kept so pan/zoom can redraw without a new layout
+        self.nodes = []
+        self.parents = {}
+        self.pos = {}
+        self.labels = {}
+        
+        self.canvas.bind("<ButtonPress-1>", self.on_drag_start)
+        self.canvas.bind("<B1-Motion>", self.on_drag)
+        self.canvas.bind("<MouseWheel>", self.on_wheel)
+        self.canvas.bind("<Button-4>", lambda e: self.zoom_at(e.x, e.y, 1.2))
+        self.canvas.bind("<Button-5>", lambda e: self.zoom_at(e.x, e.y, 1 / 1.2))
+        self.canvas.bind("<Double-Button-1>", lambda e: self.reset_view())
+
+    def render(self, graph, pos, labels=None):
+        self.nodes = list(graph.nodes())
+        self.parents = {v: u for u, v in graph.edges() if u != v}
+        self.pos = pos
+        self.labels = labels or {}
+        self.redraw()
+
+    def reset_view(self):
+        self.zoom = 1.0
+        self.pan_x = 0.0
+        self.pan_y = 0.0
+        self.redraw()
+
+    def on_drag_start(self, event):
+        self.drag_start = (event.x, event.y)
+
+    def on_drag(self, event):
+        if self.drag_start is None:
+            return
+        self.pan_x += event.x - self.drag_start[0]
+        self.pan_y += event.y - self.drag_start[1]
+        self.drag_start = (event.x, event.y)
+        self.redraw()
+
+    def on_wheel(self, event):
+        self.zoom_at(event.x, event.y, 1.2 if event.delta > 0 else 1 / 1.2)
+
+    def zoom_at(self, x, y, factor):
+        # Keep the point under the cursor fixed while zooming
+        self.pan_x = x - (x - self.pan_x) * factor
+        self.pan_y = y - (y - self.pan_y) * factor
+        self.zoom *= factor
+        self.redraw()
+
+    def subtree_sizes(self):
+        children = collections.defaultdict(list)
+        for child, parent in self.parents.items():
+            children[parent].append(child)
+        
+        sizes = {}
+        roots = [n for n in self.nodes if n not in self.parents]
+        order = []
+        seen = set()
+        for root in roots + self.nodes:
+            if root in seen:
+                continue
+            seen.add(root)
+            stack = [root]
+            while stack:
+                node = stack.pop()
+                order.append(node)
+                for child in children[node]:
+                    if child not in seen:
+                        seen.add(child)
+                        stack.append(child)
+        
+        for node in reversed(order):
+            sizes[node] = 1 + sum(sizes.get(c, 0) for c in children[node])
+        return sizes
+
+    def depths(self):
+        depths = {}
+        for node in self.nodes:
+            path = []
+            while node not in depths and node not in path:
+                path.append(node)
+                if node not in self.parents:
+                    break
+                node = self.parents[node]
+            depth = -1 if node in path else depths[node]
+            for n in reversed(path):
+                depth += 1
+                depths[n] = depth
+        return depths
+
+    def level_of_detail(self, visible):
+        """Kept nodes and {kept node: count of hidden nodes folded into it}"""
+        # Largest subtrees first (ties by depth, then pid). An ancestor's
+        # subtree is always larger than its descendants', so the nodes past
+        # the budget are the smallest subtrees and each folds into its
+        # nearest kept ancestor.
+        if len(visible) <= self.max_nodes:
+            return visible, {}
+        sizes = self.subtree_sizes()
+        depths = self.depths()
+        ranked = sorted(visible, key=lambda n: (-sizes.get(n, 1), depths.get(n, 0), n))
+        kept = set(ranked[:self.max_nodes])
+        
+        hidden_counts = collections.Counter()
+        for node in ranked[self.max_nodes:]:
+            ancestor = self.parents.get(node)
+            seen = {node}
+            while ancestor is not None and ancestor not in kept and ancestor not in seen:
+                seen.add(ancestor)
+                ancestor = self.parents.get(ancestor)
+            if ancestor in kept:
+                hidden_counts[ancestor] += 1
+        return [n for n in visible if n in kept], dict(hidden_counts)
+
+    def redraw(self):
+        if not self.nodes:
+            self.clear()
+            return
+        
+        width = max(self.canvas.winfo_width(), 1)
+        height = max(self.canvas.winfo_height(), 1)
+        
+        # Project every node to screen space in one pass
+        points = np.array([self.pos[n] for n in self.nodes], dtype=float)
+        screen_x = (points[:, 0] + 1) * width / 2 * self.zoom + self.pan_x
+        screen_y = (points[:, 1] + 1) * height / 2 * self.zoom + self.pan_y
+        screen = {n: (screen_x[i], screen_y[i]) for i, n in enumerate(self.nodes)}
+        
+        # Cull nodes outside the viewport (with a margin for node radius)
+        margin = 40
+        on_screen = (
+            (screen_x > -margin) & (screen_x < width + margin) &
+            (screen_y > -margin) & (screen_y < height + margin)
+        )
+        visible = [n for i, n in enumerate(self.nodes) if on_screen[i]]
+        
+        # Collapse the smallest subtrees until the node budget is met
+        shown, hidden_counts = self.level_of_detail(visible)
+        
+        radius = max(4, min(20, 12 * self.zoom))
+        show_text = radius >= 10
+        
+        # Edges from each shown node to its shown parent
+        stale_edges = set(self.edge_items)
+        for node in shown:
+            parent = self.parents.get(node)
+            if parent not in screen:
+                continue
+            x1, y1 = screen[parent]
+            x2, y2 = screen[node]
+            item = self.edge_items.get(node)
+            if item is None:
+                self.edge_items[node] = self.canvas.create_line(
+                    x1, y1, x2, y2,
+                    fill=self.colors["accent"],
+                    width=2,
+                    arrow="last",
+                    tags="edge"
+                )
+            else:
+                self.canvas.coords(item, x1, y1, x2, y2)
+                stale_edges.discard(node)
+        for node in stale_edges:
+            self.canvas.delete(self.edge_items.pop(node))
+        
+        # Nodes, with collapsed subtrees drawn as aggregates
+        stale_nodes = set(self.node_items)
+        for node in shown:
+            x, y = screen[node]
+            collapsed = hidden_counts.get(node, 0)
+            r = radius * 1.4 if collapsed else radius
+            text = self.labels.get(node, str(node))
+            if collapsed:
+                text = f"{text} +{collapsed}"
+            outline = self.colors["warning"] if collapsed else self.colors["accent"]
+            
+            items = self.node_items.get(node)
+            if items is None:
+                oval = self.canvas.create_oval(
+                    x-r, y-r, x+r, y+r,
+                    fill=self.colors["surface"],
+                    outline=outline,
+                    tags="node"
+                )
+                label = self.canvas.create_text(
+                    x, y,
+                    text=text,
+                    fill=self.colors["text"],
+                    tags="node"
+                )
+                self.node_items[node] = (oval, label)
+            else:
+                oval, label = items
+                self.canvas.coords(oval, x-r, y-r, x+r, y+r)
+                self.canvas.itemconfigure(oval, outline=outline)
+                self.canvas.coords(label, x, y)
+                self.canvas.itemconfigure(label, text=text)
+                stale_nodes.discard(node)
+            self.canvas.itemconfigure(self.node_items[node][1],
+                                      state="normal" if show_text or collapsed else "hidden")
+        for node in stale_nodes:
+            for item in self.node_items.pop(node):
+                self.canvas.delete(item)
+        
+        # Keep nodes above edges
+        self.canvas.tag_raise("node")
+
+    def clear(self):
+        for items in self.node_items.values():
+            for item in items:
+                self.canvas.delete(item)
+        for item in self.edge_items.values():
+            self.canvas.delete(item)
+        self.node_items.clear()
+        self.edge_items.clear()
+
 class AnalysisSection(ctk.CTkFrame):
     def __init__(self, master, colors, **kwargs):
         super().__init__(master, **kwargs)
@@ -229,8 +483,20 @@ class AnalysisSection(ctk.CTkFrame):
         self.setup_memory_leak_detection()
         self.setup_acyclic_graph()
         
+        import networkx as nx
+        
         self.memory_history = []
+        self.memory_trend = SlidingRegression(window=10)
+        self.leak_detector = LeakDetector()
+        self.pressure = PressureCollector()
         self.process_graph = nx.DiGraph()
+        self.process_forest = ProcessForest()
+        self.link_problems = []
+        self.graph_layouts = {
+            "Spring": IncrementalLayout(),
+            "Tree": TreeLayout(y_down=True)
+        }
+        self.graph_pos = {}
         self.update_thread = Thread(target=self.update_analysis, daemon=True)
         self.update_thread.start()
 
@@ -278,6 +544,7 @@ class AnalysisSection(ctk.CTkFrame):
             highlightthickness=0
         )
         self.graph_canvas.pack(fill="both", expand=True, padx=10, pady=10)
+        self.graph_renderer = ProcessGraphRenderer(self.graph_canvas, self.colors)
         
         self.graph_controls = ctk.CTkFrame(self.graph_frame, fg_color="transparent")
         self.graph_controls.pack(fill="x", padx=10, pady=5)
@@ -297,6 +564,15 @@ class AnalysisSection(ctk.CTkFrame):
             fg_color=self.colors["accent"],
             hover_color=self.colors["accent_secondary"]
         ).pack(side="left", padx=5)
+        
+        self.layout_var = ctk.StringVar(value="Spring")
+        ctk.CTkOptionMenu(
+            self.graph_controls,
+            values=["Spring", "Tree"],
+            variable=self.layout_var,
+            command=lambda _: self.draw_graph(),
+            width=90
+        ).pack(side="right", padx=5)
 
     def update_analysis(self):
         while True:
@@ -306,9 +582,14 @@ class AnalysisSection(ctk.CTkFrame):
                 current_memory = memory_info.rss / (1024 * 1024)  # Convert to MB
                 
                 self.memory_history.append(current_memory)
+                self.memory_trend.add(current_memory)
                 if len(self.memory_history) > 60:
                     self.memory_history.pop(0)
                 
+                # RSS trend of every process, not just this one
+                self.leak_detector.update(take_snapshot())
+                self.pressure.update()
+                
                 self.update_memory_plot()
                 self.check_memory_leak()
                 self.update_process_graph()
@@ -321,6 +602,7 @@ class AnalysisSection(ctk.CTkFrame):
     def update_memory_plot(self):
         self.memory_plot.ax.clear()
         self.memory_plot.ax.plot(self.memory_history, color=self.colors["accent"], linewidth=2)
+        self.memory_plot.plot_trend(self.memory_trend, len(self.memory_history))
         self.memory_plot.ax.set_title("Memory Usage Trend", color=self.colors["text"])
         self.memory_plot.ax.set_xlabel("Time (s)", color=self.colors["text"])
         self.memory_plot.ax.set_ylabel("Memory (MB)", color=self.colors["text"])
@@ -328,34 +610,67 @@ class AnalysisSection(ctk.CTkFrame):
         self.memory_plot.canvas.draw()
 
     def check_memory_leak(self):
-        if len(self.memory_history) < 10:
+        # Both checks run every tick: the system-wide growers and the
+        # monitor's own RSS trend
+        growers = self.leak_detector.growers
+        own_trend = len(self.memory_trend) >= 10
+        slope = self.memory_trend.slope if own_trend else 0.0
+        own_leak = slope > 1.0  # Memory increasing by more than 1MB per sample
+        
+        if not growers and not own_trend:
             return
-        
-        recent_memory = self.memory_history[-10:]
-        slope = np.polyfit(range(len(recent_memory)), recent_memory, 1)[0]
-        
-        if slope > 1.0:  # Memory increasing by more than 1MB per sample
-            self.leak_status.configure(
-                text="Status: Potential Memory Leak Detected!",
-                text_color=self.colors["error"]
-            )
-            self.leak_details.delete("1.0", "end")
-            self.leak_details.insert("1.0", 
-                f"Memory growth rate: {slope:.2f} MB/sample\n"
-                f"Current memory: {self.memory_history[-1]:.2f} MB\n"
-                f"Total growth: {self.memory_history[-1] - self.memory_history[0]:.2f} MB"
-            )
-        else:
+        if not growers and not own_leak:
             self.leak_status.configure(
                 text="Status: No Memory Leak Detected",
                 text_color=self.colors["success"]
             )
+            return
+        
+        details = ""
+        if growers:
+            details += "Steadily growing processes (MB/hour, growth over window, fit R²):\n"
+            for grower in growers[:5]:
+                details += (f"{grower['name']} (PID {grower['pid']}): "
+                            f"{grower['mb_per_hour']:+.1f} MB/h, +{grower['growth_mb']:.0f} MB, "
+                            f"R² {grower['r2']:.2f}, now {grower['rss_mb']:.1f} MB\n")
+        if own_leak:
+            if growers:
+                details += "\n"
+            details += ("This monitor's memory growth rate: "
+                        f"{slope:.2f} MB/sample (R² {self.memory_trend.r2:.2f}, "
+                        f"noise ±{self.memory_trend.stderr():.2f} MB)\n"
+                        f"Current memory: {self.memory_history[-1]:.2f} MB\n"
+                        f"Total growth: {self.memory_history[-1] - self.memory_history[0]:.2f} MB\n")
+        details += self.pressure_note()
+        
+        if growers:
+            leaking = {grower['pid'] for grower in growers} | ({os.getpid()} if own_leak else set())
+            status = f"Status: Potential Memory Leak in {len(leaking)} Process(es)!"
+        else:
+            status = "Status: Potential Memory Leak Detected!"
+        self.leak_status.configure(text=status, text_color=self.colors["error"])
+        self.leak_details.delete("1.0", "end")
+        self.leak_details.insert("1.0", details)
+
+    def pressure_note(self):
+        """One line on memory stalls: growth that already stalls tasks is urgent"""
+        assessment = self.pressure.assessment('memory')
+        if assessment is None:
+            return ""
+        level, pressure = assessment
+        if level == 'ok':
+            return f"Memory pressure: {pressure:.1f}% stalled (last 60s), no thrashing\n"
+        return (f"Memory pressure: {pressure:.1f}% stalled (last 60s) - "
+                f"the system is already reclaiming or swapping\n")
 
     def update_process_graph(self):
         try:
             self.process_graph.clear()
+            rows = []
+            links = {}
             
-            for proc in psutil.process_iter(['pid', 'name', 'ppid']):
+            for proc in psutil.process_iter(['pid', 'name', 'ppid', 'memory_info',
+                                             'cpu_percent', 'num_threads', 'create_time']):
                 try:
                     self.process_graph.add_node(
                         proc.info['pid'],
@@ -367,66 +682,64 @@ class AnalysisSection(ctk.CTkFrame):
                             proc.info['ppid'],
                             proc.info['pid']
                         )
+                    
+                    memory_info = proc.info['memory_info']
+                    rows.append((
+                        proc.info['pid'],
+                        proc.info['ppid'],
+                        memory_info.rss if memory_info else 0,
+                        proc.info['cpu_percent'] or 0,
+                        proc.info['num_threads'] or 0,
+                        {'name': proc.info['name'], 'create_time': proc.info['create_time']}
+                    ))
+                    links[proc.info['pid']] = (proc.info['ppid'], proc.info['create_time'])
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     continue
             
+            # Linear-time check for pid reuse and ppid races on every refresh
+            self.link_problems = check_parent_links(links)
+            stale = set()
+            for ppid, pid, reason in self.link_problems:
+                stale.add(pid)
+                if self.process_graph.has_edge(ppid, pid):
+                    self.process_graph.remove_edge(ppid, pid)
+            rows = [(row[0], None if row[0] in stale else row[1]) + row[2:] for row in rows]
+            
+            # Subtree totals are updated incrementally from the deltas
+            self.process_forest.sync(rows)
+            for pid in self.process_graph.nodes():
+                if pid in self.process_forest:
+                    totals = self.process_forest.subtree(pid)
+                    self.process_graph.nodes[pid].update(
+                        subtree_rss_mb=totals['rss'] / (1024 * 1024),
+                        subtree_cpu=totals['cpu'],
+                        subtree_threads=int(totals['threads'])
+                    )
+            
             self.draw_graph()
         except Exception as e:
             print(f"Error updating process graph: {e}")
 
     def draw_graph(self):
-        self.graph_canvas.delete("all")
-        
         if not self.process_graph.nodes():
+            self.graph_renderer.clear()
             return
             
-        pos = nx.spring_layout(self.process_graph)
-        
-        # Draw edges
-        for edge in self.process_graph.edges():
-            x1, y1 = pos[edge[0]]
-            x2, y2 = pos[edge[1]]
-            
-            # Scale and center the coordinates
-            x1 = (x1 + 1) * self.graph_canvas.winfo_width() / 2
-            y1 = (y1 + 1) * self.graph_canvas.winfo_height() / 2
-            x2 = (x2 + 1) * self.graph_canvas.winfo_width() / 2
-            y2 = (y2 + 1) * self.graph_canvas.winfo_height() / 2
-            
-            self.graph_canvas.create_line(
-                x1, y1, x2, y2,
-                fill=self.colors["accent"],
-                width=2,
-                arrow="last"
-            )
+        layout = self.graph_layouts[self.layout_var.get()]
+        pos = layout.update(self.process_graph.nodes(), self.process_graph.edges())
+        self.graph_pos = pos
         
-        # Draw nodes
-        for node in self.process_graph.nodes():
-            x, y = pos[node]
-            x = (x + 1) * self.graph_canvas.winfo_width() / 2
-            y = (y + 1) * self.graph_canvas.winfo_height() / 2
-            
-            self.graph_canvas.create_oval(
-                x-20, y-20, x+20, y+20,
-                fill=self.colors["surface"],
-                outline=self.colors["accent"]
-            )
-            
-            self.graph_canvas.create_text(
-                x, y,
-                text=str(node),
-                fill=self.colors["text"]
-            )
+        # Renderer culls, collapses and reuses canvas items
+        self.graph_renderer.render(self.process_graph, pos)
 
     def detect_cycles(self):
         try:
-            cycles = list(nx.simple_cycles(self.process_graph))
-            if cycles:
-                message = "Cycles detected in process graph!\n"
-                for cycle in cycles:
-                    message += f"Cycle: {' -> '.join(map(str, cycle))}\n"
+            if self.link_problems:
+                message = "Inconsistent parent links in process graph!\n"
+                for ppid, pid, reason in self.link_problems:
+                    message += f"{ppid} -> {pid}: {reason}\n"
             else:
-                message = "No cycles detected in process graph."
+                message = "No cycles or stale parent links in process graph."
             
             self.leak_details.delete("1.0", "end")
             self.leak_details.insert("1.0", message)
@@ -580,7 +893,7 @@ class AlgorithmSection(ctk.CTkFrame):
 
     def setup_visualization_panel(self):
         # Create matplotlib figure for visualization
-        self.fig = plt.Figure(figsize=(6, 4), dpi=100)
+        self.fig = Figure(figsize=(6, 4), dpi=100)
         self.ax = self.fig.add_subplot(111)
         self.canvas = FigureCanvasTkAgg(self.fig, self.visualization_panel)
         self.canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
@@ -855,6 +1168,8 @@ class AlgorithmSection(ctk.CTkFrame):
             self.status_text.insert("1.0", f"Error in Heap Sort: {str(e)}")
 
     def visualize_dfs(self, input_text):
+        import networkx as nx
+        
         try:
             # Parse graph edges
             edges = [edge.strip().split("-") for edge in input_text.split(",")]
@@ -903,6 +1218,8 @@ class AlgorithmSection(ctk.CTkFrame):
             self.status_text.insert("1.0", f"Error in DFS: {str(e)}")
 
     def visualize_bfs(self, input_text):
+        import networkx as nx
+        
         try:
             # Parse graph edges
             edges = [edge.strip().split("-") for edge in input_text.split(",")]
@@ -954,6 +1271,8 @@ class AlgorithmSection(ctk.CTkFrame):
             self.status_text.insert("1.0", f"Error in BFS: {str(e)}")
 
     def visualize_topological_sort(self, input_text):
+        import networkx as nx
+        
         try:
             # Parse graph edges
             edges = [edge.strip().split("-") for edge in input_text.split(",")]
@@ -1005,6 +1324,8 @@ class AlgorithmSection(ctk.CTkFrame):
             self.status_text.insert("1.0", f"Error in Topological Sort: {str(e)}")
 
     def visualize_prims(self, input_text):
+        import networkx as nx
+        
         try:
             # Parse graph edges with weights
             edges = [edge.strip().split(":") for edge in input_text.split(",")]
@@ -1061,6 +1382,8 @@ class AlgorithmSection(ctk.CTkFrame):
             self.status_text.insert("1.0", f"Error in Prim's Algorithm: {str(e)}")
 
     def visualize_dijkstra(self, input_text):
+        import networkx as nx
+        
         try:
             # Parse graph edges with weights
             edges = [edge.strip().split(":") for edge in input_text.split(",")]
@@ -1222,6 +1545,8 @@ class AlgorithmSection(ctk.CTkFrame):
             self.status_text.insert("1.0", f"Error in Subset Sum: {str(e)}")
 
     def visualize_tsp(self, input_text):
+        import networkx as nx
+        
         try:
             # Parse input
             edges = [edge.strip().split(":") for edge in input_text.split(",")]
@@ -1327,8 +1652,8 @@ class AlgorithmSection(ctk.CTkFrame):
                                 self.ax.set_title("Assignment Problem Visualization")
                                 for i in range(n):
                                     if i in assigned:
-                                        self.ax.add_patch(plt.Rectangle((assigned[i]-0.5, i-0.5), 1, 1,
-                                                                      fill=False, edgecolor='red', linewidth=2))
+                                        self.ax.add_patch(Rectangle((assigned[i]-0.5, i-0.5), 1, 1,
+                                                                  fill=False, edgecolor='red', linewidth=2))
                                 self.canvas.draw()
                                 time.sleep(1.0 / self.speed_slider.get())
                                 
@@ -1347,6 +1672,73 @@ class AlgorithmSection(ctk.CTkFrame):
             self.status_text.delete("1.0", "end")
             self.status_text.insert("1.0", f"Error in Assignment Problem: {str(e)}")
 
+class ProcessListView:
+    def __init__(self, textbox, header, on_select):
+        self.textbox = textbox
+        self.header = header
+        self.on_select = on_select
+        self.first_line = header.count("\n") + 1
+        
+        # Rendered rows as (key, text, tag), one per textbox line
+        self.lines = []
+        self.has_header = False
+        
+        self.textbox.bind("<Button-1>", self.on_click)
+
+    def update(self, rows):
+        if not self.has_header:
+            self.textbox.delete("1.0", "end")
+            self.textbox.insert("1.0", self.header)
+            self.has_header = True
+            self.lines = []
+        
+        # Patch lines that changed in place
+        for i, row in enumerate(rows[:len(self.lines)]):
+            if self.lines[i] != row:
+                self.replace_line(i, row)
+        
+        # Trim or extend the tail
+        if len(rows) < len(self.lines):
+            start = self.first_line + len(rows)
+            self.textbox.delete(f"{start}.0", "end")
+            del self.lines[len(rows):]
+        for row in rows[len(self.lines):]:
+            key, text, tag = row
+            self.textbox.insert("end", text + "\n", tag)
+            self.lines.append(row)
+
+    def patch(self, key, text, tag):
+        for i, row in enumerate(self.lines):
+            if row[0] == key:
+                if row != (key, text, tag):
+                    self.replace_line(i, (key, text, tag))
+                return
+
+    def replace_line(self, i, row):
+        key, text, tag = row
+        line = self.first_line + i
+        self.textbox.delete(f"{line}.0", f"{line + 1}.0")
+        self.textbox.insert(f"{line}.0", text + "\n", tag)
+        self.lines[i] = row
+
+    def show_message(self, text):
+        self.textbox.delete("1.0", "end")
+        self.textbox.insert("1.0", text)
+        self.lines = []
+        self.has_header = False
+
+    def key_at(self, event):
+        index = self.textbox.index(f"@{event.x},{event.y}")
+        i = int(float(index)) - self.first_line
+        if 0 <= i < len(self.lines):
+            return self.lines[i][0]
+        return None
+
+    def on_click(self, event):
+        key = self.key_at(event)
+        if key is not None:
+            self.on_select(key)
+
 class MemoryOptimizationSection(ctk.CTkFrame):
     def __init__(self, master, colors, **kwargs):
         super().__init__(master, **kwargs)
@@ -1356,11 +1748,18 @@ class MemoryOptimizationSection(ctk.CTkFrame):
         
         # Initialize data structures with optimized sizes
         self.memory_history = collections.deque(maxlen=30)  # Reduced history size
+        self.memory_trend = SlidingRegression(window=10)
+        self.memory_shifts = Cusum(floor=0.5)
+        self.pressure = PressureCollector()
         self.process_history = {}
-        self.markov_states = {}
+        self.markov = MarkovPredictor()
+        self.snapshot = None  # Process walk shared by the list and the hang check
+        self.hang_detector = HangDetector()
         self.hung_processes = set()
         self.selected_processes = set()
         self.suggested_processes = set()
+        self.process_rows = {}
+        self.accounting = MemoryAccounting()
         
         # Performance optimization settings
         self.update_interval = 3.0  # Increased base update interval
@@ -1565,6 +1964,17 @@ class MemoryOptimizationSection(ctk.CTkFrame):
         self.process_filter.pack(side="right")
         self.process_filter.bind("<KeyRelease>", lambda e: self.after(100, self.filter_processes))
         
+        # Memory accounting: USS/PSS discount pages shared with other processes
+        self.accounting_var = ctk.StringVar(value="USS")
+        accounting_menu = ctk.CTkOptionMenu(
+            header,
+            values=["USS", "PSS", "RSS"],
+            variable=self.accounting_var,
+            command=self.update_accounting_mode,
+            width=80
+        )
+        accounting_menu.pack(side="right", padx=5)
+        
         # Create process list with improved performance
         self.process_list = ctk.CTkTextbox(
             frame,
@@ -1574,6 +1984,13 @@ class MemoryOptimizationSection(ctk.CTkFrame):
             text_color=self.colors["text"]
         )
         self.process_list.pack(fill="both", expand=True, padx=10, pady=10)
+        for color in (self.colors["text"], self.colors["warning"], self.colors["error"]):
+            self.process_list.tag_config(color, foreground=color)
+        self.process_view = ProcessListView(
+            self.process_list,
+            "Suggested processes are marked with ⚠️\n\n",
+            self.on_process_select
+        )
         
         # Add process control buttons with improved layout
         button_frame = ctk.CTkFrame(frame, fg_color="transparent")
@@ -1600,7 +2017,7 @@ class MemoryOptimizationSection(ctk.CTkFrame):
         self.refresh_btn = ctk.CTkButton(
             button_frame,
             text="Refresh",
-            command=self.refresh_process_list,
+            command=lambda: self.refresh_process_list(fresh=True),
             fg_color=self.colors["accent"],
             hover_color=self.colors["accent_secondary"]
         )
@@ -1641,7 +2058,6 @@ class MemoryOptimizationSection(ctk.CTkFrame):
             self.suggested_processes.clear()
             
             # Show results
-            self.process_list.delete("1.0", "end")
             result_text = f"Process termination results:\n"
             result_text += f"Successfully killed: {killed_count}\n"
             if failed_count > 0:
@@ -1650,77 +2066,68 @@ class MemoryOptimizationSection(ctk.CTkFrame):
                 for msg in error_messages:
                     result_text += f"- {msg}\n"
             
-            self.process_list.insert("1.0", result_text)
+            self.process_view.show_message(result_text)
             
-            # Refresh process list after a short delay
-            self.after(1000, self.refresh_process_list)
+            # Refresh process list from a new walk after a short delay, so
+            # the killed processes drop out
+            self.after(1000, lambda: self.refresh_process_list(fresh=True))
             
         except Exception as e:
             print(f"Error in kill_selected_process: {e}")
-            self.process_list.delete("1.0", "end")
-            self.process_list.insert("1.0", f"Error killing processes: {str(e)}\n")
+            self.process_view.show_message(f"Error killing processes: {str(e)}\n")
 
     def update_process_list_with_suggestions(self, processes):
         try:
-            self.process_list.delete("1.0", "end")
-            
-            # Sort processes by memory usage
-            processes.sort(key=lambda x: x['memory'], reverse=True)
+            # Sort by accounted memory; RSS fallbacks follow the sampled rows
+            processes = self.accounting.rank(processes)
             
-            # Add header
-            self.process_list.insert("end", "Suggested processes are marked with ⚠️\n\n")
-            
-            # Add processes with improved formatting
-            for proc in processes[:20]:  # Show top 20 processes
-                is_suggested = proc['pid'] in self.suggested_processes
-                is_selected = proc['pid'] in self.selected_processes
-                
-                # Format process information with better readability
-                process_info = (
-                    f"[{'X' if is_selected else ' '}] "
-                    f"{'⚠️ ' if is_suggested else ''}"
-                    f"PID: {proc['pid']} | {proc['name']} | "
-                    f"Memory: {proc['memory']:.1f}% | CPU: {proc['cpu']:.1f}% | "
-                    f"Status: {proc['status']}\n"
-                )
-                
-                # Set color based on status and suggestion
-                if proc['status'] == 'zombie':
-                    color = self.colors["error"]
-                elif is_suggested:
-                    color = self.colors["warning"]
-                else:
-                    color = self.colors["text"]
-                
-                self.process_list.insert("end", process_info, color)
-            
-            # Add click handling for process selection
-            self.process_list.bind("<Button-1>", self.on_process_list_click)
+            # Show top 20 processes, patching only lines that changed
+            self.process_rows = {proc['pid']: proc for proc in processes[:20]}
+            self.process_view.update([
+                (proc['pid'], *self.format_process_line(proc))
+                for proc in processes[:20]
+            ])
             
         except Exception as e:
             print(f"Error updating process list: {e}")
 
-    def on_process_list_click(self, event):
+    def format_process_line(self, proc):
+        is_suggested = proc['pid'] in self.suggested_processes
+        is_selected = proc['pid'] in self.selected_processes
+        state = self.hang_detector.state(proc['pid'], proc['status'])
+        
+        # Format process information with better readability
+        process_info = (
+            f"[{'X' if is_selected else ' '}] "
+            f"{'⚠️ ' if is_suggested else ''}"
+            f"PID: {proc['pid']} | {proc['name']} | "
+            f"Memory: {proc['memory']:.1f}% {proc.get('memory_source', 'rss').upper()} | "
+            f"CPU: {proc['cpu']:.1f}% | "
+            f"Status: {proc['status']}"
+            f"{f' ({state})' if state in ('hung', 'blocked') else ''}"
+        )
+        
+        # Set color based on status and suggestion
+        if state in ('hung', 'zombie'):
+            color = self.colors["error"]
+        elif state == 'blocked' or is_suggested:
+            color = self.colors["warning"]
+        else:
+            color = self.colors["text"]
+        
+        return process_info, color
+
+    def on_process_select(self, pid):
         try:
-            # Get the line number clicked
-            index = self.process_list.index(f"@{event.x},{event.y}")
-            line = int(float(index))
-            
-            # Get the process information from the clicked line
-            line_text = self.process_list.get(f"{line}.0", f"{line}.end")
+            # Toggle selection
+            if pid in self.selected_processes:
+                self.selected_processes.remove(pid)
+            else:
+                self.selected_processes.add(pid)
             
-            # Extract PID from the line
-            if "PID:" in line_text:
-                pid = int(line_text.split("PID:")[1].split("|")[0].strip())
-                
-                # Toggle selection
-                if pid in self.selected_processes:
-                    self.selected_processes.remove(pid)
-                else:
-                    self.selected_processes.add(pid)
-                
-                # Update the process list to reflect the change
-                self.refresh_process_list()
+            # Redraw just that line from the last snapshot
+            if pid in self.process_rows:
+                self.process_view.patch(pid, *self.format_process_line(self.process_rows[pid]))
                 
         except Exception as e:
             print(f"Error in process list click handler: {e}")
@@ -1731,18 +2138,21 @@ class MemoryOptimizationSection(ctk.CTkFrame):
             processes = []
             
             # Collect process information with improved error handling
-            for proc in psutil.process_iter(['pid', 'name', 'memory_percent', 'cpu_percent', 'status']):
+            for proc in psutil.process_iter(['pid', 'name', 'memory_info', 'cpu_percent', 'status']):
                 try:
                     processes.append({
                         'pid': proc.info['pid'],
                         'name': proc.info['name'],
-                        'memory': proc.info['memory_percent'],
+                        'rss': proc.info['memory_info'].rss if proc.info['memory_info'] else 0,
                         'cpu': proc.info['cpu_percent'],
                         'status': proc.info['status']
                     })
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     continue
             
+            # Rank by reclaimable (USS/PSS) memory where it has been sampled
+            self.accounting.apply(processes)
+            
             # Suggest processes based on multiple criteria with improved thresholds
             for proc in processes:
                 # Check for high resource usage
@@ -1770,6 +2180,9 @@ class MemoryOptimizationSection(ctk.CTkFrame):
                 try:
                     memory = psutil.virtual_memory()
                     self.memory_history.append(memory.percent)
+                    self.memory_trend.add(memory.percent)
+                    self.markov.add(memory.percent)
+                    self.memory_shifts.update(memory.percent, datetime.now())
                 except Exception as e:
                     print(f"Error getting memory usage: {e}")
                     time.sleep(1)
@@ -1790,9 +2203,11 @@ class MemoryOptimizationSection(ctk.CTkFrame):
                 if self.update_counter % 4 == 0:
                     self.update_optimization()
                 
-                # Always update process info and check for hung processes
-                self.refresh_process_list()
+                # Always update process info and check for hung processes,
+                # both from a single process walk
+                self.snapshot = take_snapshot()
                 self.check_hung_processes()
+                self.refresh_process_list()
                 
                 # Calculate and adjust update interval based on performance
                 elapsed_time = time.time() - start_time
@@ -1812,6 +2227,8 @@ class MemoryOptimizationSection(ctk.CTkFrame):
             self.ram_graph.ax.clear()
             times = list(range(len(self.memory_history)))
             self.ram_graph.ax.plot(times, list(self.memory_history), color=self.colors["accent"])
+            self.ram_graph.plot_trend(self.memory_trend, len(times))
+            self.ram_graph.plot_changes(self.memory_shifts, len(times))
             self.ram_graph.ax.set_title("Memory Usage Trend")
             self.ram_graph.ax.grid(True, linestyle='--', alpha=0.2)
             self.ram_graph.canvas.draw()
@@ -1826,12 +2243,11 @@ class MemoryOptimizationSection(ctk.CTkFrame):
             )
             
             # Check for memory leaks
-            if len(self.memory_history) > 10:
-                recent_memory = list(self.memory_history)[-10:]
-                slope = np.polyfit(range(len(recent_memory)), recent_memory, 1)[0]
+            if len(self.memory_trend) >= 10:
+                slope = self.memory_trend.slope
                 if slope > 1.0:
                     self.leak_status.configure(
-                        text="Memory Leak Status: Potential leak detected!",
+                        text=f"Memory Leak Status: Potential leak detected! (+{slope:.1f}%/sample)",
                         text_color=self.colors["error"]
                     )
                 else:
@@ -1847,33 +2263,19 @@ class MemoryOptimizationSection(ctk.CTkFrame):
             if len(self.memory_history) < 5:
                 return
                 
-            # Simple Markov chain prediction
-            current_state = int(self.memory_history[-1] / 10)
-            if current_state not in self.markov_states:
-                self.markov_states[current_state] = collections.defaultdict(int)
-            
-            # Update transition probabilities
-            for i in range(len(self.memory_history) - 1):
-                from_state = int(self.memory_history[i] / 10)
-                to_state = int(self.memory_history[i + 1] / 10)
-                self.markov_states[from_state][to_state] += 1
-            
-            # Make prediction
-            prediction = []
-            current = current_state
+            # Markov chain prediction: transitions are counted as samples
+            # arrive, here we only propagate the state distribution
             steps = 30 if self.interval_var.get() == "30m" else (15 if self.interval_var.get() == "15m" else 5)
-            
-            for _ in range(steps):
-                if current in self.markov_states:
-                    next_states = self.markov_states[current]
-                    if next_states:
-                        current = max(next_states.items(), key=lambda x: x[1])[0]
-                prediction.append(current * 10)
+            distributions = self.markov.forecast(steps)
+            prediction = self.markov.expected(distributions)
+            low = self.markov.quantile(distributions, 0.1)
+            high = self.markov.quantile(distributions, 0.9)
             
             # Update prediction graph
             self.prediction_graph.ax.clear()
-            times = list(range(len(prediction)))
+            times = list(range(1, len(prediction) + 1))
             self.prediction_graph.ax.plot(times, prediction, color=self.colors["accent"])
+            self.prediction_graph.ax.fill_between(times, low, high, color=self.colors["accent"], alpha=0.2)
             self.prediction_graph.ax.set_title("Memory Usage Prediction")
             self.prediction_graph.ax.grid(True, linestyle='--', alpha=0.2)
             self.prediction_graph.canvas.draw()
@@ -1882,8 +2284,10 @@ class MemoryOptimizationSection(ctk.CTkFrame):
             self.prediction_details.delete("1.0", "end")
             self.prediction_details.insert("1.0",
                 f"Current: {self.memory_history[-1]:.1f}%\n"
-                f"Predicted: {prediction[-1]:.1f}%\n"
-                f"Change: {prediction[-1] - self.memory_history[-1]:.1f}%"
+                f"Predicted: {prediction[-1]:.1f}% (80% range {low[-1]:.1f}-{high[-1]:.1f}%)\n"
+                f"Change: {prediction[-1] - self.memory_history[-1]:.1f}%\n"
+                f"Linear trend: {self.memory_trend.slope:+.2f}%/sample, "
+                f"{min(max(self.memory_trend.forecast(steps), 0), 100):.1f}% in {steps} samples"
             )
         except Exception as e:
             print(f"Error updating predictions: {e}")
@@ -1892,6 +2296,7 @@ class MemoryOptimizationSection(ctk.CTkFrame):
         try:
             memory = psutil.virtual_memory()
             cpu = psutil.cpu_percent()
+            self.pressure.update()
             
             strategy = self.strategy_var.get()
             recommendations = []
@@ -1912,11 +2317,31 @@ class MemoryOptimizationSection(ctk.CTkFrame):
                 if cpu > 30:
                     recommendations.append("Minimize background processes")
             
+            # Sudden shifts matter even while usage stays under the thresholds
+            for event in self.memory_shifts.recent(len(self.memory_history)):
+                if event['direction'] == 'up':
+                    recommendations.append(
+                        f"Memory jumped from {event['before']:.1f}% to {event['after']:.1f}% "
+                        f"at {event['time'].strftime('%H:%M:%S')} - check what started then")
+            
+            # Stall time shows thrashing that the usage percentage hides
+            memory_pressure = self.pressure.assessment('memory')
+            if memory_pressure and memory_pressure[0] != 'ok':
+                recommendations.append(
+                    f"Tasks stalled on memory {memory_pressure[1]:.1f}% of the last minute - "
+                    f"free memory now, usage % understates the problem")
+            io_pressure = self.pressure.assessment('io')
+            if io_pressure and io_pressure[0] != 'ok':
+                recommendations.append(
+                    f"Tasks stalled on I/O {io_pressure[1]:.1f}% of the last minute - "
+                    f"check for swapping or heavy disk users")
+            
             # Update optimization details
             self.optimization_details.delete("1.0", "end")
             self.optimization_details.insert("1.0",
                 f"Current Memory Usage: {memory.percent:.1f}%\n"
-                f"Current CPU Usage: {cpu:.1f}%\n\n"
+                f"Current CPU Usage: {cpu:.1f}%\n"
+                f"Memory Pressure (some / full): {self.pressure.describe('memory')}\n\n"
                 f"Recommendations:\n" + "\n".join(f"- {rec}" for rec in recommendations)
             )
         except Exception as e:
@@ -1924,31 +2349,36 @@ class MemoryOptimizationSection(ctk.CTkFrame):
 
     def check_hung_processes(self):
         try:
-            self.hung_processes.clear()
-            for proc in psutil.process_iter(['pid', 'name', 'status']):
-                try:
-                    if proc.info['status'] in ['zombie', 'not responding']:
-                        self.hung_processes.add(proc.info['pid'])
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+            if self.snapshot is None:
+                self.snapshot = take_snapshot()
+            stuck = self.hang_detector.update(self.snapshot)
+            self.hung_processes = {p['pid'] for p in stuck if p['state'] in ('hung', 'zombie')}
         except Exception as e:
             print(f"Error checking hung processes: {e}")
 
-    def refresh_process_list(self):
+    def snapshot_processes(self, filter_text=None):
+        """Process rows of the cached snapshot, optionally filtered by name"""
+        if self.snapshot is None:
+            self.snapshot = take_snapshot()
+        snapshot = self.snapshot
+        rss = np.nan_to_num(snapshot['rss_mb']) * (1024 * 1024)
+        cpu = np.nan_to_num(snapshot['cpu_percent'])
+        return [{
+            'pid': int(snapshot.pids[i]),
+            'name': name,
+            'rss': int(rss[i]),
+            'cpu': float(cpu[i]),
+            'status': snapshot.statuses[i]
+        } for i, name in enumerate(snapshot.names)
+            if not filter_text or filter_text in name.lower()]
+
+    def refresh_process_list(self, fresh=False):
+        """Redraw the process list; fresh takes a new snapshot first (explicit refreshes)"""
         try:
-            processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'memory_percent', 'cpu_percent', 'status']):
-                try:
-                    processes.append({
-                        'pid': proc.info['pid'],
-                        'name': proc.info['name'],
-                        'memory': proc.info['memory_percent'],
-                        'cpu': proc.info['cpu_percent'],
-                        'status': proc.info['status']
-                    })
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-            
+            if fresh:
+                self.snapshot = take_snapshot()
+            processes = self.snapshot_processes()
+            self.accounting.apply(processes)
             self.update_process_list_with_suggestions(processes)
         except Exception as e:
             print(f"Error refreshing process list: {e}")
@@ -1968,24 +2398,16 @@ class MemoryOptimizationSection(ctk.CTkFrame):
                 self.refresh_process_list()
                 return
             
-            processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'memory_percent', 'cpu_percent', 'status']):
-                try:
-                    if filter_text in proc.info['name'].lower():
-                        processes.append({
-                            'pid': proc.info['pid'],
-                            'name': proc.info['name'],
-                            'memory': proc.info['memory_percent'],
-                            'cpu': proc.info['cpu_percent'],
-                            'status': proc.info['status']
-                        })
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-            
+            processes = self.snapshot_processes(filter_text)
+            self.accounting.apply(processes)
             self.update_process_list_with_suggestions(processes)
         except Exception as e:
             print(f"Error filtering processes: {e}")
 
+    def update_accounting_mode(self, value):
+        self.accounting.set_mode(value.lower())
+        self.filter_processes()
+
     def update_prediction_interval(self, value):
         self.update_predictions()
 
@@ -2044,8 +2466,13 @@ class SystemMonitor(ctk.CTk):
             'cpu': collections.deque(maxlen=60),
             'memory': collections.deque(maxlen=60),
             'disk': collections.deque(maxlen=60),
-            'network': collections.deque(maxlen=60)
+            'network': collections.deque(maxlen=60),
+            # PSI 'some' avg10 (NaN on kernels without PSI)
+            'cpu_pressure': collections.deque(maxlen=60),
+            'memory_pressure': collections.deque(maxlen=60),
+            'io_pressure': collections.deque(maxlen=60)
         }
+        self.pressure = PressureCollector()
         
         # Initialize frames dictionary
         self.frames = {}
@@ -2056,12 +2483,20 @@ class SystemMonitor(ctk.CTk):
         self.last_update_time = time.time()
         self.update_counter = 0  # Counter for selective updates
         
+        # Time every update_* method and the Tk event loop
+        self.perf = PerfRecorder()
+        self.perf.instrument(self)
+        self.perf.watch_event_loop(self)
+        
         # Create main area first
         self.create_main_area()
         
         # Create sidebar
         self.create_sidebar()
         
+        # Create status bar
+        self.create_status_bar()
+        
         # Start update thread with improved error handling
         self.running = True
         self.update_thread = Thread(target=self.update_metrics, daemon=True)
@@ -2079,9 +2514,13 @@ class SystemMonitor(ctk.CTk):
         self.frames['memory'] = ctk.CTkFrame(self.main_area, fg_color="transparent")
         self.frames['cpu'] = ctk.CTkFrame(self.main_area, fg_color="transparent")
         self.frames['disk'] = ctk.CTkFrame(self.main_area, fg_color="transparent")
-        self.frames['analysis'] = AnalysisSection(self.main_area, self.colors)
-        self.frames['algorithms'] = AlgorithmSection(self.main_area, self.colors)
-        self.frames['memory_opt'] = MemoryOptimizationSection(self.main_area, self.colors)
+        
+        # Heavy sections are built the first time they are shown
+        self.section_classes = {
+            'analysis': AnalysisSection,
+            'algorithms': AlgorithmSection,
+            'memory_opt': MemoryOptimizationSection
+        }
         
         # Initialize metric boxes dictionaries
         self.overview_boxes = {}
@@ -2216,9 +2655,14 @@ class SystemMonitor(ctk.CTk):
             box.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
             self.memory_boxes[key] = box
         
+        # Stall time from PSI (some / full, last 10s)
+        box = MetricBox(self.frames['memory'], "Memory Pressure")
+        box.grid(row=2, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
+        self.memory_boxes["Pressure"] = box
+        
         # Add memory graph with optimized settings
         self.memory_graph = GraphFrame(self.frames['memory'], "Memory Usage Trend", "Memory (MB)")
-        self.memory_graph.grid(row=2, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
+        self.memory_graph.grid(row=3, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
         
         # Configure graph for better performance
         self.memory_graph.fig.set_dpi(100)  # Lower DPI for better performance
@@ -2227,7 +2671,7 @@ class SystemMonitor(ctk.CTk):
         
         # Add memory pie chart with optimized settings
         self.memory_pie = PieChartFrame(self.frames['memory'], "Memory Distribution")
-        self.memory_pie.grid(row=3, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
+        self.memory_pie.grid(row=4, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
         self.memory_pie.fig.set_dpi(100)  # Lower DPI for better performance
 
     def show_cpu(self):
@@ -2253,9 +2697,14 @@ class SystemMonitor(ctk.CTk):
             box.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
             self.cpu_boxes[key] = box
         
+        # Stall time from PSI (some / full, last 10s)
+        box = MetricBox(self.frames['cpu'], "CPU Pressure")
+        box.grid(row=2, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
+        self.cpu_boxes["Pressure"] = box
+        
         # Add CPU graph with optimized settings
         self.cpu_graph = GraphFrame(self.frames['cpu'], "CPU Usage Trend", "Usage (%)")
-        self.cpu_graph.grid(row=2, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
+        self.cpu_graph.grid(row=3, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
         
         # Configure graph for better performance
         self.cpu_graph.fig.set_dpi(100)  # Lower DPI for better performance
@@ -2264,7 +2713,7 @@ class SystemMonitor(ctk.CTk):
         
         # Add CPU pie chart with optimized settings
         self.cpu_pie = PieChartFrame(self.frames['cpu'], "CPU Usage Distribution")
-        self.cpu_pie.grid(row=3, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
+        self.cpu_pie.grid(row=4, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
         self.cpu_pie.fig.set_dpi(100)  # Lower DPI for better performance
 
     def show_disk(self):
@@ -2290,9 +2739,14 @@ class SystemMonitor(ctk.CTk):
             box.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
             self.disk_boxes[key] = box
         
+        # Stall time from PSI (some / full, last 10s)
+        box = MetricBox(self.frames['disk'], "I/O Pressure")
+        box.grid(row=2, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
+        self.disk_boxes["Pressure"] = box
+        
         # Add disk graph with optimized settings
         self.disk_graph = GraphFrame(self.frames['disk'], "Disk Usage Trend", "Usage (%)")
-        self.disk_graph.grid(row=2, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
+        self.disk_graph.grid(row=3, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
         
         # Configure graph for better performance
         self.disk_graph.fig.set_dpi(100)  # Lower DPI for better performance
@@ -2301,20 +2755,26 @@ class SystemMonitor(ctk.CTk):
         
         # Add disk pie chart with optimized settings
         self.disk_pie = PieChartFrame(self.frames['disk'], "Disk Space Distribution")
-        self.disk_pie.grid(row=3, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
+        self.disk_pie.grid(row=4, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
         self.disk_pie.fig.set_dpi(100)  # Lower DPI for better performance
 
     def show_analysis(self):
         self.hide_all_frames()
-        self.frames['analysis'].grid(row=0, column=0, sticky="nsew")
+        self.get_section('analysis').grid(row=0, column=0, sticky="nsew")
 
     def show_algorithms(self):
         self.hide_all_frames()
-        self.frames['algorithms'].grid(row=0, column=0, sticky="nsew")
+        self.get_section('algorithms').grid(row=0, column=0, sticky="nsew")
 
     def show_memory_optimization(self):
         self.hide_all_frames()
-        self.frames['memory_opt'].grid(row=0, column=0, sticky="nsew")
+        self.get_section('memory_opt').grid(row=0, column=0, sticky="nsew")
+
+    def get_section(self, key):
+        if key not in self.frames:
+            self.frames[key] = self.section_classes[key](self.main_area, self.colors)
+            self.perf.instrument(self.frames[key])
+        return self.frames[key]
 
     def hide_all_frames(self):
         for frame in self.frames.values():
@@ -2337,6 +2797,7 @@ class SystemMonitor(ctk.CTk):
                     memory = psutil.virtual_memory()
                     disk = psutil.disk_usage('/')
                     net_io = psutil.net_io_counters()
+                    self.pressure.update()
                 except Exception as e:
                     print(f"Error getting system metrics: {e}")
                     time.sleep(1)
@@ -2348,6 +2809,9 @@ class SystemMonitor(ctk.CTk):
                 self.history['memory'].append(memory.percent)
                 self.history['disk'].append(disk.percent)
                 self.history['network'].append(net_io.bytes_sent + net_io.bytes_recv)
+                for resource in ('cpu', 'memory', 'io'):
+                    pressure = self.pressure.value(resource)
+                    self.history[f'{resource}_pressure'].append(np.nan if pressure is None else pressure)
                 
                 # Implement selective updates to reduce lag
                 self.update_counter += 1
@@ -2426,6 +2890,9 @@ class SystemMonitor(ctk.CTk):
             self.memory_boxes["Percent"].value_label.configure(
                 text=f"{memory.percent:.1f}%"
             )
+            self.memory_boxes["Pressure"].value_label.configure(
+                text=self.pressure.describe('memory')
+            )
             
             # Update memory graph with optimized plotting
             self.memory_graph.ax.clear()
@@ -2452,6 +2919,7 @@ class SystemMonitor(ctk.CTk):
             self.cpu_boxes["Freq"].value_label.configure(text=f"{cpu_freq:.1f} MHz")
             self.cpu_boxes["Cores"].value_label.configure(text=str(core_count))
             self.cpu_boxes["Threads"].value_label.configure(text=str(thread_count))
+            self.cpu_boxes["Pressure"].value_label.configure(text=self.pressure.describe('cpu'))
             
             # Update CPU graph with optimized plotting
             self.cpu_graph.ax.clear()
@@ -2486,6 +2954,9 @@ class SystemMonitor(ctk.CTk):
             self.disk_boxes["Percent"].value_label.configure(
                 text=f"{disk.percent:.1f}%"
             )
+            self.disk_boxes["Pressure"].value_label.configure(
+                text=self.pressure.describe('io')
+            )
             
             # Update disk graph with optimized plotting
             self.disk_graph.ax.clear()
@@ -2545,12 +3016,57 @@ class SystemMonitor(ctk.CTk):
         )
         self.clock_label.pack(side="right", padx=15)
         self.update_clock()
+        
+        # Optional frame-time overlay
+        ctk.CTkButton(
+            self.status_bar,
+            text="Export Timings",
+            command=self.export_perf_stats,
+            fg_color=self.colors["accent"],
+            hover_color=self.colors["accent_secondary"],
+            width=110,
+            height=24
+        ).pack(side="right", padx=5)
+        
+        self.perf_overlay_switch = ctk.CTkSwitch(
+            self.status_bar,
+            text="Perf",
+            command=self.refresh_perf_overlay,
+            progress_color=self.colors["accent"],
+            text_color=self.colors["text_secondary"]
+        )
+        self.perf_overlay_switch.pack(side="right", padx=5)
+        
+        self.perf_label = ctk.CTkLabel(
+            self.status_bar,
+            text="",
+            font=ctk.CTkFont(size=12),
+            text_color=self.colors["text_secondary"]
+        )
+        self.perf_label.pack(side="left", padx=15)
 
     def update_clock(self):
         current_time = datetime.now().strftime("%H:%M:%S")
         self.clock_label.configure(text=current_time)
         self.after(1000, self.update_clock)
 
+    def refresh_perf_overlay(self):
+        if getattr(self, 'perf_overlay_job', None):
+            self.after_cancel(self.perf_overlay_job)
+            self.perf_overlay_job = None
+        if self.perf_overlay_switch.get():
+            self.perf_label.configure(text=self.perf.overlay_text())
+            self.perf_overlay_job = self.after(1000, self.refresh_perf_overlay)
+        else:
+            self.perf_label.configure(text="")
+
+    def export_perf_stats(self):
+        try:
+            path = self.perf.export(f"perf_timings_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+            self.perf_label.configure(text=f"Timings exported to {path}")
+        except Exception as e:
+            print(f"Error exporting timings: {e}")
+
 if __name__ == "__main__":
     app = SystemMonitor()
     app.protocol("WM_DELETE_WINDOW", app.on_closing)
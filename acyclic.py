@@ -1,28 +1,203 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import psutil
-import matplotlib.pyplot as plt
+import matplotlib
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
 import numpy as np
-import networkx as nx
 import threading
 import time
 from datetime import datetime
 import collections
-from scipy import stats
+import importlib.util
+import sys
+from graph_layout import IncrementalLayout, TreeLayout
+from background_render import BackgroundRenderer
+from graph_hover import GraphHover
+from perf_stats import PerfRecorder
+from process_tree import ProcessForest, ProcessIndex
+from memory_accounting import MemoryAccounting
+from process_classifier import ProcessClassifier
+from process_snapshot import take_snapshot
+from anomaly import HangDetector, StreamingAnomalyDetector, rank_outliers
+from forecasting import FORECASTERS, OOMEstimator, choose_model
+from changepoint import Cusum, ProcessCusum
+from collectors import CgroupCollector, PressureCollector
 
-# Configure matplotlib for tkinter
-plt.style.use('dark_background')
-plt.rcParams.update({
-    'axes.facecolor': '#1e1e2e',
-    'figure.facecolor': '#1e1e2e',
-    'savefig.facecolor': '#1e1e2e',
-    'text.color': '#cdd6f4',
-    'axes.labelcolor': '#cdd6f4',
-    'xtick.color': '#cdd6f4',
-    'ytick.color': '#cdd6f4'
-})
+def configure_matplotlib():
+    """Configure matplotlib for tkinter (without importing pyplot)"""
+    matplotlib.style.use('dark_background')
+    matplotlib.rcParams.update({
+        'axes.facecolor': '#1e1e2e',
+        'figure.facecolor': '#1e1e2e',
+        'savefig.facecolor': '#1e1e2e',
+        'text.color': '#cdd6f4',
+        'axes.labelcolor': '#cdd6f4',
+        'xtick.color': '#cdd6f4',
+        'ytick.color': '#cdd6f4'
+    })
+
+def paint_process_graph(ax, plot):
+    """Draw a process graph plot (built by update_process_graph) into ax.
+
+    plot holds plain copies of everything drawn, so this can run on the
+    background renderer's thread while the Tk thread builds the next one.
+    """
+    import networkx as nx
+
+    if plot.get('message'):
+        text, color = plot['message']
+        ax.text(0.5, 0.5, text, ha='center', va='center',
+                transform=ax.transAxes, color=color)
+    else:
+        G = nx.DiGraph()
+        G.add_nodes_from(plot['nodes'])
+        G.add_edges_from(plot['edges'])
+        pos = plot['pos']
+
+        # Draw edges
+        nx.draw_networkx_edges(G, pos,
+                             edge_color='#6c7086',
+                             arrows=True,
+                             arrowsize=20,
+                             ax=ax,
+                             width=2)
+
+        # Draw nodes with size based on memory usage
+        nx.draw_networkx_nodes(G, pos,
+                             node_size=plot['sizes'],
+                             node_color=plot['colors'],
+                             ax=ax)
+
+        nx.draw_networkx_labels(G, pos, plot['labels'],
+                              font_size=9,  # Slightly larger font
+                              font_color='#cdd6f4',
+                              bbox=dict(facecolor='#313244',
+                                      alpha=0.8,
+                                      pad=0.7,
+                                      edgecolor='none'),
+                              ax=ax)
+
+        # Add legend
+        legend_elements = [
+            Line2D([0], [0], marker='o', color='w',
+                  markerfacecolor='#f38ba8', markersize=15,
+                  label='High Memory (>0.5%)'),
+            Line2D([0], [0], marker='o', color='w',
+                  markerfacecolor='#89b4fa', markersize=15,
+                  label='Parent Process')
+        ]
+        ax.legend(handles=legend_elements,
+                loc='upper right',
+                facecolor='#313244',
+                edgecolor='#6c7086')
+
+    if plot.get('overlay'):
+        ax.text(0.01, 0.01, plot['overlay'],
+                transform=ax.transAxes,
+                ha='left', va='bottom',
+                fontsize=8, color='#cdd6f4',
+                bbox=dict(facecolor='#313244', alpha=0.8, edgecolor='#6c7086'))
+
+    # Set title and style
+    if plot.get('title'):
+        ax.set_title(plot['title'], color='#cdd6f4', pad=20)
+    ax.set_facecolor('#1e1e2e')
+    ax.axis('off')
+    ax.figure.tight_layout()
+
+class VirtualTreeModel:
+    """Keeps a ttk.Treeview in sync with a list of rows keyed by pid.
+
+    Only the visible window of rows is materialized in the Treeview. Rows are
+    reconciled by key on every update, so unchanged rows are left alone,
+    changed cells are patched with ``set`` and reordered rows are moved.
+    """
+
+    def __init__(self, tree, columns, scrollbar, window=15):
+        self.tree = tree
+        self.columns = columns
+        self.scrollbar = scrollbar
+        self.window = window
+        self.rows = []
+        self.offset = 0
+        self.cells = {}
+
+        self.scrollbar.configure(command=self.yview)
+        self.tree.bind('<MouseWheel>', self.on_wheel)
+        self.tree.bind('<Button-4>', lambda e: self.scroll(-3))
+        self.tree.bind('<Button-5>', lambda e: self.scroll(3))
+
+    def set_rows(self, rows):
+        """Replace the model contents with (key, values) pairs"""
+        self.rows = rows
+        self.offset = max(0, min(self.offset, len(self.rows) - self.window))
+        self.render()
+
+    def visible_range(self):
+        """Return the (first, last) row indices currently shown"""
+        return self.offset, min(self.offset + self.window, len(self.rows))
+
+    def yview(self, *args):
+        """Scrollbar callback mapping moveto/scroll onto the row offset"""
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self.offset = int(float(args[1]) * len(self.rows))
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            step = self.window if args[2] == 'pages' else 1
+            self.offset += amount * step
+        self.offset = max(0, min(self.offset, len(self.rows) - self.window))
+        self.render()
+
+    def scroll(self, rows):
+        """Scroll the window by a number of rows"""
+        self.yview('scroll', rows, 'units')
+
+    def on_wheel(self, event):
+        """Scroll on mouse wheel without letting the Treeview scroll itself"""
+        self.scroll(-3 if event.delta > 0 else 3)
+        return 'break'
+
+    def render(self):
+        """Reconcile the Treeview items with the visible window"""
+        first, last = self.visible_range()
+        desired = self.rows[first:last]
+        desired_keys = [str(key) for key, _ in desired]
+        wanted = set(desired_keys)
+
+        # Drop rows that scrolled out or disappeared
+        for iid in self.tree.get_children(''):
+            if iid not in wanted:
+                self.tree.delete(iid)
+                self.cells.pop(iid, None)
+
+        # Insert new rows and patch only the cells that changed
+        for iid, (_, values) in zip(desired_keys, desired):
+            values = tuple(values)
+            old = self.cells.get(iid)
+            if old is None:
+                self.tree.insert('', 'end', iid=iid, values=values)
+            elif old != values:
+                for column, before, after in zip(self.columns, old, values):
+                    if before != after:
+                        self.tree.set(iid, column, after)
+            self.cells[iid] = values
+
+        # Move rows whose position changed
+        current = list(self.tree.get_children(''))
+        for index, iid in enumerate(desired_keys):
+            if current[index] != iid:
+                self.tree.move(iid, '', index)
+                current.remove(iid)
+                current.insert(index, iid)
+
+        if self.rows:
+            self.scrollbar.set(first / len(self.rows), last / len(self.rows))
+        else:
+            self.scrollbar.set(0, 1)
 
 class SystemMonitor:
     def __init__(self, root):
@@ -32,17 +207,45 @@ class SystemMonitor:
         self.root.configure(bg='#1e1e2e')
         
         # Configure matplotlib
-        plt.style.use('dark_background')
+        configure_matplotlib()
         
         # Data storage
         self.memory_history = collections.deque(maxlen=50)
         self.cpu_history = collections.deque(maxlen=50)
         self.time_stamps = collections.deque(maxlen=50)
-        self.process_graph = nx.DiGraph()
+        self.pressure = PressureCollector()
+        self.pressure_history = collections.deque(maxlen=50)  # PSI readings, {} without PSI
+        self.process_graph = None  # Built with the Process Graph tab
+        self.process_forest = ProcessForest()
+        self.process_index = None  # Array snapshot of the forest for focus queries
+        self.memory_accounting = MemoryAccounting()
+        self.process_classifier = ProcessClassifier()
         self.graph_pos = None
+        self.graph_plot = None  # Data last handed to the graph renderer
+        self.process_groups = {}
+        self.graph_layouts = {
+            'spring': IncrementalLayout(k=2.0, iterations=10),
+            'tree': TreeLayout()
+        }
+        self.forecasters = {name: model() for name, model in FORECASTERS.items()}
+        self.forecast_choice = None  # (model name, backtest results) for 'auto'
+        self.oom_estimator = OOMEstimator()
         self.anomaly_threshold = 2.5
+        self.process_snapshot = None  # Columnar per-process metrics of the last tick
+        self.previous_snapshot = None
+        self.anomaly_detector = StreamingAnomalyDetector(threshold=self.anomaly_threshold)
+        self.change_detectors = {'memory': Cusum(floor=0.5), 'cpu': Cusum(floor=2.0)}
+        self.process_changes = ProcessCusum()
+        self.hang_detector = HangDetector()
+        self.cgroups = CgroupCollector()
+        self.group_by_cgroup_var = tk.BooleanVar(value=False)  # Shared by the list and the graph
         self.monitoring = True
         
+        # Time every update_* method (before widgets capture bound methods)
+        self.perf = PerfRecorder()
+        self.perf.instrument(self)
+        self.perf.watch_event_loop(self.root)
+        
         # Initialize matplotlib figures
         self.setup_matplotlib_figures()
         self.setup_styles()
@@ -69,18 +272,9 @@ class SystemMonitor:
         self.cpu_ax = self.cpu_fig.add_subplot(111)
         self.cpu_ax.set_facecolor('#1e1e2e')
         
-        # Process graph figure
-        self.graph_fig = Figure(figsize=(8, 6), dpi=100, facecolor='#1e1e2e')
-        self.graph_ax = self.graph_fig.add_subplot(111)
-        self.graph_ax.set_facecolor('#1e1e2e')
-        
-        # Memory prediction figure
-        self.prediction_fig = Figure(figsize=(10, 4), dpi=100, facecolor='#1e1e2e')
-        self.prediction_ax = self.prediction_fig.add_subplot(111)
-        self.prediction_ax.set_facecolor('#1e1e2e')
-        
-        # Configure all figures
-        for fig in [self.memory_fig, self.cpu_fig, self.graph_fig, self.prediction_fig]:
+        # Configure all figures (graph and prediction figures are created
+        # with their tabs)
+        for fig in [self.memory_fig, self.cpu_fig]:
             fig.patch.set_facecolor('#1e1e2e')
     
     def setup_styles(self):
@@ -137,21 +331,56 @@ class SystemMonitor:
                   style='Modern.TButton',
                   command=self.refresh_all).pack(side=tk.LEFT, padx=5)
         
+        ttk.Button(action_frame,
+                  text="⏱ Export Timings",
+                  style='Modern.TButton',
+                  command=self.export_perf_stats).pack(side=tk.LEFT, padx=5)
+        
+        # Optional frame-time overlay
+        self.perf_overlay_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(action_frame,
+                       text="Perf overlay",
+                       variable=self.perf_overlay_var,
+                       command=self.refresh_perf_overlay).pack(side=tk.LEFT, padx=5)
+        
+        self.perf_label = ttk.Label(header_frame, text="", style='Modern.TLabel')
+        self.perf_label.pack(side=tk.LEFT, padx=20)
+        
         # Create notebook with custom styling
         self.notebook = ttk.Notebook(main_frame)
         self.notebook.pack(fill=tk.BOTH, expand=True)
         
-        # Add tabs with enhanced visuals
-        self.create_dashboard_tab()
-        self.create_process_graph_tab()
-        self.create_memory_analysis_tab()
-        self.create_process_manager_tab()
+        # Add tabs; everything but the dashboard is built on first show
+        self.built_tabs = set()
+        self.tab_builders = {}
+        tabs = [
+            ('dashboard', "Dashboard", self.create_dashboard_tab),
+            ('graph', "Process Graph", self.create_process_graph_tab),
+            ('memory', "Memory Analysis", self.create_memory_analysis_tab),
+            ('manager', "Process Manager", self.create_process_manager_tab)
+        ]
+        for key, text, builder in tabs:
+            frame = ttk.Frame(self.notebook, style='Modern.TFrame')
+            self.notebook.add(frame, text=text)
+            self.tab_builders[str(frame)] = (key, frame, builder)
+        
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+        self.build_tab(self.notebook.tabs()[0])
+    
+    def on_tab_changed(self, event=None):
+        """Build the selected tab the first time it is shown"""
+        self.build_tab(self.notebook.select())
+    
+    def build_tab(self, tab_id):
+        """Construct a notebook tab's contents if not done yet"""
+        key, frame, builder = self.tab_builders[str(tab_id)]
+        if key in self.built_tabs:
+            return
+        self.built_tabs.add(key)
+        builder(frame)
     
-    def create_dashboard_tab(self):
+    def create_dashboard_tab(self, dashboard_frame):
         """Create the main dashboard tab with graphs"""
-        dashboard_frame = ttk.Frame(self.notebook, style='Modern.TFrame')
-        self.notebook.add(dashboard_frame, text="Dashboard")
-        
         # Top row - Memory and CPU usage
         top_frame = ttk.Frame(dashboard_frame, style='Modern.TFrame')
         top_frame.pack(fill=tk.X, pady=(0, 10))
@@ -187,11 +416,13 @@ class SystemMonitor:
         self.system_info_label = ttk.Label(info_frame, text="", style='Modern.TLabel')
         self.system_info_label.pack(padx=10, pady=10)
     
-    def create_process_graph_tab(self):
+    def create_process_graph_tab(self, graph_frame):
         """Create the process dependency graph tab"""
-        # Create main frame
-        graph_frame = ttk.Frame(self.notebook, style='Modern.TFrame')
-        self.notebook.add(graph_frame, text="Process Graph")
+        # Process graph figure
+        self.graph_fig = Figure(figsize=(8, 6), dpi=100, facecolor='#1e1e2e')
+        self.graph_ax = self.graph_fig.add_subplot(111)
+        self.graph_ax.set_facecolor('#1e1e2e')
+        self.graph_fig.patch.set_facecolor('#1e1e2e')
         
         # Controls frame
         control_frame = ttk.Frame(graph_frame, style='Modern.TFrame')
@@ -203,6 +434,26 @@ class SystemMonitor:
                   style='Modern.TButton',
                   command=self.update_process_graph).pack(side=tk.LEFT, padx=5)
         
+        ttk.Button(control_frame,
+                  text="🌳 All Trees",
+                  style='Modern.TButton',
+                  command=self.show_all_process_trees).pack(side=tk.LEFT, padx=5)
+        
+        ttk.Button(control_frame,
+                  text="🎯 High Memory",
+                  style='Modern.TButton',
+                  command=self.focus_high_memory_processes).pack(side=tk.LEFT, padx=5)
+        
+        # Layout mode selector
+        ttk.Label(control_frame, text="Layout:", 
+                 style='Modern.TLabel').pack(side=tk.LEFT, padx=(20, 5))
+        
+        self.layout_var = tk.StringVar(value="spring")
+        layout_options = ttk.OptionMenu(control_frame, self.layout_var,
+                                      "spring", "spring", "tree",
+                                      command=lambda _: self.update_process_graph())
+        layout_options.pack(side=tk.LEFT, padx=5)
+        
         # Create canvas frame
         canvas_frame = ttk.Frame(graph_frame, style='Modern.TFrame')
         canvas_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -212,6 +463,26 @@ class SystemMonitor:
         self.graph_canvas.draw()
         self.graph_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
+        # Rasterize the graph off the Tk thread; the checkbox falls back to
+        # drawing synchronously
+        self.graph_renderer = BackgroundRenderer(self.graph_canvas, self.graph_ax,
+                                                 paint_process_graph)
+        self.background_render_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(control_frame,
+                       text="Background rendering",
+                       variable=self.background_render_var,
+                       command=self.toggle_background_render).pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(control_frame,
+                       text="Group by cgroup",
+                       variable=self.group_by_cgroup_var,
+                       state=tk.NORMAL if self.cgroups.available else tk.DISABLED,
+                       command=self.show_all_process_trees).pack(side=tk.LEFT, padx=5)
+        
+        # Hover tooltips, hit-tested through a KD-tree over node positions
+        self.graph_hover = GraphHover(self.graph_canvas, self.graph_ax,
+                                      self.describe_graph_node)
+        self.graph_renderer.on_frame.append(self.graph_hover.refresh_background)
+        
         # Add toolbar
         toolbar = NavigationToolbar2Tk(self.graph_canvas, canvas_frame)
         toolbar.update()
@@ -221,19 +492,25 @@ class SystemMonitor:
     
     def update_process_graph(self):
         """Update the process dependency graph focusing on high memory processes"""
+        if 'graph' not in self.built_tabs:
+            return
+        
+        import networkx as nx
+        
         try:
-            # Clear the graph
-            self.graph_ax.clear()
-            
             # Create new directed graph
             G = nx.DiGraph()
             
             # Get processes with focus on memory usage
             processes = {}
+            snapshot = {}
+            rows = []
+            cmdlines = {}
             high_memory_pids = set()  # Track high memory processes
             
             # First pass: identify high memory processes
-            for proc in psutil.process_iter(['pid', 'name', 'ppid', 'memory_percent', 'cpu_percent']):
+            for proc in psutil.process_iter(['pid', 'name', 'ppid', 'memory_percent', 'cpu_percent',
+                                           'memory_info', 'num_threads', 'cmdline', 'create_time']):
                 try:
                     pinfo = proc.info
                     if not pinfo:
@@ -242,64 +519,68 @@ class SystemMonitor:
                     # Get memory usage
                     memory_percent = pinfo.get('memory_percent', 0) or 0
                     cpu_percent = pinfo.get('cpu_percent', 0) or 0
+                    rss = pinfo['memory_info'].rss if pinfo.get('memory_info') else 0
+                    
+                    pid = pinfo['pid']
+                    snapshot[pid] = {
+                        'name': pinfo.get('name', 'Unknown'),
+                        'ppid': pinfo.get('ppid', 0),
+                        'memory_percent': memory_percent,
+                        'cpu_percent': cpu_percent
+                    }
+                    cmdlines[pid] = pinfo.get('cmdline')
+                    rows.append((pid, pinfo.get('ppid'), rss, cpu_percent,
+                                 pinfo.get('num_threads') or 0,
+                                 {'name': snapshot[pid]['name'], 'create_time': pinfo.get('create_time')}))
                     
                     # Store process info if it uses significant memory
                     if memory_percent > 0.5:  # Increased threshold for clearer graph
-                        pid = pinfo['pid']
                         high_memory_pids.add(pid)
-                        processes[pid] = {
-                            'name': pinfo.get('name', 'Unknown'),
-                            'ppid': pinfo.get('ppid', 0),
-                            'memory_percent': memory_percent,
-                            'cpu_percent': cpu_percent
-                        }
+                        processes[pid] = snapshot[pid]
                 except:
                     continue
             
+            # Keep subtree totals current (only changed processes and their
+            # ancestors are touched)
+            self.process_forest.sync(rows)
+            self.process_index = ProcessIndex(self.process_forest)
+            
             # Second pass: add parent processes of high memory processes
             for pid in list(high_memory_pids):
-                try:
-                    proc = psutil.Process(pid)
-                    parent = proc.parent()
-                    if parent and parent.pid not in processes:
-                        pinfo = parent.info
-                        processes[parent.pid] = {
-                            'name': pinfo['name'],
-                            'ppid': pinfo.get('ppid', 0),
-                            'memory_percent': pinfo.get('memory_percent', 0) or 0,
-                            'cpu_percent': pinfo.get('cpu_percent', 0) or 0
-                        }
-                except:
-                    continue
+                ppid = snapshot[pid]['ppid']
+                if ppid in snapshot and ppid not in processes:
+                    processes[ppid] = snapshot[ppid]
             
             # Build graph
             for pid, data in processes.items():
-                # Add node
-                G.add_node(pid, **data)
+                # Add node with its own and whole-subtree usage
+                totals = self.process_forest.subtree(pid)
+                G.add_node(pid, **data,
+                           category=self.categorize_process(data['name'] or '', cmdlines.get(pid)),
+                           cgroup=self.cgroups.lookup(pid),
+                           memory_mb=self.process_index.value(pid, 'rss') / (1024 * 1024),
+                           subtree_rss_mb=totals['rss'] / (1024 * 1024),
+                           subtree_cpu=totals['cpu'],
+                           subtree_threads=int(totals['threads']))
                 
                 # Add edge to parent if exists
                 ppid = data['ppid']
                 if ppid in processes and ppid != pid:
                     G.add_edge(ppid, pid)
             
+            self.process_graph = G
+            
+            # Hand the renderer a plain copy of what to draw
             if len(G.nodes()) == 0:
-                self.graph_ax.text(0.5, 0.5, 'No high memory processes found\n(>0.5% memory usage)',
-                                 ha='center', va='center',
-                                 transform=self.graph_ax.transAxes,
-                                 color='#cdd6f4')
+                self.graph_pos = {}
+                plot = {'message': ('No high memory processes found\n(>0.5% memory usage)', '#cdd6f4')}
             else:
-                # Calculate layout with more spacing
-                pos = nx.spring_layout(G, k=2.0, iterations=50)
-                
-                # Draw edges
-                nx.draw_networkx_edges(G, pos,
-                                     edge_color='#6c7086',
-                                     arrows=True,
-                                     arrowsize=20,
-                                     ax=self.graph_ax,
-                                     width=2)
+                # Reuse the cached layout instead of recomputing it
+                layout = self.graph_layouts[self.layout_var.get()]
+                pos = layout.update(G.nodes(), G.edges())
+                self.graph_pos = pos
                 
-                # Draw nodes with size based on memory usage
+                # Size nodes by memory usage
                 node_sizes = []
                 node_colors = []
                 for node in G.nodes():
@@ -310,11 +591,6 @@ class SystemMonitor:
                     node_sizes.append(size)
                     node_colors.append(color)
                 
-                nx.draw_networkx_nodes(G, pos,
-                                     node_size=node_sizes,
-                                     node_color=node_colors,
-                                     ax=self.graph_ax)
-                
                 # Add labels with memory percentage
                 labels = {}
                 for node in G.nodes():
@@ -324,40 +600,22 @@ class SystemMonitor:
                         labels[node] = f"{data['name']}\n⚠️ {data['memory_percent']:.1f}% MEM\n{data['cpu_percent']:.1f}% CPU"
                     else:
                         labels[node] = f"{data['name']}\n{data['memory_percent']:.1f}% MEM"
+                    if self.process_forest.children.get(node):
+                        labels[node] += f"\nTree: {data['subtree_rss_mb']:.0f} MB"
                 
-                nx.draw_networkx_labels(G, pos, labels,
-                                      font_size=9,  # Slightly larger font
-                                      font_color='#cdd6f4',
-                                      bbox=dict(facecolor='#313244',
-                                              alpha=0.8,
-                                              pad=0.7,
-                                              edgecolor='none'),
-                                      ax=self.graph_ax)
-                
-                # Add legend
-                legend_elements = [
-                    plt.Line2D([0], [0], marker='o', color='w', 
-                              markerfacecolor='#f38ba8', markersize=15,
-                              label='High Memory (>0.5%)'),
-                    plt.Line2D([0], [0], marker='o', color='w',
-                              markerfacecolor='#89b4fa', markersize=15,
-                              label='Parent Process')
-                ]
-                self.graph_ax.legend(handles=legend_elements,
-                                   loc='upper right',
-                                   facecolor='#313244',
-                                   edgecolor='#6c7086')
-            
-            # Set title and style
-            self.graph_ax.set_title('High Memory Process Graph',
-                                  color='#cdd6f4',
-                                  pad=20)
-            self.graph_ax.set_facecolor('#1e1e2e')
-            self.graph_ax.axis('off')
-            
-            # Update display
-            self.graph_fig.tight_layout()
-            self.graph_canvas.draw()
+                plot = {
+                    'nodes': list(G.nodes()),
+                    'edges': list(G.edges()),
+                    'pos': {node: tuple(xy) for node, xy in pos.items()},
+                    'sizes': node_sizes,
+                    'colors': node_colors,
+                    'labels': labels
+                }
+            
+            plot['title'] = 'High Memory Process Graph'
+            self.graph_hover.update(self.graph_pos)
+            self.graph_plot = plot
+            self.graph_renderer.submit(plot)
             
         except Exception as e:
             print(f"Error updating graph: {e}")
@@ -365,34 +623,77 @@ class SystemMonitor:
             traceback.print_exc()
             
             # Show error in graph
-            self.graph_ax.clear()
-            self.graph_ax.text(0.5, 0.5,
-                             f"Error updating graph:\n{str(e)}",
-                             ha='center', va='center',
-                             color='#f38ba8',
-                             transform=self.graph_ax.transAxes)
-            self.graph_canvas.draw()
+            self.graph_plot = {'message': (f"Error updating graph:\n{str(e)}", '#f38ba8')}
+            self.graph_renderer.submit(self.graph_plot)
+    
+    def toggle_background_render(self):
+        """Switch the process graph between threaded and synchronous drawing"""
+        self.graph_renderer.enabled = self.background_render_var.get()
+        self.graph_renderer.submit(self.graph_plot)
     
     def categorize_process(self, name, cmdline):
         """Categorize process based on name and command line"""
-        name = name.lower()
-        cmdline = ' '.join(cmdline).lower() if cmdline else ''
-        
-        categories = {
-            'Browser': ['chrome', 'firefox', 'edge', 'opera', 'safari'],
-            'Development': ['python', 'node', 'npm', 'java', 'code', 'git'],
-            'System': ['system', 'svchost', 'service', 'registry', 'wininit'],
-            'Security': ['antivirus', 'defender', 'firewall'],
-            'Office': ['word', 'excel', 'powerpoint', 'outlook', 'teams'],
-            'Media': ['vlc', 'spotify', 'music', 'video', 'media'],
-            'Gaming': ['steam', 'game', 'unity', 'unreal'],
-            'Background': ['updater', 'scheduler', 'helper']
-        }
-        
-        for category, keywords in categories.items():
-            if any(keyword in name or keyword in cmdline for keyword in keywords):
-                return category
-        return 'Other'
+        return self.process_classifier.classify(name, cmdline)
+    
+    def describe_graph_node(self, pid):
+        """Tooltip text for a process graph node"""
+        data = self.process_graph.nodes[pid]
+        lines = [
+            f"{data.get('name', 'Unknown')} (PID: {pid})",
+            f"Memory: {data.get('memory_percent', 0):.1f}% ({data.get('memory_mb', 0):.0f} MB)",
+            f"CPU: {data.get('cpu_percent', 0):.1f}%",
+            f"Parent: {data.get('ppid', 'N/A')}"
+        ]
+        if self.process_forest.children.get(pid):
+            lines.append(f"Tree: {data.get('subtree_rss_mb', 0):.0f} MB, "
+                         f"{data.get('subtree_cpu', 0):.1f}% CPU, "
+                         f"{data.get('subtree_threads', 0)} threads")
+        if data.get('cgroup'):
+            lines.append(f"cgroup: {data['cgroup']}")
+        if 'group' in data:
+            lines.append(f"Group: {data['group']}")
+        return '\n'.join(lines)
+    
+    def add_graph_tooltips(self):
+        """Attach the hover layer to the currently drawn graph"""
+        if self.graph_pos:
+            self.graph_hover.update(self.graph_pos)
+    
+    def group_similar_processes(self, nodes):
+        """Group graph nodes by process category, or by cgroup when selected"""
+        groups = collections.defaultdict(list)
+        by_cgroup = self.group_by_cgroup_var.get()
+        for pid in nodes:
+            data = self.process_graph.nodes[pid]
+            if by_cgroup:
+                data['group'] = data.get('cgroup') or 'unknown cgroup'
+                groups[data['group']].append(pid)
+                continue
+            # Classified from the command line read with the graph snapshot
+            category = data.get('category') or 'Other'
+            data['group'] = category
+            groups[category].append(pid)
+        
+        self.process_groups = dict(groups)
+        return self.process_groups
+    
+    def add_performance_indicators(self):
+        """Overlay group and resource totals on the process graph"""
+        G = self.process_graph
+        if not G or not len(G):
+            return
+        
+        lines = [f"Processes: {len(G)}"]
+        lines.append(f"Memory: {sum(d.get('memory_percent', 0) for _, d in G.nodes(data=True)):.1f}%  "
+                     f"CPU: {sum(d.get('cpu_percent', 0) for _, d in G.nodes(data=True)):.1f}%")
+        heaviest = max(G.nodes, key=lambda pid: G.nodes[pid].get('subtree_rss_mb', 0))
+        lines.append(f"Largest tree: {G.nodes[heaviest].get('name', heaviest)} "
+                     f"({G.nodes[heaviest].get('subtree_rss_mb', 0):.0f} MB)")
+        for group, pids in sorted(self.process_groups.items(), key=lambda item: -len(item[1])):
+            lines.append(f"{group}: {len(pids)}")
+        
+        self.graph_plot = dict(self.graph_plot, overlay='\n'.join(lines))
+        self.graph_renderer.submit(self.graph_plot)
     
     def show_all_process_trees(self):
         """Show complete process trees with enhanced visualization"""
@@ -419,57 +720,61 @@ class SystemMonitor:
     def focus_high_memory_processes(self):
         """Focus on high memory consuming processes and their trees"""
         try:
-            # Get processes with high memory usage
-            high_memory_processes = []
-            for node in self.process_graph.nodes():
-                node_data = self.process_graph.nodes[node]
-                memory_pct = node_data.get('memory_percent', 0)
-                memory_mb = node_data.get('memory_mb', 0)
-                if memory_pct > 3.0 or memory_mb > 200:  # > 3% or > 200MB
-                    high_memory_processes.append(node)
+            if self.process_index is None:
+                messagebox.showinfo("High Memory Focus", "Open the Process Graph tab first")
+                return
+            
+            index = self.process_index
+            total_memory = psutil.virtual_memory().total
+            
+            # Get processes with high memory usage (> 3% or > 200MB)
+            threshold = min(total_memory * 0.03, 200 * 1024 * 1024)
+            high_memory_processes = [pid for pid in index.top(50, 'rss')
+                                     if index.value(pid, 'rss') > threshold]
             
             if not high_memory_processes:
                 messagebox.showinfo("High Memory Focus", "No high memory processes found")
                 return
             
             # Include their parent and child processes
-            focus_nodes = set(high_memory_processes)
-            for proc in high_memory_processes:
-                # Add parents
-                for pred in self.process_graph.predecessors(proc):
-                    focus_nodes.add(pred)
-                # Add children
-                for succ in self.process_graph.successors(proc):
-                    focus_nodes.add(succ)
-            
-            # Create focused subgraph
-            focused_subgraph = self.process_graph.subgraph(focus_nodes)
+            focus_nodes = index.neighbourhood(high_memory_processes, up=1, down=1)
             
             # Show information about focused processes
-            info_text = f"Focusing on {len(high_memory_processes)} high-memory processes and their trees:\n\n"
-            for proc in sorted(high_memory_processes, 
-                             key=lambda x: self.process_graph.nodes[x].get('memory_percent', 0), 
-                             reverse=True)[:10]:
-                node_data = self.process_graph.nodes[proc]
-                info_text += f"• {node_data.get('name', 'Unknown')} (PID: {proc})\n"
-                info_text += f"  Memory: {node_data.get('memory_percent', 0):.1f}% ({node_data.get('memory_mb', 0):.0f}MB)\n"
-                info_text += f"  CPU: {node_data.get('cpu_percent', 0):.1f}%\n\n"
+            info_text = (f"Focusing on {len(high_memory_processes)} high-memory processes "
+                         f"and their trees ({len(focus_nodes)} processes):\n\n")
+            for proc in high_memory_processes[:10]:
+                info = self.process_forest.info.get(proc, {})
+                rss = index.value(proc, 'rss')
+                path = ' → '.join(self.process_forest.info.get(pid, {}).get('name', str(pid))
+                                  for pid in index.path_to_root(proc))
+                info_text += f"• {info.get('name', 'Unknown')} (PID: {proc})\n"
+                info_text += f"  Memory: {rss / total_memory * 100:.1f}% ({rss / (1024 * 1024):.0f}MB)\n"
+                info_text += f"  CPU: {index.value(proc, 'cpu'):.1f}%\n"
+                info_text += f"  Tree: {path}\n\n"
             
             messagebox.showinfo("High Memory Processes", info_text)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to focus on high memory processes: {e}")
     
-    def create_memory_analysis_tab(self):
+    def create_memory_analysis_tab(self, analysis_frame):
         """Create memory analysis tab with prediction graph and optimization suggestions"""
-        analysis_frame = ttk.Frame(self.notebook, style='Modern.TFrame')
-        self.notebook.add(analysis_frame, text="Memory Analysis")
+        # Memory prediction figure
+        self.prediction_fig = Figure(figsize=(10, 4), dpi=100, facecolor='#1e1e2e')
+        self.prediction_ax = self.prediction_fig.add_subplot(111)
+        self.prediction_ax.set_facecolor('#1e1e2e')
+        self.prediction_fig.patch.set_facecolor('#1e1e2e')
         
         # Memory prediction graph
         prediction_frame = ttk.LabelFrame(analysis_frame, text="Memory Usage Prediction", 
                                         style='Modern.TFrame')
         prediction_frame.pack(fill=tk.X, pady=(0, 10))
         
+        # Time until memory and swap run out at the current growth rate
+        self.oom_label = ttk.Label(prediction_frame, text=self.oom_estimator.describe(),
+                                   style='Modern.TLabel')
+        self.oom_label.pack(anchor=tk.W, padx=10, pady=(5, 0))
+        
         # Create canvas for prediction graph
         self.prediction_canvas = FigureCanvasTkAgg(self.prediction_fig, prediction_frame)
         self.prediction_canvas.draw()
@@ -515,12 +820,33 @@ class SystemMonitor:
                   text="📊 Show Detailed Stats",
                   style='Modern.TButton',
                   command=self.show_detailed_memory_stats).pack(side=tk.LEFT, padx=5)
+        
+        ttk.Button(control_frame,
+                  text="🔍 Detect Anomalies",
+                  style='Modern.TButton',
+                  command=self.detect_anomalies).pack(side=tk.LEFT, padx=5)
+        
+        # Forecasting model for the prediction graph
+        ttk.Label(control_frame, text="Model:",
+                 style='Modern.TLabel').pack(side=tk.LEFT, padx=(20, 5))
+        
+        self.forecast_model_var = tk.StringVar(value="auto")
+        ttk.OptionMenu(control_frame, self.forecast_model_var,
+                      "auto", "auto", *FORECASTERS,
+                      command=lambda _: self.update_memory_analysis()).pack(side=tk.LEFT, padx=5)
+        
+        # Memory accounting: USS/PSS discount pages shared with other processes
+        ttk.Label(control_frame, text="Accounting:",
+                 style='Modern.TLabel').pack(side=tk.LEFT, padx=(20, 5))
+        
+        self.accounting_var = tk.StringVar(value="uss")
+        accounting_options = ttk.OptionMenu(control_frame, self.accounting_var,
+                                          "uss", "uss", "pss", "rss",
+                                          command=self.set_accounting_mode)
+        accounting_options.pack(side=tk.LEFT, padx=5)
 
-    def create_process_manager_tab(self):
+    def create_process_manager_tab(self, manager_frame):
         """Create process manager tab with process list and controls"""
-        manager_frame = ttk.Frame(self.notebook, style='Modern.TFrame')
-        self.notebook.add(manager_frame, text="Process Manager")
-        
         # Process list
         list_frame = ttk.LabelFrame(manager_frame, text="Running Processes", 
                                   style='Modern.TFrame')
@@ -545,17 +871,26 @@ class SystemMonitor:
                  style='Modern.TLabel').pack(side=tk.LEFT, padx=(20, 5))
         
         self.sort_var = tk.StringVar(value="memory")
+        self.sort_column = None
         sort_options = ttk.OptionMenu(filter_frame, self.sort_var, 
                                     "memory", "memory", "cpu", "name", "pid",
-                                    command=self.refresh_process_list)
+                                    command=self.on_sort_option)
         sort_options.pack(side=tk.LEFT, padx=5)
         
+        # One row per cgroup v2 (systemd slice, service or container)
+        ttk.Checkbutton(filter_frame,
+                       text="Group by cgroup",
+                       variable=self.group_by_cgroup_var,
+                       state=tk.NORMAL if self.cgroups.available else tk.DISABLED,
+                       command=self.refresh_process_list).pack(side=tk.LEFT, padx=(20, 5))
+        
         # Treeview for processes
         tree_frame = ttk.Frame(list_frame, style='Modern.TFrame')
         tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(5, 10))
         
         # Create columns
         columns = ('PID', 'Name', 'CPU%', 'Memory%', 'Memory MB', 'Threads', 'Status')
+        self.process_columns = columns
         self.process_tree = ttk.Treeview(tree_frame, 
                                        columns=columns, 
                                        show='headings', 
@@ -568,16 +903,15 @@ class SystemMonitor:
             width = 70 if col in ('PID', 'CPU%', 'Memory%', 'Threads') else 200
             self.process_tree.column(col, width=width, minwidth=50)
         
-        # Add scrollbars
+        # Add scrollbars (vertical scrolling is virtual, driven by the model)
         y_scrollbar = ttk.Scrollbar(tree_frame, 
-                                  orient=tk.VERTICAL, 
-                                  command=self.process_tree.yview)
+                                  orient=tk.VERTICAL)
         x_scrollbar = ttk.Scrollbar(tree_frame, 
                                   orient=tk.HORIZONTAL, 
                                   command=self.process_tree.xview)
         
-        self.process_tree.configure(yscrollcommand=y_scrollbar.set,
-                                  xscrollcommand=x_scrollbar.set)
+        self.process_tree.configure(xscrollcommand=x_scrollbar.set)
+        self.process_model = VirtualTreeModel(self.process_tree, columns, y_scrollbar)
         
         # Pack scrollbars and treeview
         self.process_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
@@ -643,7 +977,9 @@ class SystemMonitor:
                 f"Used Swap: {self.bytes_to_gb(swap.used):.2f} GB ({swap.percent}%)\n",
                 f"Free Swap: {self.bytes_to_gb(swap.free):.2f} GB\n",
                 f"Swapped in: {self.bytes_to_gb(swap.sin):.2f} GB\n",
-                f"Swapped out: {self.bytes_to_gb(swap.sout):.2f} GB\n"
+                f"Swapped out: {self.bytes_to_gb(swap.sout):.2f} GB\n",
+                "\n=== EXHAUSTION ===\n",
+                f"{self.oom_estimator.describe()}\n"
             ]
             
             # Show in message box
@@ -655,9 +991,11 @@ class SystemMonitor:
     def update_memory_analysis(self):
         """Update memory analysis and predictions"""
         try:
-            if len(self.memory_history) < 5:
+            if 'memory' not in self.built_tabs or len(self.memory_history) < 5:
                 return
             
+            self.oom_label.config(text=self.oom_estimator.describe())
+            
             # Clear previous prediction
             self.prediction_ax.clear()
             
@@ -665,14 +1003,15 @@ class SystemMonitor:
             x = np.arange(len(self.memory_history))
             y = np.array(list(self.memory_history))
             
-            # Fit polynomial for better prediction
-            degree = min(3, len(self.memory_history) - 1)
-            coeffs = np.polyfit(x, y, degree)
-            
-            # Generate prediction points
+            # Forecast with the incrementally updated model; 'auto' picks the
+            # one with the lowest backtest error on the recorded history
             future_points = 10
+            name = self.forecast_model_var.get()
+            if name == 'auto':
+                self.forecast_choice = choose_model(y, horizon=future_points)
+                name = self.forecast_choice[0]
+            predictions, lower, upper = self.forecasters[name].forecast(future_points)
             future_x = np.arange(len(self.memory_history), len(self.memory_history) + future_points)
-            predictions = np.polyval(coeffs, future_x)
             
             # Ensure predictions stay within reasonable bounds
             predictions = np.clip(predictions, 0, 100)
@@ -691,13 +1030,12 @@ class SystemMonitor:
             
             # Plot predictions with uncertainty cone
             self.prediction_ax.plot(future_x, predictions, '--', color='#a6e3a1',
-                                  label='Predicted', linewidth=2, alpha=0.7)
+                                  label=f'Predicted ({name})', linewidth=2, alpha=0.7)
             
-            # Add prediction uncertainty cone
-            std_dev_future = np.std(y) * np.sqrt(np.arange(1, future_points + 1) / len(y))
+            # Add 95% prediction interval
             self.prediction_ax.fill_between(future_x,
-                                         np.clip(predictions - 2*std_dev_future, 0, 100),
-                                         np.clip(predictions + 2*std_dev_future, 0, 100),
+                                         np.clip(lower, 0, 100),
+                                         np.clip(upper, 0, 100),
                                          color='#a6e3a1', alpha=0.2)
             
             # Add current time marker
@@ -726,22 +1064,33 @@ class SystemMonitor:
         except Exception as e:
             print(f"Memory analysis update error: {e}")
     
+    def set_accounting_mode(self, mode):
+        """Switch memory accounting between USS, PSS and RSS"""
+        self.memory_accounting.set_mode(mode)
+        self.update_optimization_suggestions()
+    
     def update_optimization_suggestions(self):
         """Update memory optimization suggestions"""
         try:
             suggestions = []
             
-            # Get top memory consumers
-            high_memory_procs = []
-            for proc in psutil.process_iter(['pid', 'name', 'memory_percent']):
+            # Get top memory consumers, ranked by reclaimable (USS/PSS) memory
+            processes = []
+            for proc in psutil.process_iter(['pid', 'name', 'memory_info']):
                 try:
                     pinfo = proc.info
-                    if pinfo['memory_percent'] and pinfo['memory_percent'] > 2.0:
-                        high_memory_procs.append(pinfo)
+                    processes.append({
+                        'pid': pinfo['pid'],
+                        'name': pinfo['name'],
+                        'rss': pinfo['memory_info'].rss if pinfo['memory_info'] else 0
+                    })
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     continue
             
-            high_memory_procs.sort(key=lambda x: x['memory_percent'], reverse=True)
+            self.memory_accounting.apply(processes)
+            ranked = self.memory_accounting.rank([p for p in processes if p['memory'] > 2.0])
+            high_memory_procs = [p for p in ranked if p['measured']]
+            unmeasured_procs = [p for p in ranked if not p['measured']]
             
             suggestions.append("=== MEMORY OPTIMIZATION SUGGESTIONS ===\n")
             
@@ -750,10 +1099,53 @@ class SystemMonitor:
                 suggestions.append("Consider the following actions:\n")
             
             suggestions.append(f"Current Memory Usage: {self.memory_history[-1] if self.memory_history else 'N/A'}%\n")
-            suggestions.append("\nTop Memory Consumers:\n")
+            if self.pressure.available:
+                suggestions.append("Pressure Stall (some / full, last 10s): "
+                                   f"CPU {self.pressure.describe('cpu')}, "
+                                   f"Memory {self.pressure.describe('memory')}, "
+                                   f"I/O {self.pressure.describe('io')}\n")
+            if self.forecast_choice:
+                best, results = self.forecast_choice
+                suggestions.append("\nForecast Backtest (10-step MAE / interval coverage vs nominal):\n")
+                for model_name, result in results.items():
+                    if not result['count']:
+                        continue
+                    marker = " ← used" if model_name == best else ""
+                    suggestions.append(f"  {model_name:<6} {result['mae']:.2f}% / {result['coverage']:.0%} "
+                                       f"(nominal {result['nominal']:.0%}){marker}\n")
+            
+            suggestions.append(f"\nTop Memory Consumers ({self.memory_accounting.mode.upper()}):\n")
             
             for i, proc in enumerate(high_memory_procs[:10]):
-                suggestions.append(f"{i+1:2d}. {proc['name']:<20} - {proc['memory_percent']:.2f}%\n")
+                age = self.memory_accounting.age(proc['pid'])
+                sampled = f" ({proc['memory_source'].upper()}, {age:.0f}s old)" if age is not None else ""
+                suggestions.append(f"{i+1:2d}. {proc['name']:<20} - {proc['memory']:.2f}%{sampled}\n")
+            
+            if unmeasured_procs:
+                suggestions.append("\nNot Sampled Yet (RSS, includes shared pages):\n")
+                for proc in unmeasured_procs[:5]:
+                    suggestions.append(f"  • {proc['name']:<20} - {proc['memory']:.2f}%\n")
+            
+            shifts = [(series, event) for series, detector in self.change_detectors.items()
+                      for event in detector.recent(len(self.memory_history))]
+            if shifts:
+                suggestions.append("\nRecent Level Shifts:\n")
+                for series, event in sorted(shifts, key=lambda item: item[1]['sample']):
+                    suggestions.append(f"• {event['time'].strftime('%H:%M:%S')} {series.upper():<6} "
+                                       f"{event['before']:.1f}% → {event['after']:.1f}%\n")
+            process_shifts = [e for e in self.process_changes.events if e['direction'] == 'up'][-5:]
+            if process_shifts:
+                suggestions.append("\nProcesses That Stepped Up:\n")
+                for event in reversed(process_shifts):
+                    unit = 'MB' if event['metric'] == 'rss_mb' else '% CPU'
+                    suggestions.append(f"• {datetime.fromtimestamp(event['time']).strftime('%H:%M:%S')} "
+                                       f"{event['name']:<20} (PID {event['pid']}) "
+                                       f"{event['before']:.0f} → {event['after']:.0f} {unit}\n")
+            
+            if self.anomaly_detector.flagged:
+                suggestions.append("\nDeviating From Their Baseline:\n")
+                for anomaly in self.anomaly_detector.flagged[:5]:
+                    suggestions.append(f"• {anomaly['name']:<20} (PID {anomaly['pid']}) - score {anomaly['score']:.1f}\n")
             
             suggestions.append("\nRecommendations:\n")
             suggestions.append("• Close unnecessary applications\n")
@@ -774,6 +1166,14 @@ class SystemMonitor:
             else:
                 suggestions.append("\n🟢 Memory usage is within normal limits\n")
             
+            # Stalls show thrashing even when the percentage looks fine
+            assessment = self.pressure.assessment('memory')
+            if assessment and assessment[0] != 'ok':
+                level, pressure = assessment
+                suggestions.append(f"\n{'🔴' if level == 'critical' else '🟡'} MEMORY PRESSURE: tasks stalled "
+                                   f"{pressure:.1f}% of the last minute waiting for memory\n")
+                suggestions.append("• The system is reclaiming or swapping; free memory before usage % shows it\n")
+            
             # Update text widget
             self.optimization_text.delete(1.0, tk.END)
             self.optimization_text.insert(1.0, ''.join(suggestions))
@@ -781,6 +1181,25 @@ class SystemMonitor:
         except Exception as e:
             print(f"Optimization suggestions update error: {e}")
     
+    def refresh_perf_overlay(self):
+        """Show rolling update timings in the header while enabled"""
+        if getattr(self, 'perf_overlay_job', None):
+            self.root.after_cancel(self.perf_overlay_job)
+            self.perf_overlay_job = None
+        if self.perf_overlay_var.get():
+            self.perf_label.config(text=self.perf.overlay_text())
+            self.perf_overlay_job = self.root.after(1000, self.refresh_perf_overlay)
+        else:
+            self.perf_label.config(text="")
+    
+    def export_perf_stats(self):
+        """Export rolling update timings as JSON"""
+        try:
+            path = self.perf.export(f"perf_timings_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+            messagebox.showinfo("Export Timings", f"Timings exported to {path}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export timings: {e}")
+    
     def on_closing(self):
         """Handle application closing"""
         self.monitoring = False
@@ -807,8 +1226,12 @@ class SystemMonitor:
             
             # Initialize histories
             self.memory_history.append(memory.percent)
+            for model in self.forecasters.values():
+                model.update(memory.percent)
             self.cpu_history.append(cpu_percent)
             self.time_stamps.append(current_time)
+            self.change_detectors['memory'].update(memory.percent, current_time)
+            self.change_detectors['cpu'].update(cpu_percent, current_time)
             
             # Initial process graph
             self.update_process_graph()
@@ -882,13 +1305,30 @@ class SystemMonitor:
             try:
                 # Get system stats
                 memory = psutil.virtual_memory()
+                swap = psutil.swap_memory()
                 cpu_percent = psutil.cpu_percent(interval=1)
                 current_time = datetime.now()
+                self.oom_estimator.update(time.time(), memory.total - memory.available,
+                                          memory.available, swap.free)
                 
                 # Update histories
                 self.memory_history.append(memory.percent)
+                for model in self.forecasters.values():
+                    model.update(memory.percent)
                 self.cpu_history.append(cpu_percent)
                 self.time_stamps.append(current_time)
+                self.pressure_history.append(self.pressure.update())
+                self.change_detectors['memory'].update(memory.percent, current_time)
+                self.change_detectors['cpu'].update(cpu_percent, current_time)
+                
+                # Per-process snapshot; baselines are updated every tick
+                with self.perf.timed('monitor.process_snapshot'):
+                    self.previous_snapshot = self.process_snapshot
+                    self.process_snapshot = take_snapshot()
+                    self.anomaly_detector.update(self.process_snapshot)
+                    self.process_changes.update(self.process_snapshot)
+                    self.hang_detector.update(self.process_snapshot)
+                    self.cgroups.update(self.process_snapshot)
                 
                 # Small delay to prevent excessive CPU usage
                 time.sleep(2)
@@ -929,6 +1369,7 @@ class SystemMonitor:
                 self.memory_ax.tick_params(colors='#cdd6f4')
                 self.memory_ax.grid(True, alpha=0.3)
                 self.memory_ax.set_ylim(0, 100)
+                self.mark_change_points(self.memory_ax, 'memory', len(self.memory_history))
                 
                 # Add legend
                 self.memory_ax.legend(['Memory Usage', 'Warning (80%)'],
@@ -966,6 +1407,7 @@ class SystemMonitor:
                 self.cpu_ax.tick_params(colors='#cdd6f4')
                 self.cpu_ax.grid(True, alpha=0.3)
                 self.cpu_ax.set_ylim(0, 100)
+                self.mark_change_points(self.cpu_ax, 'cpu', len(self.cpu_history))
                 
                 # Add legend
                 self.cpu_ax.legend(['CPU Usage', 'Warning (80%)'],
@@ -978,6 +1420,14 @@ class SystemMonitor:
         except Exception as e:
             print(f"Chart update error: {e}")
     
+    def mark_change_points(self, ax, series, length):
+        """Draw the detected level shifts of a series on its chart"""
+        for x, event in self.change_detectors[series].chart_positions(length):
+            color = '#f9e2af' if event['direction'] == 'up' else '#94e2d5'
+            ax.axvline(x=x, color=color, linestyle=':', linewidth=1.5, alpha=0.8)
+            ax.annotate(f"{event['before']:.0f}→{event['after']:.0f}%", xy=(x, 95),
+                        color=color, fontsize=8, ha='left', va='top')
+    
     def filter_processes(self, event=None):
         """Filter processes based on search text"""
         try:
@@ -988,18 +1438,26 @@ class SystemMonitor:
 
     def refresh_process_list(self, filter_text=None):
         """Refresh the process list with optional filtering"""
+        if 'manager' not in self.built_tabs:
+            return
+        
         try:
-            # Clear existing items
-            for item in self.process_tree.get_children():
-                self.process_tree.delete(item)
+            if filter_text is None:
+                filter_text = self.filter_var.get().lower()
+            
+            if self.group_by_cgroup_var.get():
+                self.refresh_cgroup_list(filter_text)
+                return
             
             # Get all processes
             processes = []
+            total = 0
             for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 
                                            'memory_percent', 'memory_info',
                                            'num_threads', 'status']):
                 try:
                     pinfo = proc.info
+                    total += 1
                     
                     # Skip if filtered out
                     if filter_text and filter_text not in pinfo['name'].lower():
@@ -1020,8 +1478,19 @@ class SystemMonitor:
                     continue
             
             # Sort processes based on selected criterion
+            sort_keys = {
+                'PID': lambda x: x['pid'],
+                'Name': lambda x: x['name'].lower(),
+                'CPU%': lambda x: x['cpu_percent'],
+                'Memory%': lambda x: x['memory_percent'],
+                'Memory MB': lambda x: x['memory_mb'],
+                'Threads': lambda x: x['threads'] or 0,
+                'Status': lambda x: x['status']
+            }
             sort_by = self.sort_var.get()
-            if sort_by == 'memory':
+            if self.sort_column in sort_keys:
+                processes.sort(key=sort_keys[self.sort_column], reverse=True)
+            elif sort_by == 'memory':
                 processes.sort(key=lambda x: x['memory_percent'], reverse=True)
             elif sort_by == 'cpu':
                 processes.sort(key=lambda x: x['cpu_percent'], reverse=True)
@@ -1030,23 +1499,24 @@ class SystemMonitor:
             elif sort_by == 'pid':
                 processes.sort(key=lambda x: x['pid'])
             
-            # Add to treeview
-            for proc in processes[:100]:  # Limit to 100 for performance
-                self.process_tree.insert('', 'end', values=(
+            # Reconcile the treeview with the full, sorted list
+            self.process_model.set_rows([
+                (proc['pid'], (
                     proc['pid'],
                     proc['name'][:50],
                     f"{proc['cpu_percent']:.1f}",
                     f"{proc['memory_percent']:.1f}",
                     f"{proc['memory_mb']:.1f}",
                     proc['threads'],
-                    proc['status']
+                    self.describe_status(proc['pid'], proc['status'])
                 ))
+                for proc in processes
+            ])
             
             # Update status
-            total = len(processes)
-            shown = min(100, total)
+            first, last = self.process_model.visible_range()
             self.status_label.config(
-                text=f"Showing {shown} of {total} processes" +
+                text=f"Showing {first + 1 if last else 0}-{last} of {len(processes)} processes" +
                      (f" (filtered from {total})" if filter_text else "")
             )
             
@@ -1054,23 +1524,61 @@ class SystemMonitor:
             print(f"Process list refresh error: {e}")
             self.status_label.config(text=f"Error: {str(e)}")
 
+    def refresh_cgroup_list(self, filter_text=''):
+        """Show one row per cgroup, aggregated by the monitor thread every tick"""
+        groups = [g for g in self.cgroups.groups if not filter_text or filter_text in g['path'].lower()]
+        total_mb = psutil.virtual_memory().total / (1024 * 1024)
+        
+        def memory_mb(group):
+            return group['memory_mb'] if group['memory_mb'] is not None else group['rss_mb']
+        
+        sort_by = self.sort_column or self.sort_var.get()
+        if sort_by in ('cpu', 'CPU%'):
+            groups.sort(key=lambda g: g['cpu_percent'], reverse=True)
+        elif sort_by in ('name', 'Name'):
+            groups.sort(key=lambda g: g['path'])
+        elif sort_by in ('pid', 'PID'):
+            groups.sort(key=lambda g: len(g['pids']), reverse=True)
+        elif sort_by == 'Threads':
+            groups.sort(key=lambda g: g['threads'], reverse=True)
+        else:
+            groups.sort(key=memory_mb, reverse=True)
+        
+        # The PID column holds the process count; the status notes throttling
+        self.process_model.set_rows([
+            (f"cgroup:{group['path']}", (
+                len(group['pids']),
+                group['path'][-50:],
+                f"{group['cpu_percent']:.1f}",
+                f"{memory_mb(group) / total_mb * 100:.1f}",
+                f"{memory_mb(group):.1f}",
+                group['threads'],
+                f"throttled ×{group['throttled']}" if group['throttled'] else "cgroup"
+            ))
+            for group in groups
+        ])
+        
+        first, last = self.process_model.visible_range()
+        self.status_label.config(
+            text=f"Showing {first + 1 if last else 0}-{last} of {len(groups)} cgroups "
+                 f"({sum(len(g['pids']) for g in groups)} processes)"
+        )
+    
+    def describe_status(self, pid, status):
+        """Process status, qualified when the hang detector sees no progress"""
+        state = self.hang_detector.state(pid, status)
+        return f"{status} ({state})" if state in ('hung', 'blocked') else status
+
+    def on_sort_option(self, value):
+        """Switch back to the sort option menu order"""
+        self.sort_column = None
+        self.refresh_process_list()
+
     def sort_processes_by(self, column):
         """Sort process list by column"""
         try:
-            items = [(self.process_tree.set(item, column), item) 
-                    for item in self.process_tree.get_children('')]
-            
-            # Convert values for proper sorting
-            if column in ('CPU%', 'Memory%', 'Memory MB', 'Threads', 'PID'):
-                items = [(float(value.replace('%', '')), item) 
-                        if value else (0, item) for value, item in items]
-            
-            # Sort items
-            items.sort(reverse=True)
-            
-            # Rearrange items in sorted positions
-            for index, (_, item) in enumerate(items):
-                self.process_tree.move(item, '', index)
+            self.sort_column = column
+            self.refresh_process_list()
             
             # Update status
             self.status_label.config(text=f"Sorted by {column}")
@@ -1116,6 +1624,9 @@ class SystemMonitor:
             if not selection:
                 messagebox.showwarning("No Selection", "Please select a process first")
                 return
+            if self.group_by_cgroup_var.get():
+                messagebox.showwarning("Grouped View", "Turn off 'Group by cgroup' to manage a single process")
+                return
             
             # Get PID from selection
             item = self.process_tree.item(selection[0])
@@ -1152,7 +1663,7 @@ class SystemMonitor:
         """Show detailed information about selected process"""
         try:
             selection = self.process_tree.selection()
-            if not selection:
+            if not selection or self.group_by_cgroup_var.get():
                 return
             
             item = self.process_tree.item(selection[0])
@@ -1235,50 +1746,51 @@ class SystemMonitor:
         return bytes_value / (1024 * 1024 * 1024)
 
     def detect_anomalies(self):
-        """Detect anomalous processes based on resource usage"""
+        """Report processes deviating from their own baseline or from their peers"""
         try:
-            anomalies = []
-            
-            # Get current process stats
-            memory_values = []
-            cpu_values = []
-            process_data = []
-            
-            for proc in psutil.process_iter(['pid', 'name', 'memory_percent', 'cpu_percent']):
-                try:
-                    pinfo = proc.info
-                    if pinfo['memory_percent'] and pinfo['cpu_percent']:
-                        memory_values.append(pinfo['memory_percent'])
-                        cpu_values.append(pinfo['cpu_percent'])
-                        process_data.append(pinfo)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-            
-            if len(memory_values) < 3:
+            if self.process_snapshot is None:
                 messagebox.showinfo("Anomaly Detection", "Not enough data for anomaly detection")
                 return
             
-            # Calculate Z-scores
-            memory_z_scores = np.abs(stats.zscore(memory_values))
-            cpu_z_scores = np.abs(stats.zscore(cpu_values))
-            
-            # Find anomalies
-            for i, (mem_z, cpu_z) in enumerate(zip(memory_z_scores, cpu_z_scores)):
-                if mem_z > self.anomaly_threshold or cpu_z > self.anomaly_threshold:
-                    anomalies.append({
-                        'process': process_data[i],
-                        'memory_z': mem_z,
-                        'cpu_z': cpu_z
-                    })
+            # Baselines are maintained by the monitor thread every tick
+            anomalies = self.anomaly_detector.flagged
+            
+            # Joint robust distance over memory, CPU, threads and I/O rate
+            outliers = rank_outliers(self.process_snapshot, self.previous_snapshot,
+                                     z_threshold=self.anomaly_threshold)
+            stuck = self.hang_detector.stuck
             
             # Display results
-            if anomalies:
-                result = "Anomalous Processes Detected:\n\n"
+            if anomalies or outliers or stuck:
+                result = "Anomalous Processes Detected:\n\n" if anomalies else ""
                 for anomaly in anomalies[:10]:  # Limit to top 10
-                    proc = anomaly['process']
-                    result += f"PID: {proc['pid']}, Name: {proc['name']}\n"
-                    result += f"  Memory: {proc['memory_percent']:.2f}% (Z-score: {anomaly['memory_z']:.2f})\n"
-                    result += f"  CPU: {proc['cpu_percent']:.2f}% (Z-score: {anomaly['cpu_z']:.2f})\n\n"
+                    values, baseline, scores = anomaly['values'], anomaly['baseline'], anomaly['scores']
+                    result += f"PID: {anomaly['pid']}, Name: {anomaly['name']}\n"
+                    result += (f"  Memory: {values['rss_mb']:.1f} MB, baseline {baseline['rss_mb']:.1f} MB "
+                               f"(score: {scores['rss_mb']:.2f})\n")
+                    result += (f"  CPU: {values['cpu_percent']:.1f}%, baseline {baseline['cpu_percent']:.1f}% "
+                               f"(score: {scores['cpu_percent']:.2f})\n")
+                    result += (f"  Threads: {values['num_threads']:.0f}, baseline {baseline['num_threads']:.1f} "
+                               f"(score: {scores['num_threads']:.2f})\n\n")
+                
+                if outliers:
+                    result += "Unusual Compared To Other Processes:\n\n"
+                for outlier in outliers[:10]:
+                    values, z = outlier['values'], outlier['z']
+                    io_rate = values['io_rate']
+                    result += f"PID: {outlier['pid']}, Name: {outlier['name']} (distance: {outlier['distance']:.2f})\n"
+                    result += (f"  Memory: {values['rss_mb']:.1f} MB (z: {z['rss_mb']:.1f}), "
+                               f"CPU: {values['cpu_percent']:.1f}% (z: {z['cpu_percent']:.1f})\n")
+                    result += (f"  Threads: {values['num_threads']:.0f} (z: {z['num_threads']:.1f}), "
+                               f"I/O: {'N/A' if np.isnan(io_rate) else f'{io_rate / 1024:.0f} KB/s'} "
+                               f"(z: {z['io_rate']:.1f})\n\n")
+                
+                if stuck:
+                    result += "Not Making Progress:\n\n"
+                for proc in stuck[:10]:
+                    result += (f"PID: {proc['pid']}, Name: {proc['name']} - {proc['state']}, "
+                               f"{proc['blocked_fraction']:.0%} of {proc['samples']} ticks in D state, "
+                               f"{proc['cpu_seconds']:.2f}s CPU, {proc['switches']:.0f} switches\n")
                 
                 messagebox.showwarning("Anomaly Detection Results", result)
             else:
@@ -1287,16 +1799,38 @@ class SystemMonitor:
         except Exception as e:
             messagebox.showerror("Error", f"Anomaly detection failed: {e}")
 
+def run_headless(interval=2.0):
+    """Print memory usage, the OOM ETA and level shifts periodically without a GUI"""
+    estimator = OOMEstimator()
+    shifts = Cusum(floor=0.5)
+    try:
+        while True:
+            memory = psutil.virtual_memory()
+            swap = psutil.swap_memory()
+            estimator.update(time.time(), memory.total - memory.available,
+                             memory.available, swap.free)
+            shift = shifts.update(memory.percent)
+            print(f"{datetime.now().strftime('%H:%M:%S')} "
+                  f"Memory {memory.percent:5.1f}% | Swap {swap.percent:5.1f}% | "
+                  f"{estimator.describe()}", flush=True)
+            if shift:
+                print(f"  Memory level shift: {shift['before']:.1f}% → {shift['after']:.1f}%", flush=True)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\nStopped")
+
 def main():
     """Main application entry point"""
-    # Check if required modules are available
-    try:
-        import psutil
-        import matplotlib
-        import networkx
-        import scipy
-    except ImportError as e:
-        print(f"Missing required module: {e}")
+    if '--headless' in sys.argv:
+        run_headless()
+        return
+    
+    # Check if required modules are available (without importing the
+    # heavy ones until they are needed)
+    missing = [name for name in ('psutil', 'matplotlib', 'networkx', 'scipy', 'numpy')
+               if importlib.util.find_spec(name) is None]
+    if missing:
+        print(f"Missing required module: {', '.join(missing)}")
         print("Please install required packages:")
         print("pip install psutil matplotlib networkx scipy numpy")
         return
@@ -0,0 +1,393 @@
+import numpy as np
+
+
+class ProcessSlots:
+    """Rows of per-process NumPy arrays keyed by (pid, create_time).
+
+    New processes get a free row (the arrays double when full), and rows
+    of processes missing from a snapshot are recycled, so per-tick work is
+    plain fancy indexing with the array returned by ``assign``.
+    """
+
+    def __init__(self, **arrays):
+        self.slots = {}
+        self.free = []
+        self.shapes = {name: tuple(shape) for name, shape in arrays.items()}
+        self.arrays = {name: np.zeros((0,) + shape) for name, shape in self.shapes.items()}
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    def assign(self, keys):
+        """Return the row of every key, releasing rows of keys not present"""
+        alive = set(keys)
+        for key in [k for k in self.slots if k not in alive]:
+            self.free.append(self.slots.pop(key))
+
+        rows = np.empty(len(keys), dtype=np.int64)
+        fresh = []
+        for i, key in enumerate(keys):
+            row = self.slots.get(key)
+            if row is None:
+                if not self.free:
+                    self._grow()
+                row = self.slots[key] = self.free.pop()
+                fresh.append(row)
+            rows[i] = row
+        for array in self.arrays.values():
+            array[fresh] = 0
+        return rows
+
+    def _grow(self):
+        """Double the capacity of every array"""
+        size = len(next(iter(self.arrays.values())))
+        grow = max(size, 64)
+        for name, shape in self.shapes.items():
+            self.arrays[name] = np.concatenate((self.arrays[name], np.zeros((grow,) + shape)))
+        self.free = list(range(size + grow - 1, size - 1, -1))
+
+
+class StreamingAnomalyDetector:
+    """Per-process baselines updated every tick in columnar arrays.
+
+    Each (pid, create_time) owns a row in arrays of running mean and
+    variance per metric. Updates use Welford's recurrence until a row has
+    seen ``1 / alpha`` samples and an exponentially weighted one after that,
+    so baselines follow slow drift while a sudden jump still stands out. A
+    sample is scored against the baseline *before* it is folded in, and a
+    metric must exceed ``threshold`` deviations (with a per-metric floor on
+    the deviation, so idle processes do not flag on tiny changes).
+    """
+
+    def __init__(self, metrics=('rss_mb', 'cpu_percent', 'num_threads'),
+                 floors=(1.0, 1.0, 1.0), threshold=2.5, warmup=5, alpha=0.05):
+        self.metrics = tuple(metrics)
+        self.floors = np.asarray(floors, dtype=float)
+        self.threshold = threshold
+        self.warmup = warmup
+        self.alpha = alpha
+        self.table = ProcessSlots(count=(), mean=(len(self.metrics),), var=(len(self.metrics),))
+        self.flagged = []
+
+    def update(self, snapshot):
+        """Fold one ProcessSnapshot into the baselines and return the flagged rows.
+
+        Each flagged entry is a dict with pid, name, the current values, their
+        baselines and deviation scores, sorted by the largest score.
+        """
+        slots = self.table.assign(snapshot.keys())
+        values = np.column_stack([snapshot[m] for m in self.metrics]).reshape(len(slots), len(self.metrics))
+
+        count = self.table['count'][slots]
+        mean = self.table['mean'][slots]
+        var = self.table['var'][slots]
+        known = ~np.isnan(values)
+
+        # Score against the baseline before this sample is folded in
+        scale = np.maximum(np.sqrt(var), self.floors)
+        scores = np.where(known, np.abs(values - mean) / scale, 0.0)
+        scores[count < self.warmup] = 0.0
+
+        # Welford while young, EWMA once the window is full
+        weight = np.maximum(1.0 / (count + 1.0), self.alpha)[:, np.newaxis]
+        delta = np.where(known, values - mean, 0.0)
+        self.table['count'][slots] = count + 1
+        self.table['mean'][slots] = mean + weight * delta
+        self.table['var'][slots] = (1.0 - weight) * (var + weight * delta ** 2)
+
+        worst = scores.max(axis=1, initial=0.0)
+        rows = np.nonzero(worst > self.threshold)[0]
+        rows = rows[np.argsort(-worst[rows])]
+        self.flagged = [{
+            'pid': int(snapshot.pids[i]),
+            'name': snapshot.names[i],
+            'values': dict(zip(self.metrics, values[i].tolist())),
+            'baseline': dict(zip(self.metrics, mean[i].tolist())),
+            'scores': dict(zip(self.metrics, scores[i].tolist())),
+            'score': float(worst[i])
+        } for i in rows]
+        return self.flagged
+
+
+class LeakDetector:
+    """Rolling least-squares RSS trend for every process at once.
+
+    Each process keeps its last ``window`` (time, RSS) samples in a ring and
+    the running sums of t, y, t*t, t*y and y*y over it. A new sample adds its
+    terms and subtracts those of the sample it evicts, so the slope and R^2
+    of every process cost O(1) per sample. The sums are rebuilt from the
+    rings every ``window`` ticks to stop floating-point drift.
+
+    The defaults (30 minutes of 2 s ticks, at least 10 minutes of samples,
+    5 MB/hour and 20 MB fitted growth over the samples) keep warm-up heap
+    and page-cache growth from being reported as a leak.
+    """
+
+    def __init__(self, window=900, min_samples=300, min_r2=0.8, min_rate=5.0, min_growth=20.0):
+        self.window = window
+        self.min_samples = min_samples
+        self.min_r2 = min_r2
+        self.min_rate = min_rate  # MB/hour
+        self.min_growth = min_growth  # MB over the samples in the window
+        self.origin = None
+        self.ticks = 0
+        self.table = ProcessSlots(t=(window,), y=(window,), head=(), n=(), sums=(5,))
+        self.growers = []
+
+    def update(self, snapshot):
+        """Add one ProcessSnapshot and return the ranked growers"""
+        if self.origin is None:
+            self.origin = snapshot.timestamp
+        slots = self.table.assign(snapshot.keys())
+        t = np.full(len(slots), snapshot.timestamp - self.origin)
+        y = snapshot['rss_mb']
+        known = ~np.isnan(y)
+        slots, t, y = slots[known], t[known], y[known]
+
+        head = self.table['head'][slots].astype(np.int64)
+        n = self.table['n'][slots]
+        full = n >= self.window
+        old_t = self.table['t'][slots, head]
+        old_y = self.table['y'][slots, head]
+
+        sums = self.table['sums'][slots]
+        sums += self._terms(t, y)
+        sums[full] -= self._terms(old_t[full], old_y[full])
+        self.table['sums'][slots] = sums
+
+        self.table['t'][slots, head] = t
+        self.table['y'][slots, head] = y
+        self.table['head'][slots] = (head + 1) % self.window
+        self.table['n'][slots] = np.minimum(n + 1, self.window)
+
+        self.ticks += 1
+        if self.ticks % self.window == 0:
+            self._rebuild()
+
+        self.growers = self.rank(snapshot, slots, known)
+        return self.growers
+
+    def trend(self, slots):
+        """Return (slope in MB/hour, R^2) for the given rows"""
+        n = self.table['n'][slots]
+        st, sy, stt, sty, syy = self.table['sums'][slots].T
+        var_t = n * stt - st ** 2
+        var_y = n * syy - sy ** 2
+        cov = n * sty - st * sy
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slope = np.where(var_t > 0, cov / var_t, 0.0)
+            r2 = np.where((var_t > 0) & (var_y > 0), cov ** 2 / (var_t * var_y), 0.0)
+        return slope * 3600, np.clip(r2, 0.0, 1.0)
+
+    def span(self, slots):
+        """Seconds between the oldest and newest sample of the given rows"""
+        head = self.table['head'][slots].astype(np.int64)
+        n = self.table['n'][slots]
+        newest = (head - 1) % self.window
+        oldest = np.where(n >= self.window, head, 0)
+        return self.table['t'][slots, newest] - self.table['t'][slots, oldest]
+
+    def rank(self, snapshot, slots, known):
+        """Processes growing steadily, fastest first"""
+        rate, r2 = self.trend(slots)
+        n = self.table['n'][slots]
+        growth = rate * self.span(slots) / 3600
+        rows = np.nonzero((n >= self.min_samples) & (r2 >= self.min_r2) & (rate >= self.min_rate)
+                          & (growth >= self.min_growth))[0]
+        rows = rows[np.argsort(-rate[rows])]
+        index = np.nonzero(known)[0]
+        return [{
+            'pid': int(snapshot.pids[index[i]]),
+            'name': snapshot.names[index[i]],
+            'rss_mb': float(snapshot['rss_mb'][index[i]]),
+            'mb_per_hour': float(rate[i]),
+            'growth_mb': float(growth[i]),
+            'r2': float(r2[i]),
+            'samples': int(n[i])
+        } for i in rows]
+
+    def _terms(self, t, y):
+        """Per-sample contributions to the running sums"""
+        return np.column_stack((t, y, t * t, t * y, y * y))
+
+    def _rebuild(self):
+        """Recompute every sum exactly from the sample rings"""
+        t, y = self.table['t'], self.table['y']
+        filled = np.arange(self.window)[np.newaxis, :] < self.table['n'][:, np.newaxis]
+        t = np.where(filled, t, 0.0)
+        y = np.where(filled, y, 0.0)
+        self.table['sums'][:] = np.stack(
+            (t.sum(1), y.sum(1), (t * t).sum(1), (t * y).sum(1), (y * y).sum(1)), axis=1)
+
+
+class HangDetector:
+    """Tell idle processes from blocked and hung ones by their progress.
+
+    Every process keeps a ring of the last ``window`` ticks of cumulative
+    CPU time, context switches and whether it was in uninterruptible sleep
+    (``D``, psutil's 'disk-sleep'), plus a running count of those ticks. The
+    progress over the window is newest minus oldest, so each tick is O(1)
+    per process:
+
+    - idle: sleeping and making no progress, which is normal
+    - blocked: in D state for at least ``blocked_fraction`` of the window
+    - hung: in D state for the whole window with neither CPU time nor a
+      single context switch
+    - zombie: exited but never reaped by its parent
+    """
+
+    BLOCKED = 'disk-sleep'
+
+    def __init__(self, window=15, blocked_fraction=0.5, min_samples=5):
+        self.window = window
+        self.blocked_fraction = blocked_fraction
+        self.min_samples = min_samples
+        self.table = ProcessSlots(cpu=(window,), switches=(window,), blocked=(window,),
+                                  head=(), n=(), blocked_count=())
+        self.states = {}
+        self.stuck = []
+
+    def update(self, snapshot):
+        """Add one ProcessSnapshot; return the zombie, blocked and hung processes"""
+        slots = self.table.assign(snapshot.keys())
+        blocked = np.fromiter((status == self.BLOCKED for status in snapshot.statuses),
+                              dtype=float, count=len(slots))
+
+        t = self.table
+        head = t['head'][slots].astype(np.int64)
+        n = t['n'][slots]
+        full = n >= self.window
+        evicted = np.where(full, t['blocked'][slots, head], 0.0)
+        t['blocked_count'][slots] += blocked - evicted
+
+        t['cpu'][slots, head] = snapshot['cpu_time']
+        t['switches'][slots, head] = snapshot['ctx_switches']
+        t['blocked'][slots, head] = blocked
+        t['head'][slots] = (head + 1) % self.window
+        n = t['n'][slots] = np.minimum(n + 1, self.window)
+
+        # Oldest sample still in the ring; NaN deltas (unreadable counters)
+        # never count as progress or its absence
+        oldest = np.where(n >= self.window, (head + 1) % self.window, 0)
+        cpu = snapshot['cpu_time'] - t['cpu'][slots, oldest]
+        switches = snapshot['ctx_switches'] - t['switches'][slots, oldest]
+        fraction = t['blocked_count'][slots] / n
+
+        no_progress = (cpu == 0) & (switches == 0)
+        hung = (n >= self.window) & (fraction >= 1.0) & no_progress
+        is_blocked = ~hung & (n >= self.min_samples) & (fraction >= self.blocked_fraction)
+        zombie = np.fromiter((status == 'zombie' for status in snapshot.statuses),
+                             dtype=bool, count=len(slots))
+
+        self.states = {}
+        self.stuck = []
+        for i in np.nonzero(hung | is_blocked | zombie)[0]:
+            state = 'zombie' if zombie[i] else 'hung' if hung[i] else 'blocked'
+            pid = int(snapshot.pids[i])
+            self.states[pid] = state
+            self.stuck.append({
+                'pid': pid,
+                'name': snapshot.names[i],
+                'state': state,
+                'blocked_fraction': float(fraction[i]),
+                'cpu_seconds': float(cpu[i]),
+                'switches': float(switches[i]),
+                'samples': int(n[i])
+            })
+        order = {'hung': 0, 'blocked': 1, 'zombie': 2}
+        self.stuck.sort(key=lambda p: (order[p['state']], -p['blocked_fraction']))
+        return self.stuck
+
+    def state(self, pid, status=None):
+        """'hung', 'blocked', 'zombie', 'idle' or 'active' for a pid of the last update"""
+        if pid in self.states:
+            return self.states[pid]
+        return 'idle' if status in ('sleeping', 'idle') else 'active'
+
+
+ROBUST_METRICS = ('rss_mb', 'cpu_percent', 'num_threads', 'io_rate')
+
+
+def robust_mahalanobis(matrix, core_cutoff=3.0):
+    """Robust joint outlier distance for every row of a samples x metrics matrix.
+
+    Columns are log1p-compressed (per-process usage is heavy-tailed), then
+    centered on the median and scaled by the MAD. The correlation between
+    metrics is estimated only from the core rows whose robust z-scores all
+    stay below core_cutoff, so the outliers being looked for do not inflate
+    it. NaNs are treated as the column median; columns without a single
+    finite value (such as an I/O rate with no previous snapshot) are left
+    out and get NaN scores. Returns (distance, z) where z is the robust
+    scaled matrix.
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    usable = np.isfinite(matrix).any(axis=0)
+    z = np.full(matrix.shape, np.nan)
+    if not usable.any():
+        return np.zeros(len(matrix)), z
+
+    values = matrix[:, usable]
+    values = np.log1p(np.maximum(np.where(np.isfinite(values), values, np.nan), 0.0))
+    median = np.nanmedian(values, axis=0)
+    values = np.where(np.isnan(values), median, values)
+
+    deviation = np.abs(values - median)
+    mad = np.median(deviation, axis=0) * 1.4826
+    # Mostly-idle columns have a MAD of zero; scale them by the MAD of the
+    # rows that do deviate from the median instead
+    for column in np.nonzero(mad == 0)[0]:
+        moved = deviation[:, column][deviation[:, column] > 0]
+        mad[column] = np.median(moved) * 1.4826 if len(moved) else 1.0
+    scaled = (values - median) / np.maximum(mad, 1e-6)
+    z[:, usable] = scaled
+
+    core = scaled[(np.abs(scaled) < core_cutoff).all(axis=1)]
+    if len(core) <= scaled.shape[1]:
+        core = scaled
+    dims = scaled.shape[1]
+    covariance = np.cov(core, rowvar=False).reshape(dims, dims)
+    # Keep the robust scales and take only the correlation from the core;
+    # zero-inflated columns would otherwise get a near-zero core variance
+    spread = np.sqrt(np.diag(covariance))
+    spread = np.where(spread > 0, spread, 1.0)
+    correlation = covariance / np.outer(spread, spread)
+    np.fill_diagonal(correlation, 1.0)
+    precision = np.linalg.pinv(correlation)
+    distance = np.sqrt(np.maximum(np.einsum('ij,jk,ik->i', scaled, precision, scaled), 0.0))
+    return distance, z
+
+
+def mahalanobis_threshold(z_threshold, dims):
+    """Distance with the same tail probability as a two-sided z_threshold"""
+    from scipy import stats
+    tail = 2.0 * stats.norm.sf(z_threshold)
+    return float(np.sqrt(stats.chi2.isf(tail, dims)))
+
+
+def rank_outliers(snapshot, previous=None, z_threshold=2.5, metrics=ROBUST_METRICS):
+    """Rank the processes of a snapshot by robust Mahalanobis distance.
+
+    'io_rate' is derived from previous; other metrics are snapshot columns.
+    Metrics with no readable value (io_rate on the first tick) are skipped
+    and score NaN. Returns dicts (pid, name, distance, values, z) above the
+    threshold, farthest first.
+    """
+    if len(snapshot) <= len(metrics):
+        return []
+    columns = [snapshot.rate(previous, 'io_bytes') if m == 'io_rate' else snapshot[m] for m in metrics]
+    matrix = np.column_stack(columns)
+    dims = int(np.isfinite(matrix).any(axis=0).sum())
+    if not dims:
+        return []
+    distance, z = robust_mahalanobis(matrix)
+    threshold = mahalanobis_threshold(z_threshold, dims)
+
+    rows = np.nonzero(distance > threshold)[0]
+    rows = rows[np.argsort(-distance[rows])]
+    return [{
+        'pid': int(snapshot.pids[i]),
+        'name': snapshot.names[i],
+        'distance': float(distance[i]),
+        'values': dict(zip(metrics, matrix[i].tolist())),
+        'z': dict(zip(metrics, z[i].tolist()))
+    } for i in rows]
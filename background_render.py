@@ -0,0 +1,162 @@
+import threading
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+class BackgroundRenderer:
+    """Rasterizes the plot of a FigureCanvasTkAgg axes on a worker thread.
+
+    The Tk thread hands ``submit`` a plain copy of the data to plot. The
+    worker paints it with ``paint(ax, data)`` into a private off-screen Agg
+    figure of the same size, and the Tk thread polls for the finished frame
+    and blits it with the canvas' public ``restore_region``/``blit``. The
+    Tk figure's artists are never touched by the worker, and ``lock`` only
+    guards handing over data and frames, so the Tk thread never waits for
+    a render. Submissions that arrive while a frame renders are coalesced.
+
+    When a frame is shown the Tk axes takes its position and limits, so
+    hit-testing in data coordinates matches what is on screen, and every
+    callable in ``on_frame`` runs. Resizes and toolbar pans/zooms re-render
+    the last data. With ``enabled`` False, data is painted straight into
+    the Tk axes and drawn synchronously.
+    """
+
+    def __init__(self, tk_canvas, ax, paint, enabled=True, poll_ms=30):
+        self.tk_canvas = tk_canvas
+        self.ax = ax
+        self.paint = paint
+        self.enabled = enabled
+        self.poll_ms = poll_ms
+        self.lock = threading.Lock()
+        self.on_frame = []
+        self.data = None
+        self.limits = None  # (xlim, ylim) pinned by the last submit, if any
+        self.frame = None  # (region, size, position, limits) on screen
+
+        self.figure = Figure(facecolor=tk_canvas.figure.get_facecolor())
+        FigureCanvasAgg(self.figure)
+        self.offscreen_ax = self.figure.add_subplot(111)
+
+        self._job = None
+        self._ready = None
+        self._busy = False
+        self._polling = False
+        self._requested = threading.Event()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+        tk_canvas.mpl_connect('draw_event', self._on_draw)
+
+    def submit(self, data, limits=None):
+        """Plot data (a copy the caller will not mutate); limits pins (xlim, ylim)"""
+        self.data = data
+        self.limits = limits
+        if data is None:
+            return
+        if not self.enabled:
+            self.frame = None
+            self.ax.clear()
+            self.paint(self.ax, data)
+            if limits:
+                self.ax.set_xlim(limits[0])
+                self.ax.set_ylim(limits[1])
+            self.tk_canvas.draw()
+            return
+
+        figure = self.tk_canvas.figure
+        with self.lock:
+            self._job = (data, limits, tuple(figure.get_size_inches()), figure.dpi)
+            self._busy = True
+        self._requested.set()
+        self._schedule_poll()
+
+    def redraw(self):
+        """Render the last submitted data again, keeping any pinned limits"""
+        self.submit(self.data, limits=self.limits)
+
+    def _run(self):
+        """Worker loop rendering the latest submitted data"""
+        while True:
+            self._requested.wait()
+            self._requested.clear()
+            with self.lock:
+                job, self._job = self._job, None
+            if job is None:
+                continue
+            try:
+                frame = self._render(*job)
+            except Exception as e:
+                print(f"Background render error: {e}")
+                frame = None
+            with self.lock:
+                if frame is not None:
+                    self._ready = frame
+                self._busy = self._job is not None
+
+    def _render(self, data, limits, size, dpi):
+        """Paint data into the off-screen figure and copy out the pixels"""
+        self.figure.set_size_inches(size, forward=False)
+        self.figure.set_dpi(dpi)
+        ax = self.offscreen_ax
+        ax.clear()
+        self.paint(ax, data)
+        if limits:
+            ax.set_xlim(limits[0])
+            ax.set_ylim(limits[1])
+        self.figure.canvas.draw()
+        region = self.figure.canvas.copy_from_bbox(self.figure.bbox)
+        return (region, self._pixel_size(self.figure), ax.get_position(),
+                (ax.get_xlim(), ax.get_ylim()))
+
+    def _schedule_poll(self):
+        if not self._polling:
+            self._polling = True
+            self.tk_canvas.get_tk_widget().after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        """Tk thread: show a finished frame, keep polling while work is pending"""
+        self._polling = False
+        with self.lock:
+            frame, self._ready = self._ready, None
+            busy = self._busy
+        if frame is not None and self.enabled:
+            self._present(frame)
+        if busy:
+            self._schedule_poll()
+
+    def _present(self, frame):
+        """Blit a finished frame into the Tk canvas"""
+        region, size, position, limits = frame
+        if size != self._pixel_size(self.tk_canvas.figure):
+            self.redraw()  # Resized while rendering
+            return
+        self.ax.set_position(position)
+        self.ax.set_xlim(limits[0])
+        self.ax.set_ylim(limits[1])
+        self.frame = frame
+        self.tk_canvas.restore_region(region)
+        self.tk_canvas.blit()
+        for callback in self.on_frame:
+            callback()
+
+    def _on_draw(self, event):
+        """Keep the frame on screen when the Tk canvas redraws itself"""
+        if not self.enabled or self.frame is None:
+            return
+        region, size, _, limits = self.frame
+        current = (self.ax.get_xlim(), self.ax.get_ylim())
+        if size != self._pixel_size(self.tk_canvas.figure):
+            self.redraw()
+        else:
+            # FigureCanvasTkAgg.draw blits the buffer right after this event;
+            # animated overlays (the hover tooltip) redraw themselves. After
+            # a toolbar pan/zoom the old frame stays up until the new one lands
+            self.tk_canvas.restore_region(region)
+            if current != limits:
+                self.submit(self.data, limits=current)
+
+    @staticmethod
+    def _pixel_size(figure):
+        width, height = figure.bbox.size
+        return int(width), int(height)
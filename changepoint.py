@@ -0,0 +1,154 @@
+import collections
+
+import numpy as np
+
+from anomaly import ProcessSlots
+
+
+class Cusum:
+    """Two-sided CUSUM change-point detector for one series, O(1) per sample.
+
+    Samples are standardized against a running baseline (Welford while
+    young, EWMA after ``1 / alpha`` samples) and accumulated into an upward
+    and a downward sum that drain by ``k`` deviations per sample. A sum
+    crossing ``h`` marks a shift: an event is recorded, both sums restart
+    and the baseline is relearned from the new regime. ``floor`` bounds the
+    deviation from below so a flat series does not alarm on noise.
+    """
+
+    def __init__(self, k=0.5, h=5.0, alpha=0.05, warmup=10, floor=1.0, history=100):
+        self.k = k
+        self.h = h
+        self.alpha = alpha
+        self.warmup = warmup
+        self.floor = floor
+        self.count = 0
+        self.mean = self.var = 0.0
+        self.upper = self.lower = 0.0
+        self.upper_run = self.lower_run = 0
+        self.samples = 0
+        self.events = collections.deque(maxlen=history)
+
+    def update(self, value, timestamp=None):
+        """Add a sample and return the change event it completes, if any"""
+        self.samples += 1
+        event = None
+        if self.count >= self.warmup:
+            scale = max(self.var ** 0.5, self.floor)
+            z = (value - self.mean) / scale
+            self.upper = max(0.0, self.upper + z - self.k)
+            self.lower = max(0.0, self.lower - z - self.k)
+            self.upper_run = self.upper_run + 1 if self.upper > 0 else 0
+            self.lower_run = self.lower_run + 1 if self.lower > 0 else 0
+
+            if self.upper > self.h or self.lower > self.h:
+                up = self.upper > self.h
+                total, run = (self.upper, self.upper_run) if up else (-self.lower, self.lower_run)
+                # Page's estimate of the level the series moved to
+                level = self.mean + scale * (total / run + (self.k if up else -self.k))
+                event = {
+                    'time': timestamp,
+                    'sample': self.samples - 1,
+                    'start': self.samples - run,
+                    'direction': 'up' if up else 'down',
+                    'before': float(self.mean),
+                    'after': float(level)
+                }
+                self.events.append(event)
+                self.count = 0
+                self.upper = self.lower = 0.0
+                self.upper_run = self.lower_run = 0
+
+        weight = max(1.0 / (self.count + 1.0), self.alpha)
+        delta = value - self.mean
+        self.count += 1
+        self.mean += weight * delta
+        self.var = (1.0 - weight) * (self.var + weight * delta ** 2)
+        return event
+
+    def recent(self, samples):
+        """Events among the last ``samples`` samples, oldest first"""
+        return [e for e in self.events if e['sample'] >= self.samples - samples]
+
+    def chart_positions(self, length):
+        """(x, event) for events inside a chart of the last ``length`` samples"""
+        offset = length - self.samples
+        return [(e['sample'] + offset, e) for e in self.recent(length)]
+
+
+class ProcessCusum:
+    """Two-sided CUSUM over every metric of every process at once.
+
+    The per-process state of :class:`Cusum` lives in ProcessSlots arrays
+    keyed by (pid, create_time), so one tick is a handful of vectorized
+    operations regardless of the number of processes. Events carry the pid,
+    name and metric that shifted.
+    """
+
+    def __init__(self, metrics=('rss_mb', 'cpu_percent'), floors=(5.0, 5.0),
+                 k=0.5, h=5.0, alpha=0.05, warmup=10, history=200):
+        self.metrics = tuple(metrics)
+        self.floors = np.asarray(floors, dtype=float)
+        self.k = k
+        self.h = h
+        self.alpha = alpha
+        self.warmup = warmup
+        shape = (len(self.metrics),)
+        self.table = ProcessSlots(count=shape, mean=shape, var=shape, upper=shape, lower=shape,
+                                  upper_run=shape, lower_run=shape)
+        self.events = collections.deque(maxlen=history)
+
+    def update(self, snapshot):
+        """Fold one ProcessSnapshot in and return the events it completes"""
+        slots = self.table.assign(snapshot.keys())
+        values = np.column_stack([snapshot[m] for m in self.metrics]).reshape(len(slots), len(self.metrics))
+        known = ~np.isnan(values)
+        values = np.where(known, values, 0.0)
+
+        t = self.table
+        count, mean, var = t['count'][slots], t['mean'][slots], t['var'][slots]
+        upper, lower = t['upper'][slots], t['lower'][slots]
+        upper_run, lower_run = t['upper_run'][slots], t['lower_run'][slots]
+
+        active = known & (count >= self.warmup)
+        scale = np.maximum(np.sqrt(var), self.floors)
+        z = (values - mean) / scale
+        upper = np.where(active, np.maximum(0.0, upper + z - self.k), upper)
+        lower = np.where(active, np.maximum(0.0, lower - z - self.k), lower)
+        upper_run = np.where(active, np.where(upper > 0, upper_run + 1, 0), upper_run)
+        lower_run = np.where(active, np.where(lower > 0, lower_run + 1, 0), lower_run)
+
+        up = upper > self.h
+        down = ~up & (lower > self.h)
+        shifted = up | down
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drift = np.where(up, upper / upper_run + self.k, -lower / lower_run - self.k)
+        level = mean + scale * drift
+
+        events = []
+        for i, j in zip(*np.nonzero(shifted)):
+            event = {
+                'time': snapshot.timestamp,
+                'pid': int(snapshot.pids[i]),
+                'name': snapshot.names[i],
+                'metric': self.metrics[j],
+                'direction': 'up' if up[i, j] else 'down',
+                'before': float(mean[i, j]),
+                'after': float(level[i, j])
+            }
+            events.append(event)
+            self.events.append(event)
+
+        # Restart the sums and relearn the baseline wherever a shift was found
+        count[shifted] = 0
+        upper[shifted] = lower[shifted] = 0.0
+        upper_run[shifted] = lower_run[shifted] = 0
+
+        weight = np.maximum(1.0 / (count + 1.0), self.alpha)
+        delta = np.where(known, values - mean, 0.0)
+        t['count'][slots] = count + known
+        t['mean'][slots] = mean + weight * delta
+        t['var'][slots] = np.where(known, (1.0 - weight) * (var + weight * delta ** 2), var)
+        t['upper'][slots], t['lower'][slots] = upper, lower
+        t['upper_run'][slots], t['lower_run'][slots] = upper_run, lower_run
+        return events
@@ -0,0 +1,218 @@
+import collections
+import os
+import time
+
+import numpy as np
+
+PSI_ROOT = '/proc/pressure'
+PSI_RESOURCES = ('cpu', 'memory', 'io')
+# Pure cgroup v2, then the unified hierarchy of a hybrid v1/v2 mount
+CGROUP_ROOTS = ('/sys/fs/cgroup', '/sys/fs/cgroup/unified')
+
+
+def parse_pressure(text):
+    """Parse a PSI file into {'some': {...}, 'full': {...}}.
+
+    Each line looks like ``some avg10=0.12 avg60=0.05 avg300=0.01 total=1234``
+    where the averages are percentages and total is cumulative stall time
+    in microseconds.
+    """
+    result = {}
+    for line in text.splitlines():
+        kind, *fields = line.split()
+        values = dict(field.split('=', 1) for field in fields)
+        result[kind] = {name: float(value) for name, value in values.items()}
+    return result
+
+
+class PressureCollector:
+    """Linux pressure stall information (PSI) for CPU, memory and I/O.
+
+    ``update`` reads /proc/pressure/{cpu,memory,io} and adds to every
+    some/full line a 'stall' figure: the percentage of wall time tasks were
+    stalled since the previous update, from the delta of the cumulative
+    'total' counter. Kernels without PSI (older than 4.20, or booted with
+    psi=0) leave ``available`` False and every reading None.
+    """
+
+    def __init__(self, root=PSI_ROOT):
+        self.root = root
+        self.available = all(os.path.exists(os.path.join(root, r)) for r in PSI_RESOURCES)
+        self.latest = {}
+        self.previous = None  # (timestamp, {resource: {kind: total}})
+
+    def update(self):
+        """Read all resources and return {resource: {kind: fields}}, or {} without PSI"""
+        if not self.available:
+            return {}
+        timestamp = time.monotonic()
+        readings = {}
+        try:
+            for resource in PSI_RESOURCES:
+                with open(os.path.join(self.root, resource)) as f:
+                    readings[resource] = parse_pressure(f.read())
+        except (OSError, ValueError) as e:
+            print(f"Error reading pressure stall information: {e}")
+            self.available = False
+            self.latest = {}
+            return self.latest
+
+        if self.previous is not None:
+            elapsed = timestamp - self.previous[0]
+            for resource, kinds in readings.items():
+                for kind, fields in kinds.items():
+                    before = self.previous[1].get(resource, {}).get(kind)
+                    if before is not None and elapsed > 0:
+                        # total is in microseconds
+                        fields['stall'] = max(fields['total'] - before, 0.0) / (elapsed * 1e4)
+
+        self.previous = (timestamp, {resource: {kind: fields['total'] for kind, fields in kinds.items()}
+                                     for resource, kinds in readings.items()})
+        self.latest = readings
+        return readings
+
+    def value(self, resource, kind='some', field='avg10'):
+        """One figure of the last update, or None if unavailable"""
+        return self.latest.get(resource, {}).get(kind, {}).get(field)
+
+    def describe(self, resource):
+        """Short 'some / full' avg10 text for display"""
+        some = self.value(resource, 'some')
+        if some is None:
+            return "N/A"
+        full = self.value(resource, 'full')
+        return f"{some:.1f}%" if full is None else f"{some:.1f}% / {full:.1f}%"
+
+    def assessment(self, resource='memory', warn=10.0, critical=25.0):
+        """('ok' | 'warning' | 'critical', avg60) from the some avg60 figure, or None"""
+        pressure = self.value(resource, 'some', 'avg60')
+        if pressure is None:
+            return None
+        level = 'critical' if pressure >= critical else 'warning' if pressure >= warn else 'ok'
+        return level, pressure
+
+
+def parse_keyed(text):
+    """Parse a flat-keyed cgroup file (``key value`` per line) into ints"""
+    result = {}
+    for line in text.splitlines():
+        key, _, value = line.partition(' ')
+        if value.strip().isdigit():
+            result[key] = int(value)
+    return result
+
+
+class CgroupCollector:
+    """Aggregate processes by the cgroup v2 they belong to.
+
+    The cgroup of every (pid, create_time) is read once from
+    /proc/<pid>/cgroup and cached until the process goes away. Each
+    ``update`` groups the rows of a ProcessSnapshot by cgroup and reads
+    memory.current, memory.stat and cpu.stat of each group, so services in
+    systemd slices and containers show up as one unit. The CPU percentage is
+    the delta of cpu.stat usage_usec (percent of one CPU) and 'throttled' the
+    number of throttled periods since the previous update. The root cgroup's
+    cpu.stat covers the whole machine, so its CPU is the sum over the
+    processes directly in it. Without a cgroup v2 hierarchy ``available`` is
+    False and ``update`` returns [].
+    """
+
+    def __init__(self, roots=CGROUP_ROOTS):
+        self.root = next((root for root in roots
+                          if os.path.exists(os.path.join(root, 'cgroup.controllers'))), None)
+        self.available = self.root is not None
+        self.paths = {}  # (pid, create_time) -> cgroup path
+        self.by_pid = {}
+        self.usage = {}  # cgroup path -> (timestamp, usage_usec, nr_throttled)
+        self.groups = []
+
+    def cgroup_of(self, pid, create_time=None):
+        """cgroup v2 path of a process ('/' is the root), cached per process"""
+        key = (pid, create_time)
+        if key in self.paths:
+            return self.paths[key]
+        try:
+            with open(f'/proc/{pid}/cgroup') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return None  # Gone or not readable; try again next time
+        path = next((line[3:] for line in lines if line.startswith('0::')), None)
+        self.paths[key] = path
+        return path
+
+    def lookup(self, pid):
+        """cgroup path of a pid seen by the last update"""
+        return self.by_pid.get(pid)
+
+    def read(self, path):
+        """memory.current, memory.stat and cpu.stat of one cgroup (None/{} if missing)"""
+        directory = os.path.join(self.root, path.lstrip('/'))
+        stats = {'memory_current': None, 'memory_stat': {}, 'cpu_stat': {}}
+        try:
+            with open(os.path.join(directory, 'memory.current')) as f:
+                stats['memory_current'] = int(f.read())
+        except (OSError, ValueError):
+            pass  # The root cgroup and groups without the memory controller
+        for name, key in (('memory.stat', 'memory_stat'), ('cpu.stat', 'cpu_stat')):
+            try:
+                with open(os.path.join(directory, name)) as f:
+                    stats[key] = parse_keyed(f.read())
+            except OSError:
+                pass
+        return stats
+
+    def update(self, snapshot):
+        """Group a ProcessSnapshot by cgroup; return the groups, largest first"""
+        if not self.available or snapshot is None:
+            return []
+        keys = snapshot.keys()
+        alive = set(keys)
+        for key in [k for k in self.paths if k not in alive]:
+            del self.paths[key]
+
+        members = collections.defaultdict(list)
+        by_pid = {}
+        for row, (pid, create_time) in enumerate(keys):
+            path = self.cgroup_of(pid, create_time)
+            if path is not None:
+                members[path].append(row)
+                by_pid[pid] = path
+
+        now = time.monotonic()
+        groups = []
+        for path, rows in members.items():
+            stats = self.read(path)
+            memory_stat, cpu_stat = stats['memory_stat'], stats['cpu_stat']
+            cpu_percent = None
+            throttled = 0
+            usage = cpu_stat.get('usage_usec')
+            if usage is not None:
+                nr_throttled = cpu_stat.get('nr_throttled', 0)
+                before = self.usage.get(path)
+                if before is not None:
+                    throttled = max(nr_throttled - before[2], 0)
+                    if now > before[0] and path != '/':
+                        cpu_percent = max(usage - before[1], 0) / ((now - before[0]) * 1e4)
+                self.usage[path] = (now, usage, nr_throttled)
+
+            current = stats['memory_current']
+            groups.append({
+                'path': path,
+                'name': os.path.basename(path) or '/',
+                'pids': [int(snapshot.pids[i]) for i in rows],
+                'rss_mb': float(np.nansum(snapshot['rss_mb'][rows])),
+                'threads': int(np.nansum(snapshot['num_threads'][rows])),
+                'memory_mb': current / (1024 * 1024) if current is not None else None,
+                'anon_mb': memory_stat['anon'] / (1024 * 1024) if 'anon' in memory_stat else None,
+                'file_mb': memory_stat['file'] / (1024 * 1024) if 'file' in memory_stat else None,
+                'cpu_percent': (cpu_percent if cpu_percent is not None
+                                else float(np.nansum(snapshot['cpu_percent'][rows]))),
+                'throttled': throttled
+            })
+        for path in [p for p in self.usage if p not in members]:
+            del self.usage[path]
+
+        groups.sort(key=lambda g: -(g['memory_mb'] if g['memory_mb'] is not None else g['rss_mb']))
+        self.by_pid = by_pid
+        self.groups = groups
+        return groups
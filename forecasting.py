@@ -0,0 +1,364 @@
+import math
+
+import numpy as np
+
+from trends import SlidingRegression
+
+
+class MarkovPredictor:
+    """Discrete-state Markov chain over binned memory usage.
+
+    Usage percentages are binned into ``states`` buckets of ``width``
+    points. Every observed transition is counted exactly once into a dense
+    count matrix; forecasts propagate the full state distribution with
+    vector-matrix products instead of following the most likely path, so
+    expected values and quantiles come out of the same N-step distributions.
+    Rows never left from are treated as staying put.
+    """
+
+    def __init__(self, states=11, width=10.0, upper=100.0):
+        self.states = states
+        self.width = width
+        self.upper = upper
+        self.counts = np.zeros((states, states))
+        self.current = None
+        self.centers = np.minimum((np.arange(states) + 0.5) * width, upper)
+
+    def state(self, value):
+        """Bucket index of a usage value"""
+        return int(min(max(value // self.width, 0), self.states - 1))
+
+    def add(self, value):
+        """Observe the next value, counting the transition from the previous one"""
+        state = self.state(value)
+        if self.current is not None:
+            self.counts[self.current, state] += 1
+        self.current = state
+
+    def transition_matrix(self):
+        """Row-stochastic transition probabilities"""
+        totals = self.counts.sum(axis=1, keepdims=True)
+        matrix = np.divide(self.counts, totals, out=np.zeros_like(self.counts), where=totals > 0)
+        unseen = totals[:, 0] == 0
+        matrix[unseen, unseen] = 1.0
+        return matrix
+
+    def forecast(self, steps):
+        """Return a steps x states array of state distributions, one per step ahead"""
+        if self.current is None:
+            return np.zeros((0, self.states))
+        matrix = self.transition_matrix()
+        distribution = np.zeros(self.states)
+        distribution[self.current] = 1.0
+        result = np.empty((steps, self.states))
+        for step in range(steps):
+            distribution = distribution @ matrix
+            result[step] = distribution
+        return result
+
+    def expected(self, distributions):
+        """Expected usage of each distribution"""
+        return distributions @ self.centers
+
+    def quantile(self, distributions, q):
+        """Usage at quantile q of each distribution, interpolated within buckets"""
+        cumulative = np.cumsum(distributions, axis=-1)
+        index = np.minimum((cumulative < q).sum(axis=-1), self.states - 1)
+        previous = np.take_along_axis(cumulative, np.maximum(index - 1, 0)[..., None], -1)[..., 0]
+        below = np.where(index > 0, previous, 0.0)
+        mass = np.take_along_axis(distributions, index[..., None], -1)[..., 0]
+        fraction = np.clip(np.divide(q - below, mass, out=np.full_like(mass, 0.5), where=mass > 0), 0.0, 1.0)
+        return np.minimum((index + fraction) * self.width, self.upper)
+
+
+class Forecaster:
+    """Base class for incremental one-series forecasters.
+
+    Subclasses implement ``update`` (O(1) per sample) and ``forecast``, and
+    call ``_track`` with every one-step-ahead error. The error variance is a
+    running mean that turns into an EWMA after ``1 / error_alpha`` samples.
+    """
+
+    name = "forecaster"
+
+    def __init__(self, error_alpha=0.1):
+        self.error_alpha = error_alpha
+        self.errors = 0
+        self.sigma2 = 0.0
+        self.last = None
+
+    def _track(self, error):
+        self.errors += 1
+        weight = max(1.0 / self.errors, self.error_alpha)
+        self.sigma2 += weight * (error * error - self.sigma2)
+
+    def _interval(self, mean, variance, z):
+        spread = z * np.sqrt(variance)
+        return mean, mean - spread, mean + spread
+
+    def _naive(self, steps, z):
+        """Flat forecast from the last value while the model warms up"""
+        h = np.arange(1, steps + 1)
+        mean = np.full(steps, self.last if self.last is not None else np.nan)
+        return self._interval(mean, self.sigma2 * h, z)
+
+
+class HoltWinters(Forecaster):
+    """Additive Holt-Winters exponential smoothing, updated per sample.
+
+    Without ``period`` this is Holt's linear trend method. ``beta`` is the
+    smoothing-form trend weight beta*; prediction intervals use the
+    ETS(A,A,N) variance
+    sigma^2 * (1 + (h-1) * (alpha^2 + alpha*b*h + b^2*h*(2h-1)/6))
+    with the error-correction weight b = alpha * beta*, and ignore the
+    (small) seasonal contribution.
+    """
+
+    name = "holt"
+
+    def __init__(self, alpha=0.5, beta=0.1, gamma=0.1, period=None, **kwargs):
+        super().__init__(**kwargs)
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+        self.period = period
+        self.level = None
+        self.trend = 0.0
+        self.season = np.zeros(period) if period else None
+        self.count = 0
+
+    def update(self, y):
+        """Add one sample"""
+        seasonal = self.season[self.count % self.period] if self.period else 0.0
+        if self.level is None:
+            self.level = y - seasonal
+        else:
+            self._track(y - (self.level + self.trend + seasonal))
+            previous = self.level
+            self.level = self.alpha * (y - seasonal) + (1 - self.alpha) * (self.level + self.trend)
+            self.trend = self.beta * (self.level - previous) + (1 - self.beta) * self.trend
+            if self.period:
+                self.season[self.count % self.period] = (
+                    self.gamma * (y - self.level) + (1 - self.gamma) * seasonal)
+        self.last = y
+        self.count += 1
+
+    def forecast(self, steps, z=1.96):
+        """Return (mean, lower, upper) arrays for the next steps samples"""
+        if self.count < 2:
+            return self._naive(steps, z)
+        h = np.arange(1, steps + 1)
+        mean = self.level + h * self.trend
+        if self.period:
+            mean = mean + self.season[(self.count + h - 1) % self.period]
+        a, b = self.alpha, self.alpha * self.beta
+        variance = self.sigma2 * (1 + (h - 1) * (a * a + a * b * h + b * b * h * (2 * h - 1) / 6))
+        return self._interval(mean, variance, z)
+
+
+class AutoRegressive(Forecaster):
+    """AR(p) model with intercept fitted by recursive least squares.
+
+    Each sample costs O(p^2) for the RLS update, with ``forgetting`` < 1 so
+    the coefficients follow changing behaviour. Prediction intervals come
+    from the psi-weights of the fitted recursion.
+    """
+
+    name = "ar"
+
+    def __init__(self, order=3, forgetting=0.98, **kwargs):
+        super().__init__(**kwargs)
+        self.order = order
+        self.forgetting = forgetting
+        self.weights = np.zeros(order + 1)
+        self.covariance = np.eye(order + 1) * 1e3
+        self.lags = []
+
+    def _features(self, lags):
+        return np.concatenate(([1.0], lags[::-1]))
+
+    def update(self, y):
+        """Add one sample"""
+        if len(self.lags) == self.order:
+            x = self._features(np.array(self.lags))
+            error = y - self.weights @ x
+            self._track(error)
+            px = self.covariance @ x
+            gain = px / (self.forgetting + x @ px)
+            self.weights = self.weights + gain * error
+            self.covariance = (self.covariance - np.outer(gain, px)) / self.forgetting
+            self.lags.pop(0)
+        self.lags.append(y)
+        self.last = y
+
+    def forecast(self, steps, z=1.96):
+        """Return (mean, lower, upper) arrays for the next steps samples"""
+        if len(self.lags) < self.order or self.errors < self.order + 2:
+            return self._naive(steps, z)
+        lags = list(self.lags)
+        mean = np.empty(steps)
+        for step in range(steps):
+            mean[step] = self.weights @ self._features(np.array(lags[-self.order:]))
+            lags.append(mean[step])
+
+        # psi_j = sum_i phi_i * psi_(j-i), psi_0 = 1
+        phi = self.weights[1:]
+        psi = np.zeros(steps)
+        psi[0] = 1.0
+        for j in range(1, steps):
+            k = min(j, self.order)
+            psi[j] = phi[:k] @ psi[j - 1::-1][:k]
+        variance = self.sigma2 * np.cumsum(psi ** 2)
+        return self._interval(mean, variance, z)
+
+
+FORECASTERS = {
+    'holt': HoltWinters,
+    'ar': AutoRegressive
+}
+
+
+def backtest(history, factories=None, horizon=10, warmup=10, z=1.96):
+    """Replay a recorded history through fresh models and score their forecasts.
+
+    At every point after warmup each model forecasts horizon steps, which are
+    compared with the samples that actually followed. Returns
+    {name: {'mae', 'rmse', 'coverage', 'nominal', 'count'}}, where coverage is
+    the share of actual values inside the prediction interval and nominal the
+    share the interval claims for this z (0.95 for 1.96).
+    """
+    nominal = math.erf(z / math.sqrt(2))
+    history = np.asarray(history, dtype=float)
+    factories = factories or FORECASTERS
+    results = {}
+    for name, factory in factories.items():
+        model = factory()
+        errors = []
+        covered = 0
+        for t, value in enumerate(history):
+            model.update(value)
+            ahead = history[t + 1:t + 1 + horizon]
+            if t + 1 < warmup or not len(ahead):
+                continue
+            mean, lower, upper = (part[:len(ahead)] for part in model.forecast(horizon, z))
+            errors.append(ahead - mean)
+            covered += int(((ahead >= lower) & (ahead <= upper)).sum())
+        errors = np.concatenate(errors) if errors else np.zeros(0)
+        results[name] = {
+            'mae': float(np.abs(errors).mean()) if len(errors) else float('nan'),
+            'rmse': float(np.sqrt((errors ** 2).mean())) if len(errors) else float('nan'),
+            'coverage': covered / len(errors) if len(errors) else float('nan'),
+            'nominal': nominal,
+            'count': int(len(errors))
+        }
+    return results
+
+
+def choose_model(history, factories=None, **kwargs):
+    """Return (name of the model with the lowest backtest MAE, backtest results)"""
+    results = backtest(history, factories, **kwargs)
+    scored = {name: r['mae'] for name, r in results.items() if r['count']}
+    return min(scored, key=scored.get) if scored else next(iter(factories or FORECASTERS)), results
+
+
+class OOMEstimator:
+    """Time until memory plus swap headroom runs out at the current growth rate.
+
+    Used memory (total - available) is regressed on wall-clock time over a
+    sliding window. The headroom is available memory plus free swap, and the
+    ETA is headroom / slope; the bounds use slope +/- z standard errors, so
+    a noisy or flat trend widens the late bound to infinity instead of
+    producing a confident number.
+    """
+
+    def __init__(self, window=30, z=1.96):
+        self.trend = SlidingRegression(window)
+        self.z = z
+        self.headroom = None
+        self.timestamp = None
+
+    def update(self, timestamp, used, available, swap_free=0):
+        """Add one sample (bytes)"""
+        self.trend.add(used, x=timestamp)
+        self.headroom = available + swap_free
+        self.timestamp = timestamp
+
+    def estimate(self):
+        """Return {'eta', 'early', 'late', 'rate', 'headroom'} in seconds/bytes, or None.
+
+        eta and late are inf when memory is not growing significantly.
+        """
+        if len(self.trend) < 3 or self.headroom is None:
+            return None
+        rate = self.trend.slope
+        spread = self.z * self.trend.slope_stderr()
+        fastest = rate + spread
+        slowest = rate - spread
+        inf = float('inf')
+        return {
+            'eta': self.headroom / rate if rate > 0 else inf,
+            'early': self.headroom / fastest if fastest > 0 else inf,
+            'late': self.headroom / slowest if slowest > 0 else inf,
+            'rate': rate,
+            'headroom': self.headroom
+        }
+
+    def describe(self):
+        """One-line human readable summary"""
+        estimate = self.estimate()
+        if estimate is None:
+            return "OOM ETA: collecting samples..."
+        if estimate['eta'] == float('inf'):
+            return f"OOM ETA: not growing ({format_bytes(estimate['headroom'])} headroom)"
+        return (f"OOM ETA: {format_duration(estimate['eta'])} "
+                f"(range {format_duration(estimate['early'])} - {format_duration(estimate['late'])}, "
+                f"+{format_bytes(estimate['rate'] * 60)}/min, {format_bytes(estimate['headroom'])} headroom)")
+
+
+def format_duration(seconds):
+    """Compact duration such as '3h 12m'"""
+    if seconds == float('inf'):
+        return "never"
+    seconds = int(seconds)
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    if days:
+        return f"{days}d {hours}h"
+    if hours:
+        return f"{hours}h {minutes}m"
+    if minutes:
+        return f"{minutes}m {seconds}s"
+    return f"{seconds}s"
+
+
+def format_bytes(value):
+    """Compact byte count such as '1.5 GB'"""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(value) < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TB"
+
+
+def main():
+    """Backtest the forecasters on a recorded history (one value per line or a JSON list)"""
+    import json
+    import sys
+    if len(sys.argv) < 2:
+        print("Usage: python forecasting.py HISTORY_FILE [HORIZON]")
+        return
+    with open(sys.argv[1]) as f:
+        text = f.read().strip()
+    history = json.loads(text) if text.startswith('[') else [float(line) for line in text.split()]
+    horizon = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    best, results = choose_model(history, horizon=horizon)
+    print(f"{'model':<8}{'MAE':>10}{'RMSE':>10}{'coverage':>10}{'nominal':>10}{'n':>8}")
+    for name, r in results.items():
+        print(f"{name:<8}{r['mae']:>10.3f}{r['rmse']:>10.3f}{r['coverage']:>10.1%}"
+              f"{r['nominal']:>10.1%}{r['count']:>8}")
+    print(f"Best: {best}")
+
+
+if __name__ == "__main__":
+    main()
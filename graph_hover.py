@@ -0,0 +1,132 @@
+import numpy as np
+
+
+class GraphHover:
+    """Hover tooltips for nodes drawn on a matplotlib axes.
+
+    Node positions are kept in a KD-tree that is only rebuilt when the
+    layout actually changes. A mouse move queries the few nearest nodes in
+    data space and keeps the closest one within ``radius`` pixels, so
+    hit-testing stays constant-time-ish with thousands of nodes.
+    ``describe(node)`` returns the tooltip text.
+
+    The tooltip is an animated artist: the canvas is copied after every
+    full draw (and whenever ``refresh_background`` is called), and showing
+    or hiding the tooltip restores that copy and blits just the tooltip on
+    top instead of re-rendering the figure.
+    """
+
+    def __init__(self, canvas, ax, describe, radius=15, candidates=8):
+        self.canvas = canvas
+        self.ax = ax
+        self.describe = describe
+        self.radius = radius
+        self.candidates = candidates
+
+        self.nodes = []
+        self.position = {}
+        self.points = np.empty((0, 2))
+        self.tree = None
+        self.active = None
+        self.annotation = None
+        self.background = None
+        self.rebuilds = 0
+
+        self.connections = [canvas.mpl_connect('motion_notify_event', self.on_motion),
+                            canvas.mpl_connect('draw_event', self.on_draw)]
+
+    def update(self, pos):
+        """Set node positions; the KD-tree is rebuilt only if they moved"""
+        nodes = list(pos)
+        points = np.array([pos[n] for n in nodes], dtype=float).reshape(-1, 2)
+        if nodes != self.nodes or points.shape != self.points.shape or not np.array_equal(points, self.points):
+            self.nodes = nodes
+            self.position = {node: i for i, node in enumerate(nodes)}
+            self.points = points
+            self.tree = None
+            if len(nodes):
+                from scipy.spatial import cKDTree
+                self.tree = cKDTree(points)
+                self.rebuilds += 1
+        self.active = None
+        if self.annotation is not None:
+            self.annotation.set_visible(False)  # Positions are stale
+
+    def disconnect(self):
+        """Stop reacting to mouse moves"""
+        for connection in self.connections:
+            self.canvas.mpl_disconnect(connection)
+        self.hide()
+
+    def hit(self, x, y):
+        """Return the node under display coordinates (x, y), or None"""
+        if self.tree is None:
+            return None
+        data_x, data_y = self.ax.transData.inverted().transform((x, y))
+        k = min(self.candidates, len(self.nodes))
+        _, index = self.tree.query((data_x, data_y), k=k)
+        index = np.atleast_1d(index)
+
+        # Nearest in data space is not always nearest on screen, so rank the
+        # few candidates by pixel distance
+        screen = self.ax.transData.transform(self.points[index])
+        distance = np.hypot(screen[:, 0] - x, screen[:, 1] - y)
+        best = int(np.argmin(distance))
+        if distance[best] > self.radius:
+            return None
+        return self.nodes[index[best]]
+
+    def on_motion(self, event):
+        """Show or hide the tooltip for the node under the cursor"""
+        node = self.hit(event.x, event.y) if event.inaxes is self.ax else None
+        if node == self.active:
+            return
+        self.active = node
+        if node is None:
+            self.hide()
+        else:
+            self.show(node)
+
+    def on_draw(self, event):
+        """Keep a copy of the freshly drawn canvas and put the tooltip back"""
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        if self.annotation is not None and self.annotation.get_visible():
+            self.ax.draw_artist(self.annotation)
+
+    def refresh_background(self):
+        """Re-copy the canvas after it was changed by a blit, then redraw the tooltip"""
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        if self.annotation is not None and self.annotation.get_visible():
+            self.blit()
+
+    def blit(self):
+        """Restore the cached background and draw only the tooltip over it"""
+        if self.background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        if self.annotation.get_visible():
+            self.ax.draw_artist(self.annotation)
+        self.canvas.blit(self.canvas.figure.bbox)
+
+    def show(self, node):
+        """Place the tooltip on node"""
+        # Clearing the axes removes the tooltip along with everything else
+        if self.annotation is None or self.annotation not in self.ax.texts:
+            self.annotation = self.ax.annotate(
+                "", xy=(0, 0), xytext=(15, 15), textcoords='offset points',
+                color='#cdd6f4', fontsize=9, zorder=10, animated=True,
+                bbox=dict(boxstyle='round', facecolor='#313244', edgecolor='#89b4fa', alpha=0.95),
+                arrowprops=dict(arrowstyle='->', color='#89b4fa')
+            )
+        self.annotation.xy = self.points[self.position[node]]
+        self.annotation.set_text(self.describe(node))
+        self.annotation.set_visible(True)
+        self.blit()
+
+    def hide(self):
+        """Hide the tooltip"""
+        if self.annotation is None or not self.annotation.get_visible():
+            return
+        self.annotation.set_visible(False)
+        self.blit()
@@ -0,0 +1,237 @@
+import numpy as np
+
+
+class IncrementalLayout:
+    """Force-directed layout that keeps node positions between refreshes.
+
+    Positions from the previous frame are reused as the starting point, new
+    nodes are dropped next to their parent, and only a few vectorized
+    Fruchterman-Reingold steps are run per update so the picture stays stable.
+    """
+
+    def __init__(self, k=None, iterations=5, seed=None, chunk_size=1024):
+        self.k = k
+        self.iterations = iterations
+        self.chunk_size = chunk_size
+        self.rng = np.random.default_rng(seed)
+        self.positions = {}
+        self.heat = {}
+
+        # Step size limits for fresh and settled nodes
+        self.hot = 0.1
+        self.cold = 0.01
+        self.cooling = 0.8
+
+    def reset(self):
+        """Forget all cached positions"""
+        self.positions.clear()
+        self.heat.clear()
+
+    def update(self, nodes, edges):
+        """Return positions for the given graph scaled to [-1, 1]"""
+        nodes = list(nodes)
+        edges = list(edges)
+        if not nodes:
+            self.reset()
+            return {}
+
+        # Drop nodes that disappeared since the last frame
+        alive = set(nodes)
+        for node in [n for n in self.positions if n not in alive]:
+            del self.positions[node]
+            self.heat.pop(node, None)
+
+        # Place new nodes next to their parent (or randomly if it has none)
+        parents = {v: u for u, v in edges}
+        spread = self._spread()
+        pending = [n for n in nodes if n not in self.positions]
+        while pending:
+            waiting = set(pending)
+            deferred = []
+            for node in pending:
+                parent = parents.get(node)
+                if parent in self.positions:
+                    origin = self.positions[parent]
+                elif parent in waiting and parent != node:
+                    deferred.append(node)
+                    continue
+                else:
+                    origin = self.rng.uniform(-1.0, 1.0, 2) * spread
+                self.positions[node] = origin + self.rng.normal(0.0, 0.05 * spread, 2)
+                self.heat[node] = self.hot
+            if len(deferred) == len(pending):
+                # Parent chain never got a position (cycle); seed it randomly
+                node = deferred.pop(0)
+                self.positions[node] = self.rng.uniform(-1.0, 1.0, 2) * spread
+                self.heat[node] = self.hot
+            pending = deferred
+
+        index = {node: i for i, node in enumerate(nodes)}
+        pos = np.array([self.positions[n] for n in nodes], dtype=float)
+        step = np.array([self.heat[n] for n in nodes], dtype=float)
+        edge_index = np.array(
+            [(index[u], index[v]) for u, v in edges if u in index and v in index and u != v],
+            dtype=int
+        ).reshape(-1, 2)
+
+        k = self.k if self.k is not None else 1.0 / np.sqrt(len(nodes))
+        for _ in range(self.iterations):
+            pos = self._relax(pos, edge_index, step * spread, k)
+            step = np.maximum(step * self.cooling, self.cold)
+
+        for i, node in enumerate(nodes):
+            self.positions[node] = pos[i]
+            self.heat[node] = step[i]
+
+        return self._normalize(nodes, pos)
+
+    def _spread(self):
+        """Current radius of the cached layout, used to place new nodes"""
+        if not self.positions:
+            return 1.0
+        pos = np.array(list(self.positions.values()))
+        return max(float(np.abs(pos - pos.mean(axis=0)).max()), 1e-3)
+
+    def _relax(self, pos, edge_index, max_step, k):
+        """Run one Fruchterman-Reingold step over all nodes"""
+        n = len(pos)
+        displacement = np.zeros_like(pos)
+
+        # Repulsion between every pair, computed in row chunks to bound memory.
+        # sum_j f_ij * (p_i - p_j) == p_i * sum_j f_ij - f @ p, so each chunk
+        # is a single matrix product instead of an n x n x 2 tensor.
+        sq_norm = (pos ** 2).sum(axis=1)
+        for start in range(0, n, self.chunk_size):
+            stop = start + self.chunk_size
+            block = pos[start:stop]
+            sq_distance = sq_norm[start:stop, np.newaxis] + sq_norm[np.newaxis, :] - 2.0 * block @ pos.T
+            force = k * k / np.maximum(sq_distance, 1e-4)
+            force[np.arange(len(block)), np.arange(start, start + len(block))] = 0.0
+            displacement[start:stop] = block * force.sum(axis=1)[:, np.newaxis] - force @ pos
+
+        # Attraction along edges
+        if len(edge_index):
+            u, v = edge_index[:, 0], edge_index[:, 1]
+            delta = pos[u] - pos[v]
+            distance = np.maximum(np.linalg.norm(delta, axis=-1), 0.01)
+            pull = delta * (distance / k)[:, np.newaxis]
+            np.add.at(displacement, u, -pull)
+            np.add.at(displacement, v, pull)
+
+        # Limit movement by per-node temperature
+        length = np.maximum(np.linalg.norm(displacement, axis=-1), 1e-9)
+        scale = np.minimum(length, max_step) / length
+        return pos + displacement * scale[:, np.newaxis]
+
+    def _normalize(self, nodes, pos):
+        """Center positions and scale them into [-1, 1]"""
+        centered = pos - pos.mean(axis=0)
+        extent = np.abs(centered).max()
+        if extent > 0:
+            centered = centered / extent
+        return {node: centered[i] for i, node in enumerate(nodes)}
+
+
+class TreeLayout:
+    """Linear-time tidy layout for the ppid forest.
+
+    Every leaf gets its own column and parents are centered over their
+    children. Subtree widths are cached and only recomputed for subtrees whose
+    child lists changed, so steady-state refreshes are cheap.
+    """
+
+    def __init__(self, y_down=False):
+        self.y_down = y_down
+        self.children = {}
+        self.width = {}
+        self.positions = {}
+
+    def reset(self):
+        """Forget all cached subtree widths"""
+        self.children.clear()
+        self.width.clear()
+        self.positions.clear()
+
+    def update(self, nodes, edges):
+        """Return positions for the given forest scaled to [-1, 1]"""
+        nodes = list(nodes)
+        if not nodes:
+            self.reset()
+            return {}
+
+        alive = set(nodes)
+        parent = {}
+        children = {node: [] for node in nodes}
+        for u, v in edges:
+            if u in alive and v in alive and u != v and v not in parent:
+                parent[v] = u
+                children[u].append(v)
+        children = {node: tuple(sorted(kids)) for node, kids in children.items()}
+
+        # Mark nodes whose child list changed, plus all of their ancestors
+        dirty = set()
+        for node in nodes:
+            if self.children.get(node) != children[node] or node not in self.width:
+                current = node
+                while current is not None and current not in dirty:
+                    dirty.add(current)
+                    current = parent.get(current)
+        self.children = children
+        for node in [n for n in self.width if n not in alive]:
+            del self.width[node]
+
+        # Roots first, then anything left unreached (broken ppid cycles)
+        roots = sorted(n for n in nodes if n not in parent)
+        order = []
+        owner = {}
+        for root in roots + nodes:
+            if root in owner:
+                continue
+            owner[root] = None
+            self._collect(root, owner, order)
+
+        # Recompute widths bottom-up, skipping clean subtrees
+        for node in reversed(order):
+            if node in dirty:
+                kids = [c for c in children[node] if owner[c] == node]
+                self.width[node] = sum(self.width[c] for c in kids) or 1
+
+        # Assign columns top-down
+        left = {}
+        depth = {}
+        offset = 0
+        for node in order:
+            if node not in left:
+                left[node] = offset
+                depth[node] = 0
+                offset += self.width[node]
+            cursor = left[node]
+            for child in children[node]:
+                if owner[child] != node:
+                    continue
+                left[child] = cursor
+                depth[child] = depth[node] + 1
+                cursor += self.width[child]
+
+        total = max(offset, 1)
+        max_depth = max(max(depth.values()), 1)
+        sign = -1.0 if self.y_down else 1.0
+        self.positions = {
+            node: np.array([
+                2.0 * (left[node] + self.width[node] / 2.0) / total - 1.0,
+                sign * (1.0 - 2.0 * depth[node] / max_depth)
+            ])
+            for node in nodes
+        }
+        return self.positions
+
+    def _collect(self, root, owner, order):
+        """Append the subtree below root to order in preorder"""
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            for child in reversed(self.children[node]):
+                if child not in owner:
+                    owner[child] = node
+                    stack.append(child)
@@ -0,0 +1,121 @@
+import threading
+import time
+
+import psutil
+
+
+class MemoryAccounting:
+    """USS/PSS accounting for the largest processes within a time budget.
+
+    RSS counts shared pages once per process, so forked worker pools look
+    several times bigger than they are. ``memory_full_info`` gives USS (pages
+    only this process holds) and, on Linux, PSS (shared pages split between
+    their users), but it walks the process' page maps and is expensive. Each
+    tick only the top ``top_n`` processes by RSS are considered, missing and
+    oldest samples are refreshed first, and sampling stops once ``budget``
+    seconds have been spent. Samples older than ``max_age`` fall back to RSS.
+    """
+
+    MODES = ('rss', 'pss', 'uss')
+
+    def __init__(self, mode='uss', top_n=25, budget=0.05, max_age=30.0):
+        self.mode = mode
+        self.top_n = top_n
+        self.budget = budget
+        self.max_age = max_age
+        self.samples = {}
+        self.lock = threading.Lock()
+
+    def set_mode(self, mode):
+        """Switch between 'rss', 'pss' and 'uss' accounting"""
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown accounting mode: {mode}")
+        self.mode = mode
+
+    def sample(self, rows):
+        """Refresh cached samples for the top candidates of (pid, rss) rows.
+
+        Returns the number of processes sampled this call.
+        """
+        rows = list(rows)
+        alive = {pid for pid, _ in rows}
+        with self.lock:
+            for pid in [p for p in self.samples if p not in alive]:
+                del self.samples[pid]
+        if self.mode == 'rss':
+            return 0
+
+        candidates = sorted(rows, key=lambda row: row[1] or 0, reverse=True)[:self.top_n]
+        candidates.sort(key=lambda row: self.samples.get(row[0], {}).get('time', 0.0))
+
+        sampled = 0
+        deadline = time.perf_counter() + self.budget
+        for pid, rss in candidates:
+            if time.perf_counter() >= deadline:
+                break
+            try:
+                info = psutil.Process(pid).memory_full_info()
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+            with self.lock:
+                self.samples[pid] = {
+                    'rss': info.rss,
+                    'uss': getattr(info, 'uss', None),
+                    'pss': getattr(info, 'pss', None),
+                    'time': time.monotonic()
+                }
+            sampled += 1
+        return sampled
+
+    def age(self, pid):
+        """Seconds since pid was last sampled, or None if never"""
+        entry = self.samples.get(pid)
+        return None if entry is None else time.monotonic() - entry['time']
+
+    def lookup(self, pid, rss):
+        """Return (bytes, source) for pid under the current mode.
+
+        Falls back to the given RSS when there is no fresh sample or the
+        platform does not report the requested figure.
+        """
+        if self.mode != 'rss':
+            with self.lock:
+                entry = self.samples.get(pid)
+            if entry and time.monotonic() - entry['time'] <= self.max_age:
+                value = entry.get(self.mode)
+                if value is None and self.mode == 'pss':
+                    return self._fallback(entry, rss)
+                if value is not None:
+                    return value, self.mode
+        return rss or 0, 'rss'
+
+    def apply(self, processes, total=None):
+        """Sample and rewrite 'memory' of process dicts as accounted percent.
+
+        Every dict needs 'pid' and 'rss' (bytes); 'memory_source' records
+        whether the value came from USS, PSS or plain RSS, and 'measured' is
+        False for RSS fallbacks under USS/PSS (not sampled or sample too old).
+        """
+        total = total or psutil.virtual_memory().total
+        self.sample((proc['pid'], proc['rss']) for proc in processes)
+        for proc in processes:
+            value, source = self.lookup(proc['pid'], proc['rss'])
+            proc['memory'] = value / total * 100
+            proc['memory_source'] = source
+            proc['measured'] = self.mode == 'rss' or source != 'rss'
+        return processes
+
+    def rank(self, processes):
+        """Sort applied process dicts by 'memory', measured rows first.
+
+        An RSS fallback includes shared pages, so under USS/PSS it is not
+        comparable with measured rows and could outrank a bigger process;
+        those rows follow the measured ones, ordered by RSS among themselves.
+        """
+        return sorted(processes, key=lambda proc: (not proc['measured'], -proc['memory']))
+
+    def _fallback(self, entry, rss):
+        """PSS is Linux-only; use USS where it is missing"""
+        if entry.get('uss') is not None:
+            return entry['uss'], 'uss'
+        return rss or 0, 'rss'
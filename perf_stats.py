@@ -0,0 +1,112 @@
+import collections
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+
+class PerfRecorder:
+    """Rolling latency statistics for UI updates and collectors.
+
+    Every timed name keeps its most recent ``window`` durations, from which
+    p50/p95/p99 are computed on demand. Tk event-loop lag is sampled by
+    scheduling a repeating ``after`` callback and measuring how late it fires.
+    """
+
+    LOOP_LAG = "event_loop_lag"
+
+    def __init__(self, window=500):
+        self.window = window
+        self.samples = collections.defaultdict(lambda: collections.deque(maxlen=self.window))
+        self.lock = threading.Lock()
+
+    def record(self, name, seconds):
+        """Add one duration sample for name"""
+        with self.lock:
+            self.samples[name].append(seconds)
+
+    @contextmanager
+    def timed(self, name):
+        """Context manager timing the enclosed block under name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def wrap(self, name, func):
+        """Return func wrapped so every call is timed under name"""
+        @functools.wraps(func)
+        def timed_call(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - start)
+        return timed_call
+
+    def instrument(self, obj, prefix="update_", label=None):
+        """Time every method defined on obj's class whose name starts with prefix"""
+        label = label or type(obj).__name__
+        for name in vars(type(obj)):
+            if not name.startswith(prefix):
+                continue
+            method = getattr(obj, name, None)
+            if callable(method):
+                setattr(obj, name, self.wrap(f"{label}.{name}", method))
+
+    def watch_event_loop(self, widget, interval_ms=100):
+        """Sample Tk event-loop lag every interval_ms"""
+        expected = [time.perf_counter() + interval_ms / 1000]
+
+        def tick():
+            now = time.perf_counter()
+            self.record(self.LOOP_LAG, max(0.0, now - expected[0]))
+            expected[0] = now + interval_ms / 1000
+            widget.after(interval_ms, tick)
+
+        widget.after(interval_ms, tick)
+
+    def summary(self):
+        """Return {name: {count, p50, p95, p99, max}} in milliseconds"""
+        with self.lock:
+            snapshot = {name: np.array(values) for name, values in self.samples.items() if values}
+        result = {}
+        for name, values in snapshot.items():
+            p50, p95, p99 = np.percentile(values, [50, 95, 99]) * 1000
+            result[name] = {
+                "count": int(len(values)),
+                "p50": float(p50),
+                "p95": float(p95),
+                "p99": float(p99),
+                "max": float(values.max() * 1000)
+            }
+        return result
+
+    def overlay_text(self):
+        """Short one-line summary: loop lag and the slowest update"""
+        stats = self.summary()
+        parts = []
+        lag = stats.pop(self.LOOP_LAG, None)
+        if lag:
+            parts.append(f"Loop lag p95 {lag['p95']:.0f} ms")
+        if stats:
+            name, slowest = max(stats.items(), key=lambda item: item[1]["p95"])
+            parts.append(
+                f"Slowest {name.split('.')[-1]} "
+                f"p50 {slowest['p50']:.0f} / p95 {slowest['p95']:.0f} / p99 {slowest['p99']:.0f} ms"
+            )
+        return " | ".join(parts) or "No timings yet"
+
+    def export(self, path):
+        """Write the current summary to path as JSON"""
+        with open(path, "w") as f:
+            json.dump({
+                "exported": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "window": self.window,
+                "timings_ms": self.summary()
+            }, f, indent=2)
+        return path
@@ -0,0 +1,94 @@
+import collections
+import json
+import os
+import re
+
+DEFAULT_CATEGORIES = {
+    'Browser': ['chrome', 'firefox', 'edge', 'opera', 'safari'],
+    'Development': ['python', 'node', 'npm', 'java', 'code', 'git'],
+    'System': ['system', 'svchost', 'service', 'registry', 'wininit'],
+    'Security': ['antivirus', 'defender', 'firewall'],
+    'Office': ['word', 'excel', 'powerpoint', 'outlook', 'teams'],
+    'Media': ['vlc', 'spotify', 'music', 'video', 'media'],
+    'Gaming': ['steam', 'game', 'unity', 'unreal'],
+    'Background': ['updater', 'scheduler', 'helper']
+}
+
+RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'process_categories.json')
+
+
+class ProcessClassifier:
+    """Keyword classifier compiled into one regex with an LRU result cache.
+
+    Categories are checked in order and the first one with a keyword
+    anywhere in the name or command line wins. All keywords are folded into a
+    single pattern of zero-width lookaheads, one named group per category, so
+    a process is classified in one scan instead of one substring search per
+    keyword. Results are memoized by (name, hash of the command line).
+
+    User rules are read from a JSON file mapping category names to keyword
+    lists; they are checked before the built-in categories and extend a
+    built-in category of the same name.
+    """
+
+    def __init__(self, categories=None, rules_file=RULES_FILE, cache_size=4096):
+        self.cache_size = cache_size
+        self.cache = collections.OrderedDict()
+        self.rules_file = rules_file
+        self.compile(self.load_rules(categories or DEFAULT_CATEGORIES, rules_file))
+
+    def load_rules(self, categories, rules_file):
+        """Return categories with the user rules from rules_file put first"""
+        merged = {}
+        if rules_file and os.path.exists(rules_file):
+            try:
+                with open(rules_file) as f:
+                    user_rules = json.load(f)
+                for category, keywords in user_rules.items():
+                    merged[category] = [str(k) for k in keywords]
+            except (OSError, ValueError, AttributeError, TypeError) as e:
+                print(f"Ignoring process category rules in {rules_file}: {e}")
+                merged = {}
+        for category, keywords in categories.items():
+            merged[category] = merged.get(category, []) + list(keywords)
+        return merged
+
+    def compile(self, categories):
+        """Build the combined pattern and clear the cache"""
+        self.categories = list(categories)
+        groups = []
+        for i, keywords in enumerate(categories.values()):
+            alternatives = '|'.join(re.escape(k.lower()) for k in sorted(keywords, key=len, reverse=True) if k)
+            if alternatives:
+                groups.append(f"(?P<c{i}>{alternatives})")
+        self.pattern = re.compile(f"(?={'|'.join(groups)})" if groups else r"(?!)")
+        self.cache.clear()
+
+    def reload(self):
+        """Re-read the user rules file"""
+        self.compile(self.load_rules(DEFAULT_CATEGORIES, self.rules_file))
+
+    def classify(self, name, cmdline=None):
+        """Return the category of a process, or 'Other'"""
+        key = (name, hash(tuple(cmdline)) if cmdline else 0)
+        category = self.cache.get(key)
+        if category is not None:
+            self.cache.move_to_end(key)
+            return category
+
+        text = (name or '').lower()
+        if cmdline:
+            text += '\0' + ' '.join(cmdline).lower()
+
+        # Lookaheads match at every position; keep the earliest category
+        best = len(self.categories)
+        for match in self.pattern.finditer(text):
+            best = min(best, int(match.lastgroup[1:]))
+            if best == 0:
+                break
+        category = self.categories[best] if best < len(self.categories) else 'Other'
+
+        self.cache[key] = category
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return category
@@ -0,0 +1,92 @@
+import time
+
+import numpy as np
+import psutil
+
+ATTRS = ['pid', 'ppid', 'name', 'create_time', 'memory_info', 'cpu_percent',
+         'num_threads', 'io_counters', 'cpu_times', 'num_ctx_switches', 'status']
+COLUMNS = ('ppid', 'rss_mb', 'cpu_percent', 'num_threads', 'io_bytes', 'cpu_time', 'ctx_switches')
+
+
+class ProcessSnapshot:
+    """Columnar per-process metrics taken at one instant.
+
+    Every process is one row and every metric one NumPy column, so detectors
+    can work on whole columns at once. Rows are identified by
+    (pid, create_time) so a reused pid is never mistaken for the old process.
+    Metrics psutil could not read are NaN.
+    """
+
+    def __init__(self, timestamp, pids, create_times, names, statuses, columns):
+        self.timestamp = timestamp
+        self.pids = pids
+        self.create_times = create_times
+        self.names = names
+        self.statuses = statuses
+        self.columns = columns
+        self.row = {key: i for i, key in enumerate(self.keys())}
+
+    def __len__(self):
+        return len(self.pids)
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def keys(self):
+        """(pid, create_time) identity of every row"""
+        return list(zip(self.pids.tolist(), self.create_times.tolist()))
+
+    def align(self, previous):
+        """Index of each row in previous, or -1 for processes new since then"""
+        if previous is None:
+            return np.full(len(self), -1, dtype=np.int64)
+        return np.fromiter((previous.row.get(key, -1) for key in self.keys()),
+                           dtype=np.int64, count=len(self))
+
+    def rate(self, previous, column):
+        """Per-second change of a cumulative column since previous (NaN if unknown)"""
+        result = np.full(len(self), np.nan)
+        if previous is None:
+            return result
+        elapsed = self.timestamp - previous.timestamp
+        if elapsed <= 0:
+            return result
+        index = self.align(previous)
+        known = index >= 0
+        result[known] = (self[column][known] - previous[column][index[known]]) / elapsed
+        return result
+
+
+def take_snapshot():
+    """Read every process once and return a ProcessSnapshot"""
+    rows = []
+    for proc in psutil.process_iter(ATTRS):
+        info = proc.info
+        if info.get('create_time') is None:
+            continue
+        memory_info = info.get('memory_info')
+        io = info.get('io_counters')
+        cpu_times = info.get('cpu_times')
+        switches = info.get('num_ctx_switches')
+        rows.append((
+            info['pid'], info['create_time'], info.get('name') or '', info.get('status') or '',
+            info.get('ppid') if info.get('ppid') is not None else -1,
+            memory_info.rss / (1024 * 1024) if memory_info else np.nan,
+            info['cpu_percent'] if info.get('cpu_percent') is not None else np.nan,
+            info['num_threads'] if info.get('num_threads') is not None else np.nan,
+            (io.read_bytes + io.write_bytes) if io else np.nan,
+            (cpu_times.user + cpu_times.system) if cpu_times else np.nan,
+            (switches.voluntary + switches.involuntary) if switches else np.nan
+        ))
+
+    timestamp = time.time()
+    if not rows:
+        empty = np.empty(0)
+        return ProcessSnapshot(timestamp, np.empty(0, dtype=np.int64), empty, [], [],
+                               {name: empty for name in COLUMNS})
+
+    pids, create_times, names, statuses, *values = zip(*rows)
+    columns = {name: np.array(column, dtype=float) for name, column in zip(COLUMNS, values)}
+    return ProcessSnapshot(timestamp, np.array(pids, dtype=np.int64), np.array(create_times, dtype=float),
+                           list(names), list(statuses), columns)
+
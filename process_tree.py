@@ -0,0 +1,270 @@
+import collections
+import heapq
+
+import numpy as np
+
+METRICS = ('rss', 'cpu', 'threads')
+
+
+class ProcessForest:
+    """The ppid forest with per-subtree totals maintained incrementally.
+
+    Every node keeps its own metrics and the sum of those metrics over its
+    whole subtree. A change in one process only touches that process and its
+    ancestors, and an exit subtracts the process' subtree from its ancestors,
+    so reading a subtree total is O(1) and nothing is recomputed per frame.
+    """
+
+    def __init__(self):
+        self.own = {}
+        self.totals = {}
+        self.ppid = {}
+        self.parent = {}
+        self.children = collections.defaultdict(set)
+        self.waiting = collections.defaultdict(set)
+        self.info = {}
+
+    def __contains__(self, pid):
+        return pid in self.own
+
+    def __len__(self):
+        return len(self.own)
+
+    def update(self, pid, ppid, rss=0.0, cpu=0.0, threads=0, **info):
+        """Insert or update one process"""
+        own = [float(rss or 0), float(cpu or 0), float(threads or 0)]
+        created = info.get('create_time')
+        if pid in self.info and created is not None and self.info[pid].get('create_time') not in (None, created):
+            # Same pid, different process: drop the old one first
+            self.remove(pid)
+        if pid not in self.own:
+            self.own[pid] = [0.0, 0.0, 0.0]
+            self.totals[pid] = [0.0, 0.0, 0.0]
+            self.parent[pid] = None
+            self.ppid[pid] = None
+
+            # Adopt children that arrived before this process
+            for child in self.waiting.pop(pid, ()):
+                if child in self.own and self.parent[child] is None:
+                    self._attach(child, pid)
+
+        self.info[pid] = info
+        delta = [new - old for new, old in zip(own, self.own[pid])]
+        self.own[pid] = own
+        if any(delta):
+            self._propagate(pid, delta)
+
+        if self.ppid[pid] != ppid:
+            self._detach(pid)
+            self.ppid[pid] = ppid
+            self._attach(pid, ppid)
+
+    def remove(self, pid):
+        """Drop an exited process and subtract its subtree from its ancestors"""
+        if pid not in self.own:
+            return
+        self._detach(pid)
+        for child in self.children.pop(pid, set()):
+            self.parent[child] = None
+            self.waiting[pid].discard(child)
+        self.waiting.pop(pid, None)
+        for table in (self.own, self.totals, self.ppid, self.parent, self.info):
+            table.pop(pid, None)
+
+    def sync(self, rows):
+        """Apply a full snapshot of (pid, ppid, rss, cpu, threads, info) rows"""
+        seen = set()
+        for pid, ppid, rss, cpu, threads, info in rows:
+            seen.add(pid)
+            self.update(pid, ppid, rss, cpu, threads, **info)
+        for pid in [p for p in self.own if p not in seen]:
+            self.remove(pid)
+
+    def subtree(self, pid):
+        """Return the subtree totals of pid as a dict"""
+        return dict(zip(METRICS, self.totals[pid]))
+
+    def top(self, k=10, metric='rss', roots_only=False):
+        """Return the k pids with the largest subtree total for metric"""
+        index = METRICS.index(metric)
+        candidates = self.roots() if roots_only else self.totals
+        return heapq.nlargest(k, candidates, key=lambda pid: self.totals[pid][index])
+
+    def roots(self):
+        """Return pids without a known parent"""
+        return [pid for pid, parent in self.parent.items() if parent is None]
+
+    def _attach(self, pid, ppid):
+        """Link pid under ppid and add its subtree to the new ancestors"""
+        if ppid is None or ppid == pid:
+            return
+        if ppid not in self.own:
+            self.waiting[ppid].add(pid)
+            return
+        if self._is_ancestor(pid, ppid):
+            return
+        self.parent[pid] = ppid
+        self.children[ppid].add(pid)
+        self._propagate(ppid, list(self.totals[pid]))
+
+    def _detach(self, pid):
+        """Unlink pid from its parent and subtract its subtree from the ancestors"""
+        wanted = self.ppid.get(pid)
+        if wanted in self.waiting:
+            self.waiting[wanted].discard(pid)
+        parent = self.parent.get(pid)
+        if parent is None:
+            return
+        self.children[parent].discard(pid)
+        self._propagate(parent, [-value for value in self.totals[pid]])
+        self.parent[pid] = None
+
+    def _propagate(self, pid, delta):
+        """Add delta to the totals of pid and all of its ancestors"""
+        while pid is not None:
+            totals = self.totals[pid]
+            for i, value in enumerate(delta):
+                totals[i] += value
+            pid = self.parent[pid]
+
+    def _is_ancestor(self, pid, node):
+        """Whether pid is node or one of node's ancestors"""
+        while node is not None:
+            if node == pid:
+                return True
+            node = self.parent[node]
+        return False
+
+
+class ProcessIndex:
+    """Array-backed snapshot of a ProcessForest for neighbourhood queries.
+
+    The parent of every process is stored as an index into ``pids`` and the
+    children as CSR arrays (``children[child_start[i]:child_start[i + 1]]``),
+    so top-k, k-hop and path-to-root queries never touch the graph objects.
+    Metrics are the forest's own values plus ``subtree_*`` totals.
+    """
+
+    def __init__(self, forest):
+        self.pids = np.fromiter(forest.own, dtype=np.int64, count=len(forest))
+        self.position = {pid: i for i, pid in enumerate(self.pids.tolist())}
+        n = len(self.pids)
+
+        self.parent = np.full(n, -1, dtype=np.int64)
+        for i, pid in enumerate(self.pids.tolist()):
+            parent = forest.parent[pid]
+            if parent is not None:
+                self.parent[i] = self.position[parent]
+
+        linked = np.nonzero(self.parent >= 0)[0]
+        self.children = linked[np.argsort(self.parent[linked], kind='stable')]
+        counts = np.bincount(self.parent[linked], minlength=n)
+        self.child_start = np.concatenate(([0], np.cumsum(counts)))
+
+        own = np.array([forest.own[pid] for pid in self.pids.tolist()], dtype=float).reshape(n, 3)
+        totals = np.array([forest.totals[pid] for pid in self.pids.tolist()], dtype=float).reshape(n, 3)
+        self.metrics = {}
+        for column, name in enumerate(METRICS):
+            self.metrics[name] = own[:, column]
+            self.metrics[f"subtree_{name}"] = totals[:, column]
+
+    def __contains__(self, pid):
+        return pid in self.position
+
+    def value(self, pid, metric='rss'):
+        """Return metric for pid"""
+        return float(self.metrics[metric][self.position[pid]])
+
+    def top(self, k=10, metric='rss'):
+        """Return the k pids with the largest metric, largest first"""
+        values = self.metrics[metric]
+        k = min(k, len(values))
+        if k <= 0:
+            return []
+        chosen = np.argpartition(-values, k - 1)[:k]
+        chosen = chosen[np.argsort(-values[chosen], kind='stable')]
+        return self.pids[chosen].tolist()
+
+    def ancestors(self, pid, hops=None):
+        """Return up to hops ancestors of pid, nearest first"""
+        result = []
+        node = self.parent[self.position[pid]]
+        limit = len(self.pids) if hops is None else hops
+        while node >= 0 and len(result) < limit:
+            result.append(int(self.pids[node]))
+            node = self.parent[node]
+        return result
+
+    def path_to_root(self, pid):
+        """Return the pids from the root of pid's tree down to pid"""
+        return list(reversed(self.ancestors(pid))) + [pid]
+
+    def descendants(self, pid, hops=None):
+        """Return descendants of pid up to hops levels down, level by level"""
+        frontier = np.array([self.position[pid]])
+        found = []
+        depth = 0
+        while len(frontier) and (hops is None or depth < hops):
+            starts = self.child_start[frontier]
+            lengths = self.child_start[frontier + 1] - starts
+            total = int(lengths.sum())
+            if not total:
+                break
+            # Concatenate the child slices of the whole frontier at once
+            offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+            frontier = self.children[offsets + np.arange(total)]
+            found.append(frontier)
+            depth += 1
+        if not found:
+            return []
+        return self.pids[np.concatenate(found)].tolist()
+
+    def neighbourhood(self, pids, up=1, down=1):
+        """Return pids together with their up-hop ancestors and down-hop descendants"""
+        result = set()
+        for pid in pids:
+            if pid not in self.position:
+                continue
+            result.add(pid)
+            result.update(self.ancestors(pid, up))
+            result.update(self.descendants(pid, down))
+        return result
+
+
+def check_parent_links(links):
+    """Find ppid links that cannot be real parent relationships.
+
+    links maps pid -> (ppid, create_time), i.e. every process is identified by
+    (pid, create_time). A link is stale when the process currently holding
+    the parent pid was started after the child, which means the real parent
+    exited and its pid was reused. Remaining loops in the parent pointers are
+    ppid races; each is reported through the edge that closes it. Every
+    process has at most one parent, so this is a single O(V) walk.
+
+    Returns a list of (ppid, pid, reason) tuples.
+    """
+    problems = []
+    parent = {}
+    for pid, (ppid, created) in links.items():
+        if ppid is None or ppid == pid or ppid not in links:
+            continue
+        parent_created = links[ppid][1]
+        if parent_created is not None and created is not None and parent_created > created:
+            problems.append((ppid, pid, "parent pid reused"))
+        else:
+            parent[pid] = ppid
+
+    # 0 = unvisited, otherwise the id of the walk that reached the node
+    state = dict.fromkeys(links, 0)
+    for walk, start in enumerate(links, 1):
+        node = start
+        while node is not None and state[node] == 0:
+            state[node] = walk
+            node = parent.get(node)
+        if node is not None and state[node] == walk:
+            # The walk ran into itself: find the edge closing the loop
+            child = node
+            while parent[child] != node:
+                child = parent[child]
+            problems.append((node, child, "ppid cycle"))
+    return problems
@@ -0,0 +1,60 @@
+import re
+import subprocess
+import sys
+
+# Import-time budgets in seconds (cumulative, as reported by -X importtime)
+BUDGETS = {
+    'acyclic': 0.8,
+    'System_Monitor': 0.9
+}
+
+# Modules that should only be imported when a tab needs them
+DEFERRED = ['networkx', 'scipy', 'matplotlib.pyplot']
+
+
+def measure(module, runs=3):
+    """Return (best cumulative import time, imported module names) for module"""
+    best = None
+    imported = set()
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+        for line in result.stderr.splitlines():
+            match = re.match(r'import time:\s+\d+ \|\s+(\d+) \|(\s*)(\S+)', line)
+            if not match:
+                continue
+            imported.add(match.group(3))
+            if match.group(3) == module:
+                seconds = int(match.group(1)) / 1e6
+                best = seconds if best is None else min(best, seconds)
+    return best, imported
+
+
+def main():
+    """Measure import time of both apps against their budgets"""
+    failed = False
+    for module, budget in BUDGETS.items():
+        try:
+            seconds, imported = measure(module)
+        except RuntimeError as e:
+            print(f"{module:<16} import failed: {e}")
+            failed = True
+            continue
+        
+        eager = [name for name in DEFERRED if name in imported]
+        ok = seconds <= budget and not eager
+        failed = failed or not ok
+        print(f"{module:<16} {seconds * 1000:7.1f} ms (budget {budget * 1000:.0f} ms) "
+              f"{'OK' if ok else 'OVER BUDGET'}")
+        if eager:
+            print(f"{'':<16} eagerly imports: {', '.join(eager)}")
+    
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+import warnings
+
+import numpy as np
+
+from anomaly import rank_outliers, robust_mahalanobis
+from process_snapshot import COLUMNS, ProcessSnapshot
+
+
+def make_snapshot(count=40, seed=0):
+    rng = np.random.default_rng(seed)
+    columns = {name: rng.gamma(2.0, 10.0, count) for name in COLUMNS}
+    columns['rss_mb'][0] = 5000.0  # One clear outlier
+    return ProcessSnapshot(0.0, np.arange(1, count + 1), np.zeros(count),
+                           [f'proc{i}' for i in range(count)], ['sleeping'] * count, columns)
+
+
+def test_all_nan_column_is_skipped():
+    matrix = np.column_stack((np.arange(30.0), np.full(30, np.nan)))
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        distance, z = robust_mahalanobis(matrix)
+    assert np.isfinite(distance).all()
+    assert np.isnan(z[:, 1]).all()
+
+
+def test_rank_outliers_without_previous_snapshot():
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        outliers = rank_outliers(make_snapshot(), None)
+    assert outliers and outliers[0]['pid'] == 1
+    assert np.isnan(outliers[0]['z']['io_rate'])
@@ -0,0 +1,89 @@
+import itertools
+
+import networkx as nx
+
+from System_Monitor import ProcessGraphRenderer
+
+COLORS = {'accent': '#89b4fa', 'warning': '#f9e2af', 'surface': '#313244', 'text': '#cdd6f4'}
+
+
+class StubCanvas:
+    """Just enough of a Tk canvas to record what the renderer draws"""
+
+    def __init__(self, width=800, height=600):
+        self.width = width
+        self.height = height
+        self.items = {}
+        self.ids = itertools.count(1)
+
+    def bind(self, *args):
+        pass
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
+
+    def create(self, kind, **options):
+        item = next(self.ids)
+        self.items[item] = dict(options, kind=kind)
+        return item
+
+    def create_line(self, *coords, **options):
+        return self.create('line', **options)
+
+    def create_oval(self, *coords, **options):
+        return self.create('oval', **options)
+
+    def create_text(self, *coords, **options):
+        return self.create('text', **options)
+
+    def coords(self, item, *coords):
+        pass
+
+    def itemconfigure(self, item, **options):
+        self.items[item].update(options)
+
+    def delete(self, item):
+        del self.items[item]
+
+    def tag_raise(self, tag):
+        pass
+
+
+def render(graph, max_nodes=400):
+    canvas = StubCanvas()
+    renderer = ProcessGraphRenderer(canvas, COLORS, max_nodes=max_nodes)
+    pos = {node: (0.0, 0.0) for node in graph}
+    renderer.render(graph, pos, {node: str(node) for node in graph})
+    return renderer, canvas
+
+
+def test_flat_tree_keeps_the_node_budget():
+    graph = nx.DiGraph((1, child) for child in range(2, 1002))
+    renderer, canvas = render(graph)
+    assert len(renderer.node_items) == 400
+    assert 1 in renderer.node_items
+    oval, label = renderer.node_items[1]
+    assert canvas.items[label]['text'] == '1 +601'
+    collapsed = [node for node, (oval, label) in renderer.node_items.items()
+                 if '+' in canvas.items[label]['text']]
+    assert collapsed == [1]
+
+
+def test_small_subtrees_collapse_first():
+    graph = nx.DiGraph([(1, child) for child in range(10, 310)] +
+                       [(2, child) for child in range(1000, 1200)])
+    renderer, canvas = render(graph)
+    assert len(renderer.node_items) == 400
+    shown, hidden = renderer.level_of_detail(list(graph))
+    assert {1, 2} <= set(shown)
+    assert sum(hidden.values()) == len(graph) - 400
+
+
+def test_under_budget_draws_everything():
+    graph = nx.DiGraph((1, child) for child in range(2, 50))
+    renderer, canvas = render(graph)
+    assert len(renderer.node_items) == 49
+    assert all('+' not in canvas.items[label]['text'] for _, label in renderer.node_items.values())
@@ -0,0 +1,127 @@
+import collections
+import math
+
+
+class SlidingRegression:
+    """Least-squares line over the last ``window`` samples, updated in O(1).
+
+    Running sums of x, y, x*x, x*y and y*y are adjusted as samples enter and
+    leave the window, so slope, intercept and residual variance never need a
+    refit. x defaults to the running sample index, which matches
+    ``np.polyfit(range(n), last_n, 1)`` for the slope. Sums are kept relative
+    to a reference sample (large x such as timestamps would otherwise cancel
+    catastrophically) and are rebuilt from the window, with a fresh
+    reference, every ``window`` samples to keep rounding error bounded.
+    """
+
+    def __init__(self, window=10):
+        self.window = window
+        self.samples = collections.deque(maxlen=window)
+        self.next_x = 0
+        self.added = 0
+        self.x0 = self.y0 = 0.0
+        self.sx = self.sy = self.sxx = self.sxy = self.syy = 0.0
+
+    def __len__(self):
+        return len(self.samples)
+
+    def add(self, y, x=None):
+        """Add a sample, evicting the oldest one once the window is full"""
+        x = self.next_x if x is None else x
+        self.next_x = x + 1
+        if not self.samples:
+            self.x0, self.y0 = x, y
+        if len(self.samples) == self.window:
+            old_x, old_y = self.samples[0]
+            self._accumulate(old_x, old_y, -1.0)
+        self.samples.append((x, y))
+        self._accumulate(x, y, 1.0)
+
+        self.added += 1
+        if self.added % self.window == 0:
+            self._rebuild()
+
+    def clear(self):
+        """Drop all samples"""
+        self.samples.clear()
+        self.sx = self.sy = self.sxx = self.sxy = self.syy = 0.0
+
+    @property
+    def last_x(self):
+        return self.samples[-1][0] if self.samples else None
+
+    @property
+    def slope(self):
+        """Change in y per unit of x (0 with fewer than two distinct x)"""
+        denominator = len(self.samples) * self.sxx - self.sx ** 2
+        if len(self.samples) < 2 or denominator <= 0:
+            return 0.0
+        return (len(self.samples) * self.sxy - self.sx * self.sy) / denominator
+
+    @property
+    def intercept(self):
+        """Value of the fitted line at x = 0"""
+        return self.predict(0)
+
+    @property
+    def residual_variance(self):
+        """Unbiased variance of the residuals around the fitted line"""
+        n = len(self.samples)
+        if n < 3:
+            return 0.0
+        slope = self.slope
+        intercept = (self.sy - slope * self.sx) / n  # In reference coordinates
+        sse = (self.syy - 2 * intercept * self.sy - 2 * slope * self.sxy
+               + n * intercept ** 2 + 2 * intercept * slope * self.sx + slope ** 2 * self.sxx)
+        return max(sse, 0.0) / (n - 2)
+
+    @property
+    def r2(self):
+        """Coefficient of determination of the fit"""
+        n = len(self.samples)
+        var_x = n * self.sxx - self.sx ** 2
+        var_y = n * self.syy - self.sy ** 2
+        if n < 2 or var_x <= 0 or var_y <= 0:
+            return 0.0
+        return min((n * self.sxy - self.sx * self.sy) ** 2 / (var_x * var_y), 1.0)
+
+    def predict(self, x):
+        """Fitted value at x"""
+        if not self.samples:
+            return 0.0
+        slope = self.slope
+        return self.y0 + (self.sy - slope * self.sx) / len(self.samples) + slope * (x - self.x0)
+
+    def forecast(self, steps):
+        """Fitted value steps samples after the newest one"""
+        if not self.samples:
+            return None
+        return self.predict(self.last_x + steps)
+
+    def stderr(self):
+        """Standard deviation of the residuals"""
+        return math.sqrt(self.residual_variance)
+
+    def slope_stderr(self):
+        """Standard error of the slope estimate"""
+        n = len(self.samples)
+        spread = self.sxx - self.sx ** 2 / n if n else 0.0
+        if n < 3 or spread <= 0:
+            return float('inf')
+        return math.sqrt(self.residual_variance / spread)
+
+    def _accumulate(self, x, y, sign):
+        x -= self.x0
+        y -= self.y0
+        self.sx += sign * x
+        self.sy += sign * y
+        self.sxx += sign * x * x
+        self.sxy += sign * x * y
+        self.syy += sign * y * y
+
+    def _rebuild(self):
+        """Recompute the sums exactly from the samples in the window"""
+        self.x0, self.y0 = self.samples[0]
+        self.sx = self.sy = self.sxx = self.sxy = self.syy = 0.0
+        for x, y in self.samples:
+            self._accumulate(x, y, 1.0)